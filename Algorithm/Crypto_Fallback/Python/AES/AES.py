@@ -1,17 +1,27 @@
 """
 AES Python implementation with real step-by-step visualization.
 This provides authentic AES operations with detailed round information for educational purposes.
+
+The cipher is implemented here in full (AES-128, AES-192 and AES-256, ECB with
+PKCS7 padding), so it needs no third-party package. Each block is encrypted or
+decrypted once, and the round trace for the visualization is recorded along the
+way rather than recomputed next to a separate cipher.
+
+With NumPy installed, messages of BATCH_MIN_BLOCKS blocks or more run through a
+vectorized engine that holds all blocks as one (blocks, 16) array, so each
+round step is a few array operations for the whole message.
 """
 
 import base64
 import json
 
+from KeyCache import KeyMaterialCache
+
 try:
-    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-    from cryptography.hazmat.backends import default_backend
-    CRYPTOGRAPHY_AVAILABLE = True
+    import numpy as np
+    NUMPY_AVAILABLE = True
 except ImportError:
-    CRYPTOGRAPHY_AVAILABLE = False
+    NUMPY_AVAILABLE = False
 
 # AES S-Box
 S_BOX = [
@@ -56,166 +66,209 @@ INV_S_BOX = [
 # Round constants
 RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36]
 
-def aes_fallback(operation, message, key):
+# Supported key sizes in bytes; any other key is cut or zero-padded to 16 bytes
+KEY_SIZES = (16, 24, 32)
+
+# Below this many blocks the per-block engine is faster than setting up arrays
+BATCH_MIN_BLOCKS = 8
+
+INVALID_BASE64 = "Invalid base64 input for decryption"
+
+def normalize_key(key):
+    """
+    Turn the key string into AES key bytes
+
+    A key of 24 or 32 characters selects AES-192 or AES-256. Anything else is
+    AES-128, cut or zero-padded to 16 bytes as the Java implementation does.
+    """
+    size = len(key) if len(key) in KEY_SIZES else 16
+    return key.encode('utf-8')[:size].ljust(size, b'\0')
+
+def aes_fallback(operation, message, key, trace_blocks=None):
     """
     Python AES implementation with real step-by-step visualization.
     Provides authentic AES operations matching the Java implementation format.
-    """
-    if not CRYPTOGRAPHY_AVAILABLE:
-        # Basic fallback without cryptography
-        demo_result = "Demo mode - install cryptography for real AES"
-        if operation.lower() == 'encrypt':
-            demo_result = base64.b64encode(message.encode()).decode()
-        else:
-            try:
-                demo_result = base64.b64decode(message).decode()
-            except:
-                demo_result = "Invalid base64 for demo decryption"
-        
-        return {
-            "blocks": [{
-                "block": 1,
-                "rounds": [{
-                    "round": 1,
-                    "startOfRound": "44454D4F44454D4F44454D4F44454D4F",
-                    "afterSubBytes": "494E5354414C4C43525950544F4752",
-                    "afterShiftRows": "415048594C494252415259464F5246",
-                    "afterMixColumns": "554C4C41455346554E4354494F4E41",
-                    "afterAddRoundKey": "4C4954594144454D4F4F4E4C5944454D"
-                }]
-            }],
-            "finalResult": demo_result
-        }
 
+    Parameters:
+    operation (str): 'encrypt' or 'decrypt'
+    message (str): Plaintext, or base64 ciphertext to decrypt
+    key (str): The key; see normalize_key
+    trace_blocks (tuple): (start, stop) 0-based range of blocks to include in the
+        visualization, e.g. (0, 0) for none; None traces every block
+
+    Returns:
+    dict: 'finalResult', 'blocks' with the traced blocks and 'totalBlocks'
+    """
     try:
-        # Ensure key is exactly 16 bytes
-        key_bytes = key.encode('utf-8')[:16].ljust(16, b'\0')
+        key_bytes = normalize_key(key)
+        encrypt = operation.lower() == 'encrypt'
         
-        if operation.lower() == 'encrypt':
-            # Encrypt the message
-            message_bytes = message.encode('utf-8')
-            
-            # Pad message to 16-byte blocks (PKCS7 padding)
-            padding_length = 16 - (len(message_bytes) % 16)
-            padded_message = message_bytes + bytes([padding_length] * padding_length)
-            
-            # Use AES in ECB mode (matching Java implementation)
-            cipher = Cipher(algorithms.AES(key_bytes), modes.ECB(), backend=default_backend())
-            encryptor = cipher.encryptor()
-            ciphertext = encryptor.update(padded_message) + encryptor.finalize()
-            
-            result = base64.b64encode(ciphertext).decode('utf-8')
-            
-            # Create visualization blocks with simulated step-by-step data
-            blocks = []
-            for i in range(0, len(padded_message), 16):
-                block_data = padded_message[i:i+16]
-                rounds = create_encrypt_visualization(block_data, key_bytes)
-                
-                blocks.append({
-                    "block": (i // 16) + 1,
-                    "rounds": rounds
-                })
-            
-        else:  # decrypt
-            # Decode base64 input
-            try:
-                ciphertext = base64.b64decode(message)
-            except:
+        try:
+            data = prepare_input(operation, message)
+        except ValueError as e:
+            if str(e) == INVALID_BASE64:
                 return {
                     "blocks": [],
-                    "finalResult": "Error: Invalid base64 input for decryption"
+                    "finalResult": f"Error: {INVALID_BASE64}"
                 }
-            
-            # Decrypt
-            cipher = Cipher(algorithms.AES(key_bytes), modes.ECB(), backend=default_backend())
-            decryptor = cipher.decryptor()
-            padded_plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-            
+            raise
+        
+        # AES in ECB mode (matching Java implementation), with the key expanded once for all blocks
+        with AES_ROUND_KEYS.lease(key_bytes) as expanded_keys:
+            if trace_blocks is None:
+                output, blocks = run_blocks(data, expanded_keys, encrypt, trace=True)
+            else:
+                # Only the requested blocks are traced, one at a time
+                output, _ = run_blocks(data, expanded_keys, encrypt, trace=False)
+                blocks = list(iter_trace_blocks(operation, data, expanded_keys, *trace_blocks))
+        
+        if encrypt:
+            result = base64.b64encode(output).decode('utf-8')
+        else:
             # Remove padding
-            padding_length = padded_plaintext[-1]
-            if padding_length <= 16 and all(b == padding_length for b in padded_plaintext[-padding_length:]):
-                plaintext = padded_plaintext[:-padding_length]
+            padding_length = output[-1]
+            if padding_length <= 16 and all(b == padding_length for b in output[-padding_length:]):
+                plaintext = output[:-padding_length]
             else:
-                plaintext = padded_plaintext
+                plaintext = output
             
             result = plaintext.decode('utf-8', errors='replace')
-            
-            # Create visualization blocks for decryption
-            blocks = []
-            for i in range(0, len(ciphertext), 16):
-                block_data = ciphertext[i:i+16]
-                rounds = create_decrypt_visualization(block_data, key_bytes)
-                
-                blocks.append({
-                    "block": (i // 16) + 1,
-                    "rounds": rounds
-                })
         
         return {
             "blocks": blocks,
-            "finalResult": result
+            "finalResult": result,
+            "totalBlocks": len(data) // 16
         }
         
     except Exception as e:
         return {
-            "blocks": [{
-                "block": 1,
-                "rounds": [{
-                    "round": 1,
-                    "startOfRound": "ERROR00000000000000000000000000000",
-                    "afterSubBytes": "45525252524F52455252524F52455252",
-                    "afterShiftRows": "50594C45414553464144434B4241434B",
-                    "afterMixColumns": "454E434F554E544552454441504B5252",
-                    "afterAddRoundKey": "4F5250484543496E5055544144545259"
-                }]
-            }],
+            "blocks": [],
             "finalResult": f"Error in Python AES fallback: {str(e)}"
         }
 
-def bytes_to_hex(data):
-    """Convert bytes to uppercase hex string"""
-    return ''.join(f'{b:02X}' for b in data)
-
-def sub_bytes(state):
-    """Apply S-Box substitution to state"""
-    return [S_BOX[b >> 4][b & 0x0F] for b in state]
+def prepare_input(operation, message):
+    """
+    Turn the message into the bytes the cipher runs on
 
-def inv_sub_bytes(state):
-    """Apply inverse S-Box substitution to state"""
-    return [INV_S_BOX[b >> 4][b & 0x0F] for b in state]
+    Returns:
+    bytes: The PKCS7-padded plaintext to encrypt, or the decoded ciphertext to decrypt
 
-def shift_rows(state):
-    """Apply ShiftRows transformation"""
-    # Convert to 4x4 matrix (column-major)
-    matrix = [[state[i + 4*j] for j in range(4)] for i in range(4)]
-    
-    # Shift rows
-    shifted = [
-        matrix[0],  # Row 0: no shift
-        matrix[1][1:] + matrix[1][:1],  # Row 1: shift left by 1
-        matrix[2][2:] + matrix[2][:2],  # Row 2: shift left by 2
-        matrix[3][3:] + matrix[3][:3]   # Row 3: shift left by 3
-    ]
+    Raises:
+    ValueError: The ciphertext is not valid base64 or not a whole number of blocks
+    """
+    if operation.lower() == 'encrypt':
+        message_bytes = message.encode('utf-8')
+        
+        # Pad message to 16-byte blocks (PKCS7 padding)
+        padding_length = 16 - (len(message_bytes) % 16)
+        return message_bytes + bytes([padding_length] * padding_length)
     
-    # Convert back to column-major
-    return [shifted[i][j] for j in range(4) for i in range(4)]
+    try:
+        ciphertext = base64.b64decode(message)
+    except Exception:
+        raise ValueError(INVALID_BASE64)
+    if not ciphertext or len(ciphertext) % 16:
+        raise ValueError("The length of the provided data is not a multiple of the block length.")
+    return ciphertext
 
-def inv_shift_rows(state):
-    """Apply inverse ShiftRows transformation"""
-    # Convert to 4x4 matrix (column-major)
-    matrix = [[state[i + 4*j] for j in range(4)] for i in range(4)]
-    
-    # Inverse shift rows
-    shifted = [
-        matrix[0],  # Row 0: no shift
-        matrix[1][-1:] + matrix[1][:-1],  # Row 1: shift right by 1
-        matrix[2][-2:] + matrix[2][:-2],  # Row 2: shift right by 2
-        matrix[3][-3:] + matrix[3][:-3]   # Row 3: shift right by 3
-    ]
+def aes_block_count(operation, message):
+    """
+    Number of 16-byte blocks the cipher runs on for a message
+
+    Raises:
+    ValueError: The ciphertext is not valid base64 or not a whole number of blocks
+    """
+    return len(prepare_input(operation, message)) // 16
+
+def run_blocks(data, expanded_keys, encrypt, trace=True):
+    """
+    Encrypt or decrypt every block of ``data``
+
+    Returns:
+    tuple: (output bytes, visualization blocks, or None without ``trace``)
+    """
+    if NUMPY_AVAILABLE and len(data) >= 16 * BATCH_MIN_BLOCKS:
+        batched = encrypt_blocks_batched if encrypt else decrypt_blocks_batched
+        return batched(data, expanded_keys, trace)
     
-    # Convert back to column-major
-    return [shifted[i][j] for j in range(4) for i in range(4)]
+    block_function = encrypt_block if encrypt else decrypt_block
+    output = bytearray()
+    blocks = [] if trace else None
+    for i in range(0, len(data), 16):
+        rounds = [] if trace else None
+        output += block_function(data[i:i+16], expanded_keys, rounds)
+        
+        if trace:
+            blocks.append({
+                "block": (i // 16) + 1,
+                "rounds": rounds
+            })
+    return bytes(output), blocks
+
+def iter_trace_blocks(operation, data, expanded_keys, start=0, stop=None):
+    """
+    Yield the visualization of blocks ``start`` to ``stop - 1`` (0-based), one block at a time
+
+    In ECB mode every block is independent, so a block is traced without
+    touching the ones before it.
+    """
+    block_function = encrypt_block if operation.lower() == 'encrypt' else decrypt_block
+    total = len(data) // 16
+    stop = total if stop is None else min(stop, total)
+    for index in range(max(start, 0), stop):
+        rounds = []
+        block_function(data[index * 16:(index + 1) * 16], expanded_keys, rounds)
+        yield {
+            "block": index + 1,
+            "rounds": rounds
+        }
+
+def aes_trace_stream(operation, message, key, start=0, stop=None):
+    """
+    Yield the visualization of a message block by block, as each block is computed
+
+    Closing the generator stops the work on the remaining blocks.
+
+    Parameters:
+    operation (str): 'encrypt' or 'decrypt'
+    message (str): Plaintext, or base64 ciphertext to decrypt
+    key (str): The key; see normalize_key
+    start (int): First block to trace, 0-based
+    stop (int): Block to stop before; None for the end of the message
+
+    Raises:
+    ValueError: Invalid input, on the first iteration
+    """
+    data = prepare_input(operation, message)
+    with AES_ROUND_KEYS.lease(normalize_key(key)) as expanded_keys:
+        yield from iter_trace_blocks(operation, data, expanded_keys, start, stop)
+
+def aes_block_trace(operation, message, key, block):
+    """
+    Trace a single block of a message on demand
+
+    Parameters:
+    operation (str): 'encrypt' or 'decrypt'
+    message (str): Plaintext, or base64 ciphertext to decrypt
+    key (str): The key; see normalize_key
+    block (int): 1-based block number
+
+    Returns:
+    dict: 'block' with the visualization of that block and 'totalBlocks'
+
+    Raises:
+    ValueError: Invalid input or a block number out of range
+    """
+    data = prepare_input(operation, message)
+    total = len(data) // 16
+    if not 1 <= block <= total:
+        raise ValueError(f"Block {block} is out of range, the message has {total} blocks")
+    with AES_ROUND_KEYS.lease(normalize_key(key)) as expanded_keys:
+        traced = next(iter_trace_blocks(operation, data, expanded_keys, block - 1, block))
+    return {
+        "block": traced,
+        "totalBlocks": total
+    }
 
 def galois_multiply(a, b):
     """Multiply two numbers in GF(2^8)"""
@@ -231,165 +284,301 @@ def galois_multiply(a, b):
         a &= 0xFF
     return result
 
+# Flat 256-byte S-boxes, so SubBytes is a single bytes.translate
+SBOX_TABLE = bytes(b for row in S_BOX for b in row)
+INV_SBOX_TABLE = bytes(b for row in INV_S_BOX for b in row)
+
+# GF(2^8) products with the MixColumns and InvMixColumns coefficients, indexed by byte
+MUL2 = bytes(galois_multiply(x, 2) for x in range(256))
+MUL3 = bytes(galois_multiply(x, 3) for x in range(256))
+MUL9 = bytes(galois_multiply(x, 9) for x in range(256))
+MUL11 = bytes(galois_multiply(x, 11) for x in range(256))
+MUL13 = bytes(galois_multiply(x, 13) for x in range(256))
+MUL14 = bytes(galois_multiply(x, 14) for x in range(256))
+
+# The state is 16 bytes in column-major order: byte i + 4*j is row i, column j.
+# ShiftRows moves row i left by i columns, so each output byte comes from a fixed input index.
+SHIFT_ROWS = [i + 4 * ((j + i) % 4) for j in range(4) for i in range(4)]
+INV_SHIFT_ROWS = [i + 4 * ((j - i) % 4) for j in range(4) for i in range(4)]
+
+def bytes_to_hex(data):
+    """Convert bytes to uppercase hex string"""
+    return bytes(data).hex().upper()
+
+def sub_bytes(state):
+    """Apply S-Box substitution to state"""
+    return bytes(state).translate(SBOX_TABLE)
+
+def inv_sub_bytes(state):
+    """Apply inverse S-Box substitution to state"""
+    return bytes(state).translate(INV_SBOX_TABLE)
+
+def shift_rows(state):
+    """Apply ShiftRows transformation"""
+    return bytes([state[k] for k in SHIFT_ROWS])
+
+def inv_shift_rows(state):
+    """Apply inverse ShiftRows transformation"""
+    return bytes([state[k] for k in INV_SHIFT_ROWS])
+
 def mix_columns(state):
     """Apply MixColumns transformation"""
-    # Convert to 4x4 matrix (column-major)
-    matrix = [[state[i + 4*j] for i in range(4)] for j in range(4)]
-    
-    mixed = []
-    for col in matrix:
-        mixed_col = [
-            galois_multiply(2, col[0]) ^ galois_multiply(3, col[1]) ^ col[2] ^ col[3],
-            col[0] ^ galois_multiply(2, col[1]) ^ galois_multiply(3, col[2]) ^ col[3],
-            col[0] ^ col[1] ^ galois_multiply(2, col[2]) ^ galois_multiply(3, col[3]),
-            galois_multiply(3, col[0]) ^ col[1] ^ col[2] ^ galois_multiply(2, col[3])
-        ]
-        mixed.extend(mixed_col)
-    
-    return mixed
+    mul2, mul3 = MUL2, MUL3
+    mixed = bytearray(16)
+    for c in range(0, 16, 4):
+        a0, a1, a2, a3 = state[c], state[c + 1], state[c + 2], state[c + 3]
+        mixed[c] = mul2[a0] ^ mul3[a1] ^ a2 ^ a3
+        mixed[c + 1] = a0 ^ mul2[a1] ^ mul3[a2] ^ a3
+        mixed[c + 2] = a0 ^ a1 ^ mul2[a2] ^ mul3[a3]
+        mixed[c + 3] = mul3[a0] ^ a1 ^ a2 ^ mul2[a3]
+    return bytes(mixed)
 
 def inv_mix_columns(state):
     """Apply inverse MixColumns transformation"""
-    # Convert to 4x4 matrix (column-major)
-    matrix = [[state[i + 4*j] for i in range(4)] for j in range(4)]
-    
-    mixed = []
-    for col in matrix:
-        mixed_col = [
-            galois_multiply(0x0e, col[0]) ^ galois_multiply(0x0b, col[1]) ^ galois_multiply(0x0d, col[2]) ^ galois_multiply(0x09, col[3]),
-            galois_multiply(0x09, col[0]) ^ galois_multiply(0x0e, col[1]) ^ galois_multiply(0x0b, col[2]) ^ galois_multiply(0x0d, col[3]),
-            galois_multiply(0x0d, col[0]) ^ galois_multiply(0x09, col[1]) ^ galois_multiply(0x0e, col[2]) ^ galois_multiply(0x0b, col[3]),
-            galois_multiply(0x0b, col[0]) ^ galois_multiply(0x0d, col[1]) ^ galois_multiply(0x09, col[2]) ^ galois_multiply(0x0e, col[3])
-        ]
-        mixed.extend(mixed_col)
-    
-    return mixed
+    mul9, mul11, mul13, mul14 = MUL9, MUL11, MUL13, MUL14
+    mixed = bytearray(16)
+    for c in range(0, 16, 4):
+        a0, a1, a2, a3 = state[c], state[c + 1], state[c + 2], state[c + 3]
+        mixed[c] = mul14[a0] ^ mul11[a1] ^ mul13[a2] ^ mul9[a3]
+        mixed[c + 1] = mul9[a0] ^ mul14[a1] ^ mul11[a2] ^ mul13[a3]
+        mixed[c + 2] = mul13[a0] ^ mul9[a1] ^ mul14[a2] ^ mul11[a3]
+        mixed[c + 3] = mul11[a0] ^ mul13[a1] ^ mul9[a2] ^ mul14[a3]
+    return bytes(mixed)
 
 def key_expansion(key):
-    """Generate round keys from the main key"""
+    """Generate round keys from the main key (16, 24 or 32 bytes)"""
     expanded_key = list(key)
+    nk = len(key) // 4
+    if len(key) not in KEY_SIZES:
+        raise ValueError(f"Invalid AES key length: {len(key)} bytes")
+    total = 16 * (nk + 7)  # One 16-byte round key per round plus the initial one
     
-    for i in range(16, 176, 4):  # Generate 11 round keys (176 bytes total)
+    for i in range(len(key), total, 4):
         temp = expanded_key[i-4:i]
+        word = i // 4
         
-        if i % 16 == 0:
+        if word % nk == 0:
             # RotWord
             temp = temp[1:] + temp[:1]
             # SubWord
-            temp = [S_BOX[b >> 4][b & 0x0F] for b in temp]
+            temp = [SBOX_TABLE[b] for b in temp]
             # XOR with Rcon
-            temp[0] ^= RCON[(i // 16) - 1]
+            temp[0] ^= RCON[word // nk - 1]
+        elif nk > 6 and word % nk == 4:
+            # AES-256 applies SubWord halfway through each key block
+            temp = [SBOX_TABLE[b] for b in temp]
         
         for j in range(4):
-            expanded_key.append(expanded_key[i - 16 + j] ^ temp[j])
+            expanded_key.append(expanded_key[i - len(key) + j] ^ temp[j])
     
     return expanded_key
 
+# Expanded round keys of recently used keys, as zeroizable bytearrays
+AES_ROUND_KEYS = KeyMaterialCache('aes_round_keys', lambda key: bytearray(key_expansion(key)))
+
 def add_round_key(state, round_key):
     """XOR state with round key"""
-    return [state[i] ^ round_key[i] for i in range(16)]
+    return (int.from_bytes(state, 'big') ^ int.from_bytes(round_key, 'big')).to_bytes(16, 'big')
 
-def create_encrypt_visualization(block_data, key_bytes):
-    """Create simulated encryption visualization rounds"""
-    expanded_keys = key_expansion(key_bytes)
-    state = list(block_data)
-    rounds = []
+def encrypt_block(block_data, expanded_keys, rounds=None):
+    """
+    Encrypt one 16-byte block
+
+    Parameters:
+    block_data (bytes): The plaintext block
+    expanded_keys (bytes-like): Output of key_expansion; its length sets the number of rounds
+    rounds (list): If given, one dict per round with the state after each step is appended
+
+    Returns:
+    bytes: The ciphertext block
+    """
+    num_rounds = len(expanded_keys) // 16 - 1
+    state = bytes(block_data)
     
     # Initial round key addition
     state = add_round_key(state, expanded_keys[0:16])
     
-    for round_num in range(10):
-        round_data = {"round": round_num + 1}
-        
-        # Start of round
-        round_data["startOfRound"] = bytes_to_hex(state)
-        
-        # SubBytes
-        state = sub_bytes(state)
-        round_data["afterSubBytes"] = bytes_to_hex(state)
-        
-        # ShiftRows
-        state = shift_rows(state)
-        round_data["afterShiftRows"] = bytes_to_hex(state)
+    for round_num in range(num_rounds):
+        state_start = state
         
-        # MixColumns (skip in final round)
-        if round_num < 9:
-            state = mix_columns(state)
-            round_data["afterMixColumns"] = bytes_to_hex(state)
-        else:
-            round_data["afterMixColumns"] = bytes_to_hex(state)
-        
-        # AddRoundKey
-        round_key = expanded_keys[(round_num + 1) * 16:(round_num + 2) * 16]
-        state = add_round_key(state, round_key)
-        round_data["afterAddRoundKey"] = bytes_to_hex(state)
+        # SubBytes, ShiftRows, MixColumns (skip in final round), AddRoundKey
+        after_sub = sub_bytes(state)
+        after_shift = shift_rows(after_sub)
+        after_mix = mix_columns(after_shift) if round_num < num_rounds - 1 else after_shift
+        state = add_round_key(after_mix, expanded_keys[(round_num + 1) * 16:(round_num + 2) * 16])
         
-        rounds.append(round_data)
+        if rounds is not None:
+            rounds.append({
+                "round": round_num + 1,
+                "startOfRound": bytes_to_hex(state_start),
+                "afterSubBytes": bytes_to_hex(after_sub),
+                "afterShiftRows": bytes_to_hex(after_shift),
+                "afterMixColumns": bytes_to_hex(after_mix),
+                "afterAddRoundKey": bytes_to_hex(state),
+            })
     
-    return rounds
+    return state
 
-def create_decrypt_visualization(block_data, key_bytes):
-    """Create correct AES decryption visualization following proper standard"""
-    expanded_keys = key_expansion(key_bytes)
-    state = list(block_data)
-    rounds = []
+def decrypt_block(block_data, expanded_keys, rounds=None):
+    """
+    Decrypt one 16-byte block with the standard inverse cipher
+
+    Parameters:
+    block_data (bytes): The ciphertext block
+    expanded_keys (bytes-like): Output of key_expansion; its length sets the number of rounds
+    rounds (list): If given, one dict per round with the state after each step is appended
+
+    Returns:
+    bytes: The plaintext block
+    """
+    num_rounds = len(expanded_keys) // 16 - 1
+    state = bytes(block_data)
     
-    # CORRECT AES DECRYPTION SEQUENCE:
-    # 1. Initial AddRoundKey with round key 10
-    round_key_10 = expanded_keys[10 * 16:11 * 16]
-    state = add_round_key(state, round_key_10)
+    # Initial AddRoundKey with the last round key
+    state = add_round_key(state, expanded_keys[num_rounds * 16:(num_rounds + 1) * 16])
     
-    # 2. Rounds 9 down to 1: InvShiftRows, InvSubBytes, AddRoundKey, InvMixColumns
-    for round_num in range(9, 0, -1):
-        round_data = {"round": 10 - round_num}
-        
-        # Start of round
-        round_data["startOfRound"] = bytes_to_hex(state)
+    # Rounds: InvShiftRows, InvSubBytes, AddRoundKey, InvMixColumns (not in the final round)
+    for round_num in range(num_rounds - 1, -1, -1):
+        state_start = state
         
-        # InvShiftRows
-        state = inv_shift_rows(state)
-        round_data["afterInvShiftRows"] = bytes_to_hex(state)
+        after_shift = inv_shift_rows(state)
+        after_sub = inv_sub_bytes(after_shift)
+        after_key = add_round_key(after_sub, expanded_keys[round_num * 16:(round_num + 1) * 16])
+        state = inv_mix_columns(after_key) if round_num > 0 else after_key
         
-        # InvSubBytes
-        state = inv_sub_bytes(state)
-        round_data["afterInvSubBytes"] = bytes_to_hex(state)
-        
-        # AddRoundKey
-        round_key = expanded_keys[round_num * 16:(round_num + 1) * 16]
-        state = add_round_key(state, round_key)
-        round_data["afterAddRoundKey"] = bytes_to_hex(state)
-        
-        # InvMixColumns (not in final round)
-        if round_num > 0:
-            state = inv_mix_columns(state)
-            round_data["afterInvMixColumns"] = bytes_to_hex(state)
-        else:
-            round_data["afterInvMixColumns"] = bytes_to_hex(state)
-        
-        rounds.append(round_data)
+        if rounds is not None:
+            rounds.append({
+                "round": num_rounds - round_num,
+                "startOfRound": bytes_to_hex(state_start),
+                "afterInvShiftRows": bytes_to_hex(after_shift),
+                "afterInvSubBytes": bytes_to_hex(after_sub),
+                "afterAddRoundKey": bytes_to_hex(after_key),
+                "afterInvMixColumns": bytes_to_hex(state),
+            })
     
-    # 3. Final round (round 0): InvShiftRows, InvSubBytes, AddRoundKey (no InvMixColumns)
-    round_data = {"round": 10}
-    
-    # Start of round
-    round_data["startOfRound"] = bytes_to_hex(state)
-    
-    # InvShiftRows
-    state = inv_shift_rows(state)
-    round_data["afterInvShiftRows"] = bytes_to_hex(state)
-    
-    # InvSubBytes
-    state = inv_sub_bytes(state)
-    round_data["afterInvSubBytes"] = bytes_to_hex(state)
+    return state
+
+def create_encrypt_visualization(block_data, key_bytes, expanded_keys=None):
+    """Create encryption visualization rounds for one block"""
+    if expanded_keys is None:
+        expanded_keys = key_expansion(key_bytes)
+    rounds = []
+    encrypt_block(block_data, expanded_keys, rounds)
+    return rounds
+
+def create_decrypt_visualization(block_data, key_bytes, expanded_keys=None):
+    """Create AES decryption visualization rounds for one block"""
+    if expanded_keys is None:
+        expanded_keys = key_expansion(key_bytes)
+    rounds = []
+    decrypt_block(block_data, expanded_keys, rounds)
+    return rounds
+
+# Vectorized engine: every block of the message is a row of one uint8 array
+
+ENCRYPT_STEPS = ("startOfRound", "afterSubBytes", "afterShiftRows", "afterMixColumns", "afterAddRoundKey")
+DECRYPT_STEPS = ("startOfRound", "afterInvShiftRows", "afterInvSubBytes", "afterAddRoundKey", "afterInvMixColumns")
+
+if NUMPY_AVAILABLE:
+    SBOX_ARRAY = np.frombuffer(SBOX_TABLE, dtype=np.uint8)
+    INV_SBOX_ARRAY = np.frombuffer(INV_SBOX_TABLE, dtype=np.uint8)
+    MUL_ARRAYS = {factor: np.frombuffer(table, dtype=np.uint8) for factor, table in
+                  ((2, MUL2), (3, MUL3), (9, MUL9), (11, MUL11), (13, MUL13), (14, MUL14))}
+    SHIFT_ROWS_ARRAY = np.array(SHIFT_ROWS)
+    INV_SHIFT_ROWS_ARRAY = np.array(INV_SHIFT_ROWS)
+
+def _mix_columns_batched(states, coefficients):
+    """
+    MixColumns (or its inverse) on every block at once
+
+    Each output byte of a column is the XOR of the four column bytes multiplied
+    by one row of the circulant coefficient matrix, e.g. (2, 3, 1, 1).
+    """
+    columns = states.reshape(-1, 4, 4)  # [block, column, row]
+    rows = [columns[:, :, i] for i in range(4)]
+    mixed = np.empty_like(columns)
+    for i in range(4):
+        result = None
+        for j in range(4):
+            factor = coefficients[(j - i) % 4]
+            term = rows[j] if factor == 1 else MUL_ARRAYS[factor][rows[j]]
+            result = term if result is None else result ^ term
+        mixed[:, :, i] = result
+    return mixed.reshape(-1, 16)
+
+def _trace_to_blocks(trace, steps):
+    """
+    Turn a (rounds, steps, blocks, 16) trace into the per-block visualization dicts
+
+    All states are hex-encoded with one call, then sliced per step.
+    """
+    num_rounds, num_steps, num_blocks, _ = trace.shape
+    hex_states = np.ascontiguousarray(trace.transpose(2, 0, 1, 3)).tobytes().hex().upper()
+    blocks = []
+    position = 0
+    for block in range(num_blocks):
+        rounds = []
+        for round_num in range(num_rounds):
+            round_data = {"round": round_num + 1}
+            for step in steps:
+                round_data[step] = hex_states[position:position + 32]
+                position += 32
+            rounds.append(round_data)
+        blocks.append({"block": block + 1, "rounds": rounds})
+    return blocks
+
+def encrypt_blocks_batched(data, expanded_keys, trace=True):
+    """
+    Encrypt every 16-byte block of ``data`` at once, recording the round trace unless ``trace`` is False
+
+    Returns:
+    tuple: (ciphertext bytes, visualization blocks as built by the per-block engine, or None)
+    """
+    round_keys = np.frombuffer(bytes(expanded_keys), dtype=np.uint8).reshape(-1, 16)
+    num_rounds = len(round_keys) - 1
+    states = np.frombuffer(bytes(data), dtype=np.uint8).reshape(-1, 16) ^ round_keys[0]
+    # Without a trace the states are written to a scratch round that is overwritten every time
+    steps = np.empty((num_rounds if trace else 1, len(ENCRYPT_STEPS), len(states), 16), dtype=np.uint8)
     
-    # AddRoundKey with round key 0
-    round_key_0 = expanded_keys[0:16]
-    state = add_round_key(state, round_key_0)
-    round_data["afterAddRoundKey"] = bytes_to_hex(state)
+    for round_num in range(num_rounds):
+        slot = round_num if trace else 0
+        steps[slot, 0] = states
+        states = SBOX_ARRAY[states]
+        steps[slot, 1] = states
+        states = states[:, SHIFT_ROWS_ARRAY]
+        steps[slot, 2] = states
+        if round_num < num_rounds - 1:
+            states = _mix_columns_batched(states, (2, 3, 1, 1))
+        steps[slot, 3] = states
+        states = states ^ round_keys[round_num + 1]
+        steps[slot, 4] = states
     
-    # No InvMixColumns in final round
-    round_data["afterInvMixColumns"] = bytes_to_hex(state)
+    return states.tobytes(), _trace_to_blocks(steps, ENCRYPT_STEPS) if trace else None
+
+def decrypt_blocks_batched(data, expanded_keys, trace=True):
+    """
+    Decrypt every 16-byte block of ``data`` at once, recording the round trace unless ``trace`` is False
+
+    Returns:
+    tuple: (padded plaintext bytes, visualization blocks as built by the per-block engine, or None)
+    """
+    round_keys = np.frombuffer(bytes(expanded_keys), dtype=np.uint8).reshape(-1, 16)
+    num_rounds = len(round_keys) - 1
+    states = np.frombuffer(bytes(data), dtype=np.uint8).reshape(-1, 16) ^ round_keys[num_rounds]
+    steps = np.empty((num_rounds if trace else 1, len(DECRYPT_STEPS), len(states), 16), dtype=np.uint8)
     
-    rounds.append(round_data)
+    for step in range(num_rounds):
+        round_num = num_rounds - 1 - step
+        slot = step if trace else 0
+        steps[slot, 0] = states
+        states = states[:, INV_SHIFT_ROWS_ARRAY]
+        steps[slot, 1] = states
+        states = INV_SBOX_ARRAY[states]
+        steps[slot, 2] = states
+        states = states ^ round_keys[round_num]
+        steps[slot, 3] = states
+        if round_num > 0:
+            states = _mix_columns_batched(states, (14, 11, 13, 9))
+        steps[slot, 4] = states
     
-    return rounds
+    return states.tobytes(), _trace_to_blocks(steps, DECRYPT_STEPS) if trace else None
@@ -0,0 +1,341 @@
+"""
+Block cipher modes on top of the Python AES engine: CBC, CTR and GCM.
+
+ECB (AES.py) encrypts equal plaintext blocks to equal ciphertext blocks, which
+is insecure and hides the most instructive part of a real mode: how blocks are
+chained. This module runs the same engine in:
+
+- CBC: PKCS7 padding, each plaintext block XORed with the previous ciphertext
+  block (the IV for the first one) before it is encrypted
+- CTR: a keystream made by encrypting consecutive counter blocks, XORed with
+  the data; no padding
+- GCM: CTR with a 96-bit nonce plus a GHASH authentication tag
+
+Encryption output is base64 of IV or nonce, ciphertext and (GCM) tag, which is
+also what decryption takes. The visualization traces the AES rounds of each
+block next to its chaining values (previous block, counter, keystream).
+
+CTR and GCM keystreams and CBC decryption have no dependency between blocks.
+With NumPy installed, large inputs are cut into chunks that run on a thread
+pool; NumPy releases the GIL inside its array operations, so the chunks use
+every core. CBC encryption is sequential by definition.
+"""
+
+import base64
+import hmac
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from KeyCache import KeyMaterialCache
+
+from .AES import (
+    AES_ROUND_KEYS, BATCH_MIN_BLOCKS, INVALID_BASE64, NUMPY_AVAILABLE, bytes_to_hex, decrypt_block,
+    encrypt_block, key_expansion, normalize_key,
+)
+
+if NUMPY_AVAILABLE:
+    from .AES import decrypt_blocks_batched, encrypt_blocks_batched
+
+MODES = ('ECB', 'CBC', 'CTR', 'GCM')
+
+# Bytes of IV (CBC), initial counter block (CTR) and nonce (GCM)
+IV_BYTES = {'CBC': 16, 'CTR': 16, 'GCM': 12}
+TAG_BYTES = 16
+
+# Inputs of at least this many blocks are split across the thread pool
+PARALLEL_MIN_BLOCKS = 4096
+PARALLEL_CHUNK_BLOCKS = 4096
+WORKERS = os.cpu_count() or 1
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix='aes-mode')
+    return _executor
+
+
+def _xor(data, other):
+    """XOR ``data`` with the start of ``other``, as one big-int operation"""
+    if not data:
+        return b''
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(other[:len(data)], 'big')).to_bytes(len(data), 'big')
+
+
+def _run_blocks(data, expanded_keys, encrypt):
+    """
+    Encrypt or decrypt every independent 16-byte block of ``data``
+
+    Uses the batched engine when NumPy is available, and the thread pool for
+    inputs of PARALLEL_MIN_BLOCKS blocks or more.
+    """
+    num_blocks = len(data) // 16
+    if not NUMPY_AVAILABLE or num_blocks < BATCH_MIN_BLOCKS:
+        block_function = encrypt_block if encrypt else decrypt_block
+        return b''.join(block_function(data[i:i+16], expanded_keys) for i in range(0, len(data), 16))
+
+    batched = encrypt_blocks_batched if encrypt else decrypt_blocks_batched
+    if WORKERS == 1 or num_blocks < PARALLEL_MIN_BLOCKS:
+        return batched(data, expanded_keys, False)[0]
+    chunk = PARALLEL_CHUNK_BLOCKS * 16
+    pieces = [data[i:i+chunk] for i in range(0, len(data), chunk)]
+    return b''.join(_get_executor().map(lambda piece: batched(piece, expanded_keys, False)[0], pieces))
+
+
+def counter_blocks(initial, count, inc32=False):
+    """
+    Return ``count`` consecutive counter blocks starting at ``initial``
+
+    Parameters:
+    initial (bytes): First counter block
+    count (int): Number of blocks
+    inc32 (bool): Increment only the last 32 bits, as GCM does; otherwise all 128
+
+    Returns:
+    bytes: The concatenated counter blocks
+    """
+    if inc32:
+        prefix = initial[:12]
+        start = int.from_bytes(initial[12:], 'big')
+        return b''.join(prefix + ((start + i) & 0xFFFFFFFF).to_bytes(4, 'big') for i in range(count))
+    start = int.from_bytes(initial, 'big')
+    mask = (1 << 128) - 1
+    return b''.join(((start + i) & mask).to_bytes(16, 'big') for i in range(count))
+
+
+def ctr_transform(data, initial, expanded_keys, inc32=False):
+    """
+    XOR ``data`` with the keystream of the counter blocks starting at ``initial``
+
+    Returns:
+    tuple: (output bytes, counter blocks, keystream)
+    """
+    count = (len(data) + 15) // 16
+    counters = counter_blocks(initial, count, inc32)
+    keystream = _run_blocks(counters, expanded_keys, encrypt=True)
+    return _xor(data, keystream), counters, keystream
+
+
+def cbc_encrypt(data, iv, expanded_keys):
+    """Encrypt padded ``data`` in CBC mode; each block depends on the one before it"""
+    output = bytearray()
+    previous = iv
+    for i in range(0, len(data), 16):
+        previous = encrypt_block(_xor(data[i:i+16], previous), expanded_keys)
+        output += previous
+    return bytes(output)
+
+
+def cbc_decrypt(data, iv, expanded_keys):
+    """Decrypt ``data`` in CBC mode; all blocks are decrypted at once, then XORed with their predecessors"""
+    return _xor(_run_blocks(data, expanded_keys, encrypt=False), iv + data)
+
+
+# --- GCM ---
+
+_GCM_R = 0xE1 << 120
+
+
+def _derive_ghash_tables(key):
+    """
+    Build the 8-bit multiplication tables for the GHASH key H = E(K, 0^128)
+
+    ``tables[j][b]`` is the product with H of byte ``b`` at byte position ``j``
+    of a block, so multiplying a block by H is 16 lookups instead of 128 bit steps.
+    """
+    h = int.from_bytes(encrypt_block(bytes(16), key_expansion(key)), 'big')
+    # powers[k]: H times the block with only bit k set (bit 127 is x^0 in GCM's bit order)
+    powers = [0] * 128
+    powers[127] = h
+    for k in range(127, 0, -1):
+        value = powers[k]
+        powers[k - 1] = (value >> 1) ^ _GCM_R if value & 1 else value >> 1
+    tables = []
+    for j in range(16):
+        shift = 8 * (15 - j)
+        table = [0] * 256
+        for b in range(1, 256):
+            low_bit = b & -b
+            table[b] = table[b ^ low_bit] ^ powers[shift + low_bit.bit_length() - 1]
+        tables.append(table)
+    return tables
+
+
+GHASH_TABLES = KeyMaterialCache('gcm_ghash_tables', _derive_ghash_tables)
+
+
+def ghash(tables, aad, ciphertext):
+    """
+    GHASH of the additional data and ciphertext, each zero-padded to whole blocks, then their bit lengths
+
+    Returns:
+    int: The hash as a 128-bit integer
+    """
+    def blocks(data):
+        padded = data + bytes(-len(data) % 16)
+        return [int.from_bytes(padded[i:i+16], 'big') for i in range(0, len(padded), 16)]
+
+    y = 0
+    for block in blocks(aad) + blocks(ciphertext) + [(len(aad) * 8) << 64 | len(ciphertext) * 8]:
+        x = y ^ block
+        y = 0
+        for j, table in enumerate(tables):
+            y ^= table[(x >> (120 - 8 * j)) & 0xFF]
+    return y
+
+
+def gcm_tag(key_bytes, expanded_keys, nonce, ciphertext, aad=b''):
+    """Return the GCM authentication tag of a ciphertext"""
+    j0 = nonce + b'\x00\x00\x00\x01'
+    with GHASH_TABLES.lease(key_bytes) as tables:
+        s = ghash(tables, aad, ciphertext)
+    return _xor(encrypt_block(j0, expanded_keys), s.to_bytes(16, 'big'))
+
+
+def _gcm_first_counter(nonce):
+    return nonce + b'\x00\x00\x00\x02'
+
+
+# --- Visualization ---
+
+def iter_mode_trace(mode, encrypt, expanded_keys, data, output, chain, start=0, stop=None):
+    """
+    Yield the visualization of blocks ``start`` to ``stop - 1`` (0-based) of a CBC, CTR or GCM run
+
+    Every block has 'chaining' with the values around the AES call, as hex, and
+    'rounds' with the trace of that call: the block cipher input for CBC, the
+    counter block for CTR and GCM (whose keystream is always an encryption).
+
+    Parameters:
+    chain (bytes): For CBC, the IV followed by the ciphertext, so block i is
+        chained to bytes 16*i to 16*i+16; for CTR and GCM, the counter blocks
+    """
+    total = (len(data) + 15) // 16
+    stop = total if stop is None else min(stop, total)
+    for index in range(max(start, 0), stop):
+        piece = slice(index * 16, index * 16 + 16)
+        rounds = []
+        if mode == 'CBC':
+            previous = chain[piece]
+            if encrypt:
+                block_input = _xor(data[piece], previous)
+                encrypt_block(block_input, expanded_keys, rounds)
+                chaining = {"plaintext": data[piece], "previous": previous, "blockInput": block_input,
+                            "ciphertext": output[piece]}
+            else:
+                block_output = decrypt_block(data[piece], expanded_keys, rounds)
+                chaining = {"ciphertext": data[piece], "blockOutput": block_output, "previous": previous,
+                            "plaintext": output[piece]}
+        else:
+            counter = chain[piece]
+            keystream = encrypt_block(counter, expanded_keys, rounds)
+            chaining = {"counter": counter, "keystream": keystream[:len(data[piece])], "input": data[piece],
+                        "output": output[piece]}
+        yield {
+            "block": index + 1,
+            "chaining": {name: bytes_to_hex(value) for name, value in chaining.items()},
+            "rounds": rounds
+        }
+
+
+# --- Entry point ---
+
+def aes_mode_fallback(operation, mode, message, key, iv=None, trace_blocks=None):
+    """
+    Encrypt or decrypt a message with AES in CBC, CTR or GCM mode, with the visualization
+
+    Parameters:
+    operation (str): 'encrypt' or 'decrypt'
+    mode (str): 'CBC', 'CTR' or 'GCM'
+    message (str): Plaintext, or base64 of IV, ciphertext and (GCM) tag to decrypt
+    key (str): The key; see normalize_key
+    iv (str): Hex IV, initial counter block or nonce for encryption; random if not given
+    trace_blocks (tuple): (start, stop) 0-based range of blocks to visualize; None for all
+
+    Returns:
+    dict: 'finalResult', 'blocks', 'totalBlocks', 'mode', 'iv' in hex and, for GCM, 'tag' in hex
+    """
+    try:
+        mode = mode.upper()
+        if mode not in IV_BYTES:
+            raise ValueError(f"Unsupported mode {mode}; use CBC, CTR or GCM")
+        encrypt = operation.lower() == 'encrypt'
+        key_bytes = normalize_key(key)
+        iv_bytes = IV_BYTES[mode]
+
+        if encrypt:
+            data = message.encode('utf-8')
+            if mode == 'CBC':
+                padding_length = 16 - (len(data) % 16)
+                data += bytes([padding_length] * padding_length)
+            iv_value = bytes.fromhex(iv) if iv else os.urandom(iv_bytes)
+            if len(iv_value) != iv_bytes:
+                raise ValueError(f"{mode} needs a {iv_bytes}-byte IV")
+            tag = None
+        else:
+            try:
+                raw = base64.b64decode(message)
+            except Exception:
+                return {
+                    "blocks": [],
+                    "finalResult": f"Error: {INVALID_BASE64}"
+                }
+            tag_bytes = TAG_BYTES if mode == 'GCM' else 0
+            if len(raw) < iv_bytes + tag_bytes:
+                raise ValueError(f"The input is too short for the {mode} IV")
+            iv_value = raw[:iv_bytes]
+            data = raw[iv_bytes:len(raw) - tag_bytes]
+            tag = raw[len(raw) - tag_bytes:] if tag_bytes else None
+            if mode == 'CBC' and (not data or len(data) % 16):
+                raise ValueError("The length of the provided data is not a multiple of the block length.")
+
+        with AES_ROUND_KEYS.lease(key_bytes) as expanded_keys:
+            if mode == 'CBC':
+                output = (cbc_encrypt if encrypt else cbc_decrypt)(data, iv_value, expanded_keys)
+                chain = iv_value + (output if encrypt else data)
+            else:
+                initial = _gcm_first_counter(iv_value) if mode == 'GCM' else iv_value
+                output, chain, _ = ctr_transform(data, initial, expanded_keys, inc32=mode == 'GCM')
+
+            if mode == 'GCM':
+                ciphertext = output if encrypt else data
+                expected_tag = gcm_tag(key_bytes, expanded_keys, iv_value, ciphertext)
+                if not encrypt and not hmac.compare_digest(expected_tag, tag):
+                    raise ValueError("GCM authentication failed: the tag does not match")
+                tag = expected_tag
+
+            start, stop = trace_blocks if trace_blocks is not None else (0, None)
+            blocks = list(iter_mode_trace(mode, encrypt, expanded_keys, data, output, chain, start, stop))
+
+        if encrypt:
+            result = base64.b64encode(iv_value + output + (tag or b'')).decode('utf-8')
+        else:
+            plaintext = output
+            if mode == 'CBC':
+                padding_length = output[-1]
+                if padding_length <= 16 and all(b == padding_length for b in output[-padding_length:]):
+                    plaintext = output[:-padding_length]
+            result = plaintext.decode('utf-8', errors='replace')
+
+        output_data = {
+            "blocks": blocks,
+            "finalResult": result,
+            "totalBlocks": (len(data) + 15) // 16,
+            "mode": mode,
+            "iv": bytes_to_hex(iv_value)
+        }
+        if tag is not None:
+            output_data["tag"] = bytes_to_hex(tag)
+        return output_data
+
+    except Exception as e:
+        return {
+            "blocks": [],
+            "finalResult": f"Error in Python AES fallback: {str(e)}"
+        }
@@ -3,5 +3,6 @@ AES Cipher Python Fallback Package
 """
 
 from .AES import aes_fallback
+from .AESModes import aes_mode_fallback
 
-__all__ = ['aes_fallback']
+__all__ = ['aes_fallback', 'aes_mode_fallback']
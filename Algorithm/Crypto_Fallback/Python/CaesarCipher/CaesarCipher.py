@@ -3,9 +3,47 @@ Caesar Cipher Python Fallback Implementation
 
 This module provides the fallback implementation of the Caesar cipher when the C++/Java executables
 are not available or encounter errors. It includes functionality for encryption, decryption,
-brute force analysis, and frequency analysis.
+brute force analysis, frequency analysis, and an automatic crack that ranks the shifts by how
+English the decrypted letter frequencies look.
 """
 
+import math
+import string
+
+from TextStats.TextStats import chi_squared_scores, format_frequency_report, letter_histogram, text_stats
+
+def _shift_table(shift):
+    """Return the str.translate table moving every ASCII letter ``shift`` places forward"""
+    lower = string.ascii_lowercase
+    upper = string.ascii_uppercase
+    return str.maketrans(lower + upper, lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift])
+
+# Translation tables for every shift, built once: ENCRYPT_TABLES[s] shifts
+# letters forward by s and DECRYPT_TABLES[s] back by s. Characters other than
+# the ASCII letters are left as they are.
+ENCRYPT_TABLES = tuple(_shift_table(shift) for shift in range(26))
+DECRYPT_TABLES = tuple(_shift_table(-shift % 26) for shift in range(26))
+
+BRUTE_FORCE_HEADER = (
+    "BRUTE FORCE ANALYSIS RESULTS:\n"
+    "================================\n\n"
+)
+
+BRUTE_FORCE_FOOTER = (
+    "\n================================\n"
+    "Analyze the results above to find the most meaningful text.\n\n"
+    "IF NO MEANINGFUL WORDS FOUND:\n"
+    "1. Check if input is actually Caesar cipher (single-shift substitution)\n"
+    "2. Consider if text might be double-encrypted\n"
+    "3. Verify the input contains valid encrypted text\n"
+    "4. Try applying frequency analysis instead\n"
+    "5. The text might be using a different cipher method (Vigenere, etc.)\n"
+    "6. For very short texts, multiple valid decryptions may exist"
+)
+
+# Characters of each candidate decryption returned by caesar_auto_crack
+PREVIEW_CHARS = 200
+
 def caesar_cipher_fallback(message, shift, operation):
     """
     Python fallback implementation of Caesar Cipher - matches PDF specification
@@ -13,50 +51,96 @@ def caesar_cipher_fallback(message, shift, operation):
     Parameters:
     message (str): The text to be processed
     shift (int): The shift value for encryption/decryption
-    operation (str): The operation to perform ('encrypt', 'decrypt', 'brute-force', or 'frequency')
+    operation (str): The operation to perform ('encrypt', 'decrypt', 'brute-force', 'frequency' or 'auto-crack')
     
     Returns:
     str: The result of the cipher operation
     """
+    if operation == 'auto-crack':
+        return format_crack_report(caesar_auto_crack(message), message)
+    
+    if operation == 'frequency':
+        return frequency_analysis(message)
+    
     if operation == 'brute-force':
-        # Perform brute force analysis
-        result = "BRUTE FORCE ANALYSIS RESULTS:\n"
-        result += "================================\n\n"
-        
-        for test_shift in range(1, 26):
-            decrypted = ""
-            for char in message:
-                if char.isalpha():
-                    base = ord('A') if char.isupper() else ord('a')
-                    decrypted += chr(base + (ord(char) - base + (26 - test_shift)) % 26)
-                else:
-                    decrypted += char
-            result += f"Shift {test_shift}: {decrypted}\n"
-        
-        result += "\n================================\n"
-        result += "Analyze the results above to find the most meaningful text.\n\n"
-        result += "IF NO MEANINGFUL WORDS FOUND:\n"
-        result += "1. Check if input is actually Caesar cipher (single-shift substitution)\n"
-        result += "2. Consider if text might be double-encrypted\n" 
-        result += "3. Verify the input contains valid encrypted text\n"
-        result += "4. Try applying frequency analysis instead\n"
-        result += "5. The text might be using a different cipher method (Vigenere, etc.)\n"
-        result += "6. For very short texts, multiple valid decryptions may exist"
-        return result
+        # Perform brute force analysis: one translate call per candidate shift
+        return "".join((
+            BRUTE_FORCE_HEADER,
+            "".join(f"Shift {test_shift}: {message.translate(DECRYPT_TABLES[test_shift])}\n"
+                    for test_shift in range(1, 26)),
+            BRUTE_FORCE_FOOTER,
+        ))
     
     # Regular encrypt/decrypt operations
-    result = ""
-    
-    for char in message:
-        if char.isalpha():
-            base = ord('A') if char.isupper() else ord('a')
-            if operation == 'encrypt':
-                result += chr(base + (ord(char) - base + shift) % 26)
-            else:  # decrypt - using 26 - shift method from PDF
-                result += chr(base + (ord(char) - base + (26 - shift)) % 26)
-        else:
-            result += char
+    if operation == 'encrypt':
+        return message.translate(ENCRYPT_TABLES[shift % 26])
+    # decrypt - using 26 - shift method from PDF
+    return message.translate(DECRYPT_TABLES[shift % 26])
+
+def caesar_auto_crack(message, top_k=3, preview_chars=PREVIEW_CHARS):
+    """
+    Find the most likely shifts of a Caesar ciphertext without trying them by hand
+    
+    The letter histogram is counted once and every shift is scored by its
+    chi-squared distance from English. Confidence is the relative likelihood
+    exp(-chi2 / 2) of a shift among all 26. Only the top candidates are
+    decrypted, and only their first ``preview_chars`` characters.
+    
+    Parameters:
+    message (str): The ciphertext
+    top_k (int): Number of candidates to return
+    preview_chars (int): Length of each decrypted preview
+    
+    Returns:
+    dict: 'letters' counted and 'candidates', best first, each with 'shift',
+    'chi_squared', 'confidence' (0 to 1) and 'preview'
+    """
+    histogram = letter_histogram(message)
+    letters = sum(histogram)
+    if letters == 0:
+        return {'letters': 0, 'candidates': []}
+    
+    scores = chi_squared_scores(histogram)
+    best = min(scores)
+    weights = [math.exp(-(score - best) / 2) for score in scores]
+    total_weight = sum(weights)
+    ranked = sorted(range(26), key=scores.__getitem__)[:max(1, min(top_k, 26))]
+    preview = message[:preview_chars]
+    return {
+        'letters': letters,
+        'candidates': [{
+            'shift': shift,
+            'chi_squared': round(scores[shift], 3),
+            'confidence': round(weights[shift] / total_weight, 4),
+            'preview': preview.translate(DECRYPT_TABLES[shift]),
+        } for shift in ranked]
+    }
+
+def format_crack_report(crack, message):
+    """
+    Format the result of caesar_auto_crack as text, with the best candidate fully decrypted
+    
+    Parameters:
+    crack (dict): Result of caesar_auto_crack
+    message (str): The ciphertext that was cracked
     
+    Returns:
+    str: Formatted report
+    """
+    result = "AUTO-CRACK RESULTS:\n"
+    result += "================================\n\n"
+    if not crack['candidates']:
+        return result + "No letters found; there is nothing to crack."
+    
+    result += f"Letters analysed: {crack['letters']}\n"
+    result += "Shifts ranked by chi-squared distance from English letter frequencies:\n\n"
+    for rank, candidate in enumerate(crack['candidates'], 1):
+        result += (f"{rank}. Shift {candidate['shift']}: confidence {candidate['confidence'] * 100:.1f}% "
+                   f"(chi-squared {candidate['chi_squared']:.1f})\n")
+    
+    best = crack['candidates'][0]['shift']
+    result += f"\nMost likely plaintext (shift {best}):\n"
+    result += message.translate(DECRYPT_TABLES[best])
     return result
 
 def frequency_analysis(message):
@@ -69,27 +153,9 @@ def frequency_analysis(message):
     Returns:
     str: Formatted frequency analysis results
     """
-    # Count letter frequencies
-    freq = [0] * 26
-    total_letters = 0
-    
-    for char in message:
-        if char.isalpha():
-            freq[ord(char.upper()) - ord('A')] += 1
-            total_letters += 1
-    
     result = "CAESAR FREQUENCY ANALYSIS:\n"
     result += "==============================\n\n"
-    result += "Letter frequencies:\n"
-    
-    for i in range(26):
-        letter = chr(ord('A') + i)
-        percentage = (freq[i] * 100.0 / total_letters) if total_letters > 0 else 0.0
-        result += f"{letter}: {freq[i]} ({percentage:.1f}%)\n"
-    
-    result += "\nCommon English letter frequencies:\n"
-    result += "E: 12.7%, T: 9.1%, A: 8.2%, O: 7.5%, I: 7.0%, N: 6.7%\n"
-    result += "S: 6.3%, H: 6.1%, R: 6.0%, D: 4.3%, L: 4.0%, C: 2.8%\n\n"
+    result += format_frequency_report(text_stats(message))
     
     result += "Analysis: Compare the frequencies above with typical English.\n"
     result += "For Caesar cipher, the entire distribution is shifted. Look for a\n"
@@ -10,6 +10,13 @@ import base64
 from Crypto.Cipher import DES
 from Crypto.Util.Padding import pad, unpad
 
+from KeyCache import KeyMaterialCache
+
+# ECB cipher objects of recently used keys; creating one runs the DES key schedule.
+# The 16 subkeys live inside PyCryptodome, so an evicted cipher is released rather
+# than wiped. ECB keeps no state between calls, so a cipher can be shared.
+DES_CIPHERS = KeyMaterialCache('des_subkeys', lambda key: DES.new(key, DES.MODE_ECB), wipe=lambda cipher: None)
+
 def des_fallback(operation, key_str, text_str):
     """
     Python fallback implementation of DES using PyCryptodome
@@ -32,32 +39,31 @@ def des_fallback(operation, key_str, text_str):
             # Truncate if too long
             key_bytes = key_bytes[:8]
         
-        # Create DES cipher in ECB mode
-        cipher = DES.new(key_bytes, DES.MODE_ECB)
-        
-        if operation.lower() == 'encrypt':
-            # Convert text to bytes and pad to block size
-            data = text_str.encode('utf-8')
-            padded_data = pad(data, DES.block_size)
-            
-            # Encrypt and encode to base64
-            encrypted_bytes = cipher.encrypt(padded_data)
-            return base64.b64encode(encrypted_bytes).decode('utf-8')
-        
-        elif operation.lower() == 'decrypt':
-            try:
-                # Decode from base64 and decrypt
-                encrypted_bytes = base64.b64decode(text_str)
-                decrypted_padded = cipher.decrypt(encrypted_bytes)
+        # Reuse the DES cipher in ECB mode for this key
+        with DES_CIPHERS.lease(key_bytes) as cipher:
+            if operation.lower() == 'encrypt':
+                # Convert text to bytes and pad to block size
+                data = text_str.encode('utf-8')
+                padded_data = pad(data, DES.block_size)
                 
-                # Remove padding and convert to string
-                decrypted_bytes = unpad(decrypted_padded, DES.block_size)
-                return decrypted_bytes.decode('utf-8')
-            except Exception as e:
-                return f"Decryption error: {str(e)}"
-        
-        else:
-            return f"Invalid operation: {operation}. Use 'encrypt' or 'decrypt'"
+                # Encrypt and encode to base64
+                encrypted_bytes = cipher.encrypt(padded_data)
+                return base64.b64encode(encrypted_bytes).decode('utf-8')
+            
+            elif operation.lower() == 'decrypt':
+                try:
+                    # Decode from base64 and decrypt
+                    encrypted_bytes = base64.b64decode(text_str)
+                    decrypted_padded = cipher.decrypt(encrypted_bytes)
+                    
+                    # Remove padding and convert to string
+                    decrypted_bytes = unpad(decrypted_padded, DES.block_size)
+                    return decrypted_bytes.decode('utf-8')
+                except Exception as e:
+                    return f"Decryption error: {str(e)}"
+            
+            else:
+                return f"Invalid operation: {operation}. Use 'encrypt' or 'decrypt'"
             
     except Exception as e:
         return f"DES fallback error: {str(e)}"
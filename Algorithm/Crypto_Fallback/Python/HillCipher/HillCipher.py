@@ -4,90 +4,91 @@ Hill Cipher Python Fallback Implementation
 This module provides the fallback implementation of the Hill cipher when the C++/Java executables
 are not available or encounter errors. It includes functionality for encryption and decryption
 using matrix operations, matching the C++ implementation.
+
+26 is not prime, so Gaussian elimination cannot run modulo 26 directly. Since
+26 = 2 * 13, invertibility and the inverse are worked out by elimination over
+the fields modulo 2 and modulo 13 in O(n^3) and put back together with the
+Chinese remainder theorem: a matrix is invertible modulo 26 exactly when it is
+invertible modulo 2 and modulo 13.
 """
 
+from KeyCache import KeyMaterialCache
+
 def mod26(x):
     """Calculate modulo 26 of a number, handling negative numbers correctly"""
     return (x % 26 + 26) % 26
 
-def mod_inverse(a):
-    """Calculate modular multiplicative inverse modulo 26"""
-    a = mod26(a)
-    for x in range(1, 26):
-        if mod26(a * x) == 1:
-            return x
-    return -1  # No inverse exists
-
-def determinant(matrix, n):
-    """Calculate determinant of a matrix modulo 26"""
-    if n == 1:
-        return matrix[0][0]
-    
-    det = 0
-    sign = 1
-    
-    for i in range(n):
-        # Create submatrix for cofactor
-        submatrix = []
-        for row in range(1, n):
-            subrow = []
-            for col in range(n):
-                if col != i:
-                    subrow.append(matrix[row][col])
-            submatrix.append(subrow)
-        
-        # Calculate cofactor and add to determinant
-        det = mod26(det + sign * matrix[0][i] * determinant(submatrix, n-1))
-        sign = -sign
+def _inverse_table(modulus):
+    """Multiplicative inverse of every residue, or -1 where there is none"""
+    table = []
+    for a in range(modulus):
+        try:
+            table.append(pow(a, -1, modulus))
+        except ValueError:
+            table.append(-1)
+    return tuple(table)
+
+# The prime factors of 26, with the inverses of their residues
+PRIME_FACTORS = (2, 13)
+PRIME_INVERSES = {prime: _inverse_table(prime) for prime in PRIME_FACTORS}
+
+def crt26(residue_2, residue_13):
+    """Return the number modulo 26 with the given residues modulo 2 and modulo 13"""
+    return residue_13 + 13 * ((residue_2 - residue_13) % 2)
+
+def _eliminate(matrix, n, p, augment=False):
+    """
+    Gauss-Jordan elimination of a matrix over the integers modulo a prime
     
-    return mod26(det)
-
-def get_cofactor(matrix, temp, p, q, n):
-    """Get cofactor of matrix[p][q]"""
-    i, j = 0, 0
-    for row in range(n):
-        for col in range(n):
-            if row != p and col != q:
-                temp[i][j] = matrix[row][col]
-                j += 1
-                if j == n - 1:
-                    j = 0
-                    i += 1
-
-def adjoint(matrix, adj, n):
-    """Calculate adjoint of a matrix"""
-    if n == 1:
-        adj[0][0] = 1
-        return
+    Parameters:
+    matrix (list): n x n matrix
+    n (int): Dimension
+    p (int): The prime modulus
+    augment (bool): Also reduce an identity matrix alongside, giving the inverse
     
-    for i in range(n):
-        for j in range(n):
-            # Get cofactor
-            temp = [[0 for _ in range(n-1)] for _ in range(n-1)]
-            get_cofactor(matrix, temp, i, j, n)
-            
-            # Sign of adj[j][i] is positive if (i+j) is even, otherwise negative
-            sign = 1 if (i + j) % 2 == 0 else -1
-            
-            # Interchanging rows and columns to get the transpose of the cofactor matrix
-            adj[j][i] = mod26(sign * determinant(temp, n-1))
+    Returns:
+    tuple: (determinant modulo p, inverse modulo p or None if augment is false or the matrix is singular)
+    """
+    inverses = PRIME_INVERSES[p]
+    rows = [[value % p for value in row] + ([int(i == j) for j in range(n)] if augment else [])
+            for i, row in enumerate(matrix[:n])]
+    width = len(rows[0]) if rows else 0
+    det = 1
+    for col in range(n):
+        pivot = next((row for row in range(col, n) if rows[row][col]), None)
+        if pivot is None:
+            return 0, None
+        if pivot != col:
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            det = -det
+        pivot_row = rows[col]
+        det = det * pivot_row[col] % p
+        # Scale the pivot row to a leading 1, then clear the column in the other rows
+        # (only below the pivot when just the determinant is needed)
+        scale = inverses[pivot_row[col]]
+        pivot_row[col:] = [value * scale % p for value in pivot_row[col:]]
+        for row in (range(n) if augment else range(col + 1, n)):
+            if row == col or not rows[row][col]:
+                continue
+            factor = rows[row][col]
+            target = rows[row]
+            target[col:] = [(value - factor * pivot) % p for value, pivot in zip(target[col:], pivot_row[col:])]
+    inverse_rows = [row[n:width] for row in rows] if augment else None
+    return det % p, inverse_rows
 
 def inverse(matrix, inv, n):
     """Calculate inverse of a matrix modulo 26"""
-    det = determinant(matrix, n)
-    det_inv = mod_inverse(det)
-    
-    if det_inv == -1:
+    _, inv_2 = _eliminate(matrix, n, 2, augment=True)
+    if inv_2 is None:
         return False  # Matrix is not invertible
+    _, inv_13 = _eliminate(matrix, n, 13, augment=True)
+    if inv_13 is None:
+        return False
     
-    # Find adjoint
-    adj = [[0 for _ in range(n)] for _ in range(n)]
-    adjoint(matrix, adj, n)
-    
-    # Calculate inverse using adj / det
+    # Combine the inverses modulo 2 and 13 entry by entry
     for i in range(n):
         for j in range(n):
-            inv[i][j] = mod26(adj[i][j] * det_inv)
+            inv[i][j] = crt26(inv_2[i][j], inv_13[i][j])
     
     return True
 
@@ -101,8 +102,7 @@ def multiply(matrix, vec, n):
 
 def is_invertible(matrix, n):
     """Check if matrix is invertible modulo 26"""
-    det = determinant(matrix, n)
-    return mod_inverse(det) != -1
+    return all(_eliminate(matrix, n, prime)[0] for prime in PRIME_FACTORS)
 
 def flat_to_matrix(flat, n):
     """Convert flat vector to 2D matrix"""
@@ -136,21 +136,29 @@ def encrypt(input_vector, key_matrix_flat, n):
     
     return result
 
-def decrypt(input_vector, key_matrix_flat, n):
-    """Decrypt using Hill cipher"""
+def _derive_inverse(key):
+    """Inverse of a (dimension, key matrix) key, or None if it is not invertible modulo 26"""
+    n, key_matrix_flat = key
     key_matrix = flat_to_matrix(key_matrix_flat, n)
-    result = []
-    
-    # Check if matrix is invertible
-    if not is_invertible(key_matrix, n):
-        print("Error: Key matrix is not invertible modulo 26")
-        return []
-    
-    # Calculate inverse matrix
     inv_key_matrix = [[0 for _ in range(n)] for _ in range(n)]
     if not inverse(key_matrix, inv_key_matrix, n):
-        print("Error: Failed to calculate inverse matrix")
-        return []
+        return None
+    return inv_key_matrix
+
+# Inverse matrices of recently used keys, so decryption skips the elimination
+HILL_INVERSE_MATRICES = KeyMaterialCache('hill_inverse_matrices', _derive_inverse)
+
+def decrypt(input_vector, key_matrix_flat, n):
+    """Decrypt using Hill cipher"""
+    with HILL_INVERSE_MATRICES.lease((n, tuple(key_matrix_flat))) as inv_key_matrix:
+        if inv_key_matrix is None:
+            print("Error: Key matrix is not invertible modulo 26")
+            return []
+        return _decrypt_blocks(input_vector, inv_key_matrix, n)
+
+def _decrypt_blocks(input_vector, inv_key_matrix, n):
+    """Multiply each block of the input with the inverse key matrix"""
+    result = []
     
     # Process input vector in blocks of size n
     for i in range(0, len(input_vector), n):
@@ -0,0 +1,155 @@
+"""
+Memo of derived key material for the Python fallbacks
+
+Expanding an AES key, inverting a Hill key matrix or setting up the DES
+subkeys depends only on the key, yet the fallbacks used to redo that work for
+every block or every request. A KeyMaterialCache keeps the derived material for
+the most recently used keys, bounded and safe to share between threads.
+
+Entries are indexed by a keyed BLAKE2b digest of the key, with a salt that is
+random per process, so the cache index does not hold the keys themselves.
+Derived material is handed out through ``lease()``; when an entry is evicted or
+the cache is cleared, its material is overwritten with zeros as soon as the
+last lease on it ends.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+DEFAULT_MAX_ENTRIES = 64
+
+# Per-process salt for the index digests
+_SALT = os.urandom(16)
+
+_caches = []
+
+
+def wipe(material):
+    """
+    Overwrite derived key material in place, as far as Python allows
+
+    bytearrays are zero-filled and lists (including nested lists such as a
+    matrix) have every element set to 0. Immutable values cannot be wiped and
+    are only released.
+    """
+    if isinstance(material, bytearray):
+        material[:] = bytes(len(material))
+    elif isinstance(material, list):
+        for i, item in enumerate(material):
+            if isinstance(item, (list, bytearray)):
+                wipe(item)
+            else:
+                material[i] = 0
+
+
+class _Entry:
+    __slots__ = ('material', 'leases', 'evicted')
+
+    def __init__(self, material):
+        self.material = material
+        self.leases = 0
+        self.evicted = False
+
+
+class KeyMaterialCache:
+    """
+    Bounded LRU memo from key material to something derived from it
+
+    Parameters:
+    name (str): Name used in the statistics
+    derive (callable): Computes the derived material from the key
+    max_entries (int): Keys kept before the least recently used one is evicted
+    wipe (callable): Zeroizes evicted material; defaults to ``wipe``
+    """
+
+    def __init__(self, name, derive, max_entries=DEFAULT_MAX_ENTRIES, wipe=wipe):
+        self.name = name
+        self.derive = derive
+        self.max_entries = max_entries
+        self.wipe = wipe
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches.append(self)
+
+    @staticmethod
+    def _index(key):
+        if not isinstance(key, (bytes, bytearray)):
+            key = repr(key).encode('utf-8')
+        return hashlib.blake2b(key, key=_SALT, digest_size=16).digest()
+
+    def _retire(self, entry):
+        """Zeroize an entry that has left the cache, or leave that to its last lease."""
+        entry.evicted = True
+        if entry.leases == 0:
+            self.wipe(entry.material)
+
+    @contextmanager
+    def lease(self, key):
+        """
+        Use the derived material of a key for the duration of a with block
+
+        The material is shared with other callers and must not be modified.
+
+        Parameters:
+        key: The key material; bytes, or anything with a stable repr such as a tuple of ints
+
+        Yields:
+        The derived material
+        """
+        index = self._index(key)
+        with self._lock:
+            entry = self._entries.get(index)
+            if entry is not None:
+                self._entries.move_to_end(index)
+                self.hits += 1
+                entry.leases += 1
+        if entry is None:
+            # Derive outside the lock; two threads missing on the same key both derive it
+            entry = _Entry(self.derive(key))
+            with self._lock:
+                self.misses += 1
+                entry.leases += 1
+                previous = self._entries.pop(index, None)
+                if previous is not None:
+                    self._retire(previous)
+                self._entries[index] = entry
+                while len(self._entries) > self.max_entries:
+                    _, oldest = self._entries.popitem(last=False)
+                    self.evictions += 1
+                    self._retire(oldest)
+        try:
+            yield entry.material
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                if entry.evicted and entry.leases == 0:
+                    self.wipe(entry.material)
+
+    def clear(self):
+        """Drop and zeroize every entry."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+            for entry in entries:
+                self._retire(entry)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def key_cache_stats():
+    """Return the statistics of every key material cache in this process, keyed by name."""
+    return {cache.name: cache.stats() for cache in _caches}
@@ -0,0 +1,5 @@
+"""
+Derived Key Material Cache Package
+"""
+
+from .KeyCache import KeyMaterialCache, key_cache_stats, wipe
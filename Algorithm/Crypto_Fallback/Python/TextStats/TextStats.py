@@ -0,0 +1,274 @@
+"""
+Letter statistics shared by the classical cipher fallbacks
+
+The frequency analyses and the automatic cracks of the Caesar and Vigenere
+fallbacks all start from the same counts. A LetterStatistics takes text in
+chunks of any size and keeps letter, bigram and trigram counts of its ASCII
+letters, case-folded, with everything else removed (so n-grams run across
+spaces and punctuation, as in classical cryptanalysis). Index of coincidence, entropy and
+the most common n-grams are derived from the counts.
+
+Each chunk is reduced to its letters with one bytes.translate call and, with
+NumPy, counted with three bincounts over ``numpy.frombuffer``. Only the last
+two letters are carried from one chunk to the next, so ``file_chunks`` lets a
+memory-mapped file of any size be analysed in constant memory.
+"""
+
+import math
+import mmap
+import string
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+LETTERS = string.ascii_letters.encode('ascii')
+
+# bytes.translate arguments keeping the ASCII letters only, in uppercase
+NON_LETTERS = bytes(byte for byte in range(256) if byte not in LETTERS)
+UPPERCASE = bytes.maketrans(string.ascii_lowercase.encode('ascii'), string.ascii_uppercase.encode('ascii'))
+
+# Relative frequencies of A-Z in English text, in percent
+ENGLISH_FREQUENCIES = (
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+)
+
+# Index of coincidence of English text and of uniformly random letters
+ENGLISH_IOC = 0.0667
+RANDOM_IOC = 1 / 26
+
+# Bytes per chunk read by file_chunks
+CHUNK_BYTES = 1 << 22
+
+
+def fold_letters(text):
+    """
+    Return the ASCII letters of a text in uppercase, as bytes
+
+    Multi-byte UTF-8 characters only have bytes >= 128, so they never count as letters.
+
+    Parameters:
+    text (str or bytes): The text; bytes are taken as UTF-8 or any ASCII-compatible encoding
+    """
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return bytes(text).translate(UPPERCASE, NON_LETTERS)
+
+
+def _ngram_label(index, size):
+    letters = []
+    for _ in range(size):
+        index, letter = divmod(index, 26)
+        letters.append(chr(ord('A') + letter))
+    return ''.join(reversed(letters))
+
+
+class LetterStatistics:
+    """
+    Running letter, bigram and trigram counts of a text fed in chunks
+
+    Parameters:
+    text (str or bytes): Optional first chunk
+    """
+
+    def __init__(self, text=None):
+        self.letters = [0] * 26
+        self.bigrams = [0] * 26 ** 2
+        self.trigrams = [0] * 26 ** 3
+        self._tail = b''
+        if text is not None:
+            self.update(text)
+
+    def update(self, chunk):
+        """Add a chunk of text (str or bytes) to the counts"""
+        folded = fold_letters(chunk)
+        if not folded:
+            return self
+        # The letters carried over from the previous chunk complete its n-grams
+        stream = self._tail + folded
+        self._tail = stream[-2:]
+        if NUMPY_AVAILABLE:
+            values = np.frombuffer(stream, dtype=np.uint8).astype(np.intp) - ord('A')
+            bigrams = values[:-1] * 26 + values[1:]
+            trigrams = bigrams[:-1] * 26 + values[2:]
+            # Only n-grams ending in the new letters are new
+            skip = len(stream) - len(folded)
+            counts = (
+                (self.letters, np.bincount(values[skip:], minlength=26)),
+                (self.bigrams, np.bincount(bigrams[max(0, skip - 1):], minlength=26 ** 2)),
+                (self.trigrams, np.bincount(trigrams[max(0, skip - 2):], minlength=26 ** 3)),
+            )
+            for total, added in counts:
+                for index in np.flatnonzero(added).tolist():
+                    total[index] += int(added[index])
+            return self
+
+        skip = len(stream) - len(folded)
+        for index, letter in enumerate(string.ascii_uppercase.encode('ascii')):
+            self.letters[index] += folded.count(letter)
+        values = [byte - ord('A') for byte in stream]
+        for position in range(max(1, skip), len(values)):
+            bigram = values[position - 1] * 26 + values[position]
+            self.bigrams[bigram] += 1
+            if position >= 2:
+                self.trigrams[(values[position - 2] * 26 ** 2) + bigram] += 1
+        return self
+
+    @property
+    def total(self):
+        """Number of letters counted"""
+        return sum(self.letters)
+
+    @property
+    def index_of_coincidence(self):
+        """Probability that two letters drawn from the text are equal"""
+        return index_of_coincidence(self.letters)
+
+    @property
+    def entropy(self):
+        """Shannon entropy of the letter distribution, in bits per letter"""
+        total = self.total
+        # Summing -p * log2(p) keeps a single-letter text at 0.0 rather than -0.0
+        return sum(count / total * -math.log2(count / total) for count in self.letters if count) if total else 0.0
+
+    def most_common_bigrams(self, n=10):
+        """Return the n most common bigrams as (bigram, count) pairs"""
+        return _most_common(self.bigrams, 2, n)
+
+    def most_common_trigrams(self, n=10):
+        """Return the n most common trigrams as (trigram, count) pairs"""
+        return _most_common(self.trigrams, 3, n)
+
+
+def _most_common(counts, size, n):
+    if NUMPY_AVAILABLE:
+        array = np.asarray(counts)
+        # Stable sort on the negated counts keeps ties in alphabetical order
+        order = np.argsort(-array, kind='stable')[:n].tolist()
+    else:
+        order = sorted(range(len(counts)), key=lambda index: -counts[index])[:n]
+    return [(_ngram_label(index, size), counts[index]) for index in order if counts[index]]
+
+
+def text_stats(text):
+    """Return the LetterStatistics of a whole text"""
+    return LetterStatistics(text)
+
+
+def stream_stats(chunks):
+    """
+    Return the LetterStatistics of a text given as an iterable of chunks
+
+    Parameters:
+    chunks (iterable): str or bytes chunks, e.g. from file_chunks
+    """
+    stats = LetterStatistics()
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def file_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """
+    Yield a file in chunks through a memory map, so only one chunk is held at a time
+
+    Parameters:
+    path (str): The file; its letters are taken as ASCII
+    chunk_bytes (int): Bytes per chunk
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+        with mapped:
+            for start in range(0, len(mapped), chunk_bytes):
+                yield mapped[start:start + chunk_bytes]
+
+
+def index_of_coincidence(histogram):
+    """
+    Index of coincidence of a letter histogram
+
+    Parameters:
+    histogram (list): 26 letter counts
+
+    Returns:
+    float: Probability that two letters drawn without replacement are equal; 0 for fewer than 2 letters
+    """
+    total = sum(histogram)
+    if total < 2:
+        return 0.0
+    return sum(count * (count - 1) for count in histogram) / (total * (total - 1))
+
+
+def letter_histogram(message):
+    """
+    Count the ASCII letters of a message, case-insensitively
+
+    Returns:
+    list: 26 counts, A to Z
+    """
+    if NUMPY_AVAILABLE:
+        counts = np.bincount(np.frombuffer(message.encode('utf-8'), dtype=np.uint8), minlength=256)
+        return (counts[65:91] + counts[97:123]).tolist()
+    return [message.count(upper) + message.count(lower)
+            for upper, lower in zip(string.ascii_uppercase, string.ascii_lowercase)]
+
+
+def chi_squared_scores(histogram):
+    """
+    Score every decryption shift against English letter frequencies
+
+    Decrypting with shift s turns ciphertext letter (i + s) into plaintext
+    letter i, so the plaintext histogram is the ciphertext one rotated by s.
+
+    Parameters:
+    histogram (list): 26 ciphertext letter counts, A to Z
+
+    Returns:
+    list: Chi-squared statistic for shifts 0 to 25; lower is more English-like
+    """
+    total = sum(histogram)
+    if NUMPY_AVAILABLE:
+        expected = np.array(ENGLISH_FREQUENCIES) * (total / 100.0)
+        # rotations[s, i] is the ciphertext letter that shift s decrypts to letter i
+        rotations = (np.arange(26)[None, :] + np.arange(26)[:, None]) % 26
+        observed = np.asarray(histogram, dtype=np.float64)[rotations]
+        return (((observed - expected) ** 2) / expected).sum(axis=1).tolist()
+    expected = [frequency * total / 100.0 for frequency in ENGLISH_FREQUENCIES]
+    return [sum((histogram[(i + shift) % 26] - expected[i]) ** 2 / expected[i] for i in range(26))
+            for shift in range(26)]
+
+
+def format_frequency_report(stats):
+    """
+    Format the letter frequency table and n-gram statistics of the frequency analyses
+
+    Parameters:
+    stats (LetterStatistics): Statistics of the analysed text
+
+    Returns:
+    str: Letter frequencies, the English reference frequencies and the text statistics
+    """
+    total = stats.total
+    lines = ["Letter frequencies:"]
+    for i, count in enumerate(stats.letters):
+        percentage = (count * 100.0 / total) if total > 0 else 0.0
+        lines.append(f"{chr(ord('A') + i)}: {count} ({percentage:.1f}%)")
+    lines.append("")
+    lines.append("Common English letter frequencies:")
+    lines.append("E: 12.7%, T: 9.1%, A: 8.2%, O: 7.5%, I: 7.0%, N: 6.7%")
+    lines.append("S: 6.3%, H: 6.1%, R: 6.0%, D: 4.3%, L: 4.0%, C: 2.8%")
+    lines.append("")
+    lines.append("Text statistics:")
+    lines.append(f"Index of coincidence: {stats.index_of_coincidence:.4f} "
+                 f"(English text {ENGLISH_IOC:.4f}, random letters {RANDOM_IOC:.4f})")
+    lines.append(f"Entropy: {stats.entropy:.3f} bits per letter (English text about 4.18)")
+    lines.append("Most common bigrams: " + ", ".join(f"{gram} {count}" for gram, count in stats.most_common_bigrams(8)))
+    lines.append("Most common trigrams: " + ", ".join(f"{gram} {count}" for gram, count in stats.most_common_trigrams(8)))
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,5 @@
+"""
+Shared Text Statistics Package
+"""
+
+from .TextStats import LetterStatistics, file_chunks, stream_stats, text_stats
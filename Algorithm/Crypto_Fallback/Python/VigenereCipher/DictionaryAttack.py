@@ -0,0 +1,354 @@
+"""
+Parallel dictionary attack on Vigenere ciphertexts
+
+The 'brute-force' operation tries a fixed list of common keys. This module
+tries every word of a wordlist file instead, which can hold millions of
+entries, and runs in the background so its progress can be polled.
+
+The wordlist is cut into byte ranges (shards) that worker processes read
+from the file themselves, so no word is pickled. All attacks share one
+ProcessPoolExecutor, whose workers are spawned rather than forked from the
+threaded server, and start_attack refuses new attacks beyond a limit. The
+start of the ciphertext and a stop flag live in one shared memory block per
+attack that a worker attaches to once.
+
+A key is never used to decrypt anything. Its fitness is the share of the
+ciphertext prefix letters that it decrypts to one of E T A O I N S H R, the
+nine most frequent letters in English (about 70% of English text and 35% of
+random letters). For a key length L, the prefix letters of every residue class
+are counted once; the fitness of a key is then L table lookups. Once a key
+reaches the threshold, the stop flag is set and the other workers return at
+their next check.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from TextStats.TextStats import fold_letters
+
+from VigenereCipher.VigenereCipher import PREVIEW_CHARS, period_histograms, vigenere_transform
+
+# Letters of the ciphertext prefix the keys are scored on
+PREFIX_LETTERS = 800
+
+# Fitness at which a key is taken as the answer and the attack stops
+FITNESS_THRESHOLD = 0.65
+
+# Bytes of wordlist per shard, and words tried between two checks of the stop flag
+SHARD_BYTES = 1 << 20
+CHECK_INTERVAL = 4096
+
+# Keys kept per attack, best first
+TOP_KEYS = 5
+
+# Finished attacks kept for polling; older ones are forgotten
+MAX_FINISHED_ATTACKS = 32
+
+COMMON_LETTERS = b'ETAOINSHR'
+
+# Maps an uppercase key letter to its shift, as a byte
+KEY_SHIFTS = bytes.maketrans(bytes(range(65, 91)), bytes(range(26)))
+
+# Layout of the shared memory block: stop flag, then the uppercase prefix letters
+STOP_FLAG = 0
+PREFIX_OFFSET = 8
+
+RUNNING = 'running'
+FOUND = 'found'
+EXHAUSTED = 'exhausted'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+# Shared memory block of the last attack this worker process ran a shard of, by name
+_attached = {}
+
+# The worker pool shared by all attacks, created by the first one
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class TooManyAttacks(RuntimeError):
+    """Raised by start_attack when the limit of running attacks is reached"""
+
+
+def fitness_tables(letters, period):
+    """
+    Count, for every residue class and shift, the prefix letters it decrypts to a common letter
+
+    Parameters:
+    letters (bytes): The uppercase prefix letters
+    period (int): The key length
+
+    Returns:
+    list: tables[i][s] is the count for class i decrypted with shift s
+    """
+    common = [letter - ord('A') for letter in COMMON_LETTERS]
+    return [[sum(histogram[(letter + shift) % 26] for letter in common) for shift in range(26)]
+            for histogram in period_histograms(letters, period)]
+
+
+def _attach(name):
+    if name not in _attached:
+        # A worker runs one shard at a time, so the blocks of earlier attacks can be closed
+        for block in _attached.values():
+            block.close()
+        _attached.clear()
+        _attached[name] = shared_memory.SharedMemory(name=name)
+    return _attached[name]
+
+
+def _get_pool(workers):
+    """Return the shared worker pool, creating it with the given number of workers"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _discard_pool(pool):
+    """Forget a broken pool so the next attack creates a new one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def attack_shard(shm_name, prefix_length, path, start, stop, threshold, top_k=TOP_KEYS):
+    """
+    Score every word of one byte range of a wordlist
+
+    A word belongs to the shard its first byte is in. Words that are not made
+    of ASCII letters only, or longer than the prefix, are skipped.
+
+    Parameters:
+    shm_name (str): Name of the shared memory block of the attack
+    prefix_length (int): Number of prefix letters in the block
+    path (str): The wordlist file, one word per line
+    start (int): First byte of the shard
+    stop (int): Byte after the shard
+    threshold (float): Fitness at which to set the stop flag
+    top_k (int): Number of best keys to return
+
+    Returns:
+    tuple: (words tried, [(fitness, key), ...] best first, whether the threshold was reached)
+    """
+    block = _attach(shm_name)
+    if block.buf[STOP_FLAG]:
+        return 0, [], False
+    letters = bytes(block.buf[PREFIX_OFFSET:PREFIX_OFFSET + prefix_length])
+
+    with open(path, 'rb') as wordlist:
+        if start:
+            # Skip the end of the line that started in the previous shard
+            wordlist.seek(start - 1)
+            wordlist.readline()
+        position = wordlist.tell()
+        if position >= stop:
+            return 0, [], False
+        data = wordlist.read(stop - position)
+        if not data.endswith(b'\n'):
+            data += wordlist.readline()
+    words = data.split()
+
+    tables = {}
+    best = []
+    tried = 0
+    hit = False
+    for offset in range(0, len(words), CHECK_INTERVAL):
+        if block.buf[STOP_FLAG]:
+            break
+        for word in words[offset:offset + CHECK_INTERVAL]:
+            if not word.isalpha() or len(word) > prefix_length:
+                continue
+            tried += 1
+            key = word.upper()
+            period = len(key)
+            if period not in tables:
+                tables[period] = fitness_tables(letters, period)
+            score = sum(map(list.__getitem__, tables[period], key.translate(KEY_SHIFTS)))
+            if len(best) < top_k:
+                heapq.heappush(best, (score, key))
+            elif score > best[0][0]:
+                heapq.heapreplace(best, (score, key))
+        if best and max(best)[0] >= threshold * prefix_length:
+            hit = True
+            block.buf[STOP_FLAG] = 1
+            break
+
+    return tried, [(score / prefix_length, key.decode('ascii')) for score, key in sorted(best, reverse=True)], hit
+
+
+class DictionaryAttack:
+    """
+    A dictionary attack on one ciphertext, run by a background thread
+
+    Parameters:
+    message (str): The ciphertext
+    path (str): The wordlist file, one word per line
+    workers (int): Worker processes of the shared pool if this attack creates it; None or 0 for one per CPU
+    threshold (float): Fitness at which to stop
+    prefix_letters (int): Ciphertext letters the keys are scored on
+    """
+
+    def __init__(self, message, path, workers=None, threshold=FITNESS_THRESHOLD, prefix_letters=PREFIX_LETTERS):
+        self.id = uuid.uuid4().hex
+        self.message = message
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.letters = fold_letters(message)[:prefix_letters]
+        self.total_bytes = os.path.getsize(path)
+        self.state = RUNNING
+        self.error = None
+        self.bytes_done = 0
+        self.words_tried = 0
+        self.best = []
+        self.started = time.monotonic()
+        self.finished = None
+        self._block = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f'vigenere-attack-{self.id[:8]}', daemon=True)
+
+    def start(self):
+        """Start the attack in the background"""
+        if not self.letters:
+            raise ValueError("The message has no letters to attack")
+        self._block = shared_memory.SharedMemory(create=True, size=PREFIX_OFFSET + len(self.letters))
+        self._block.buf[STOP_FLAG] = 0
+        self._block.buf[PREFIX_OFFSET:PREFIX_OFFSET + len(self.letters)] = self.letters
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the workers to stop; the attack ends once the running shards return"""
+        with self._lock:
+            if self.state == RUNNING:
+                self.state = CANCELLED
+                self._block.buf[STOP_FLAG] = 1
+
+    def _run(self):
+        shards = [(start, min(start + SHARD_BYTES, self.total_bytes))
+                  for start in range(0, self.total_bytes, SHARD_BYTES)]
+        futures = {}
+        try:
+            pool = _get_pool(self.workers)
+            futures = {
+                pool.submit(attack_shard, self._block.name, len(self.letters), self.path,
+                            start, stop, self.threshold): stop - start
+                for start, stop in shards
+            }
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                tried, best, hit = future.result()
+                with self._lock:
+                    self.bytes_done += futures[future]
+                    self.words_tried += tried
+                    # A word listed in several shards is kept once
+                    unique = dict((key, fitness) for fitness, key in itertools.chain(self.best, best))
+                    self.best = heapq.nlargest(TOP_KEYS, ((fitness, key) for key, fitness in unique.items()))
+                    if hit and self.state == RUNNING:
+                        self.state = FOUND
+                if self.state != RUNNING:
+                    # Only the shards of this attack are cancelled; the pool keeps serving the others
+                    for pending in futures:
+                        pending.cancel()
+            with self._lock:
+                if self.state == RUNNING:
+                    self.state = EXHAUSTED
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                _discard_pool(pool)
+            # Stop the shards that are already running before the block goes away
+            self._block.buf[STOP_FLAG] = 1
+            for pending in futures:
+                pending.cancel()
+            with self._lock:
+                self.state = FAILED
+                self.error = str(e)
+        finally:
+            self.finished = time.monotonic()
+            self._block.close()
+            self._block.unlink()
+
+    def status(self):
+        """
+        Progress and best keys so far
+
+        Returns:
+        dict: 'id', 'state' (running, found, exhausted, cancelled or failed),
+        'progress' (0 to 1, by wordlist bytes), 'words_tried', 'elapsed',
+        'words_per_second' and 'best', each with 'key', 'fitness' and 'preview'
+        """
+        with self._lock:
+            elapsed = (self.finished or time.monotonic()) - self.started
+            preview = self.message[:PREVIEW_CHARS]
+            status = {
+                'id': self.id,
+                'state': self.state,
+                'progress': round(self.bytes_done / self.total_bytes, 4) if self.total_bytes else 1.0,
+                'words_tried': self.words_tried,
+                'elapsed': round(elapsed, 3),
+                'words_per_second': round(self.words_tried / elapsed) if elapsed else 0,
+                'best': [{
+                    'key': key,
+                    'fitness': round(fitness, 4),
+                    'preview': vigenere_transform(preview, key, decrypt=True),
+                } for fitness, key in self.best],
+            }
+            if self.error:
+                status['error'] = self.error
+            return status
+
+
+_attacks = {}
+_attacks_lock = threading.Lock()
+
+
+def start_attack(message, path, workers=None, threshold=FITNESS_THRESHOLD, prefix_letters=PREFIX_LETTERS,
+                 max_running=None):
+    """
+    Start a dictionary attack and keep it for polling
+
+    Parameters:
+    message (str): The ciphertext
+    path (str): The wordlist file, one word per line
+    workers (int): Worker processes of the shared pool if it does not exist yet; None or 0 for one per CPU
+    threshold (float): Fitness at which to stop
+    prefix_letters (int): Ciphertext letters the keys are scored on
+    max_running (int): Attacks that may run at once; None or 0 for no limit
+
+    Returns:
+    DictionaryAttack: The running attack
+
+    Raises:
+    TooManyAttacks: max_running attacks are already running
+    """
+    attack = DictionaryAttack(message, path, workers, threshold, prefix_letters)
+    with _attacks_lock:
+        running = sum(other.state == RUNNING for other in _attacks.values())
+        if max_running and running >= max_running:
+            raise TooManyAttacks(f"{running} dictionary attacks are already running; try again later")
+        attack.start()
+        finished = [key for key, other in _attacks.items() if other.state != RUNNING]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_ATTACKS + 1)]:
+            del _attacks[key]
+        _attacks[attack.id] = attack
+    return attack
+
+
+def get_attack(attack_id):
+    """Return the attack with the given id, or None if it is unknown or forgotten"""
+    with _attacks_lock:
+        return _attacks.get(attack_id)
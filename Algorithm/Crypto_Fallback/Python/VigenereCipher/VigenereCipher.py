@@ -4,8 +4,108 @@ Vigenere Cipher Python Fallback Implementation
 This module provides the fallback implementation of the Vigenere cipher when the C++/Java executables
 are not available or encounter errors. It includes functionality for encryption, decryption,
 brute force analysis, and frequency analysis.
+
+The engine works on the ASCII letters of the UTF-8 encoded message: it pulls
+them out with one bytes.translate call, splits them into one residue class per
+key letter (every len(key)-th letter), shifts each class with a single
+translate table and puts the letters back in place. Case and every other
+character, including non-ASCII letters, are preserved.
+
+The auto-crack recovers the key from the ciphertext alone: the key length is
+estimated with the index of coincidence of the letters split by candidate
+period, cross-checked with the spacings of repeated trigrams (Kasiski
+examination), and every key letter is then the Caesar shift with the lowest
+chi-squared distance from English for its residue class.
 """
 
+import re
+import string
+
+from TextStats.TextStats import (
+    ENGLISH_IOC, LETTERS, NON_LETTERS, RANDOM_IOC, chi_squared_scores, fold_letters, format_frequency_report,
+    index_of_coincidence, text_stats,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+LETTER_RUNS = re.compile(rb'([A-Za-z]+)')
+
+def _shift_table(shift):
+    """Return the bytes.translate table moving every ASCII letter ``shift`` places forward"""
+    lower = string.ascii_lowercase
+    upper = string.ascii_uppercase
+    shifted = lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift]
+    return bytes.maketrans(LETTERS, shifted.encode('ascii'))
+
+# SHIFT_TABLES[s] shifts letters forward by s; decryption uses SHIFT_TABLES[-s % 26]
+SHIFT_TABLES = tuple(_shift_table(shift) for shift in range(26))
+
+# Longest key length tried by vigenere_auto_crack
+MAX_PERIOD = 20
+
+# Periods whose index of coincidence is within this ratio of the best one are
+# plausible key lengths; among them, Kasiski evidence and then length decide.
+# On short texts a multiple of the key length splits the letters into so few
+# per class that its index of coincidence can overshoot English by far, so a
+# period at least this close to English also counts as plausible
+PLAUSIBLE_IOC_RATIO = 0.9
+
+# Characters of each candidate decryption returned by vigenere_auto_crack
+PREVIEW_CHARS = 200
+
+if NUMPY_AVAILABLE:
+    IS_LETTER = np.zeros(256, dtype=bool)
+    IS_LETTER[list(LETTERS)] = True
+
+def _put_letters_back(data, letters):
+    """Replace the ASCII letters of data, in order, with the given letters"""
+    if NUMPY_AVAILABLE:
+        output = np.frombuffer(data, dtype=np.uint8).copy()
+        output[IS_LETTER[output]] = np.frombuffer(letters, dtype=np.uint8)
+        return output.tobytes()
+    pieces = LETTER_RUNS.split(data)
+    position = 0
+    for i in range(1, len(pieces), 2):
+        length = len(pieces[i])
+        pieces[i] = letters[position:position + length]
+        position += length
+    return b''.join(pieces)
+
+def vigenere_transform(text, key, decrypt=False):
+    """
+    Encrypt or decrypt text with a Vigenere key
+    
+    Parameters:
+    text (str): The text to process
+    key (str): The key; each character shifts by its distance from 'A'
+    decrypt (bool): Shift backwards
+    
+    Returns:
+    str: The processed text
+    """
+    data = text.encode('utf-8')
+    letters = data.translate(None, NON_LETTERS)
+    if not letters:
+        return text
+    if not key:
+        raise ValueError("The keyword must not be empty")
+    
+    shifts = [(ord(char) - ord('A')) % 26 for char in key.upper()]
+    if decrypt:
+        shifts = [-shift % 26 for shift in shifts]
+    period = len(shifts)
+    
+    # Shift each residue class of the letter stream with one table
+    shifted = bytearray(letters)
+    for offset, shift in enumerate(shifts[:len(letters)]):
+        shifted[offset::period] = letters[offset::period].translate(SHIFT_TABLES[shift])
+    
+    return _put_letters_back(data, bytes(shifted)).decode('utf-8')
+
 def vigenere_cipher_fallback(message, keyword, operation):
     """
     Python fallback implementation of Vigenere Cipher - matches PDF specification
@@ -13,28 +113,14 @@ def vigenere_cipher_fallback(message, keyword, operation):
     Parameters:
     message (str): The text to be processed
     keyword (str): The keyword for encryption/decryption
-    operation (str): The operation to perform ('encrypt', 'decrypt', 'brute-force', or 'frequency')
+    operation (str): The operation to perform ('encrypt', 'decrypt', 'brute-force', 'frequency' or 'auto-crack')
     
     Returns:
     str: The result of the cipher operation
     """
     
-    def vigenere_decrypt_with_key(text, key):
-        """Helper function to decrypt with a specific key"""
-        result = ""
-        key = key.upper()
-        key_index = 0
-        
-        for char in text:
-            if char.isalpha():
-                base = ord('A') if char.isupper() else ord('a')
-                shift = ord(key[key_index % len(key)]) - ord('A')
-                result += chr(base + (ord(char) - base - shift + 26) % 26)
-                key_index += 1
-            else:
-                result += char
-        
-        return result
+    if operation == 'auto-crack':
+        return format_crack_report(vigenere_auto_crack(message), message)
     
     if operation == 'brute-force':
         # Perform brute force analysis with common keywords
@@ -63,9 +149,8 @@ def vigenere_cipher_fallback(message, keyword, operation):
         result += "------------------------\n"
         
         for test_key in common_keys:
-            decrypted = vigenere_decrypt_with_key(message, test_key)
-            # Only show first 100 characters for readability
-            preview = decrypted[:100] + ("..." if len(decrypted) > 100 else "")
+            # Only show first 100 characters for readability, so only those are decrypted
+            preview = vigenere_transform(message[:100], test_key, decrypt=True) + ("..." if len(message) > 100 else "")
             result += f"Key '{test_key}' ({len(test_key)} chars): {preview}\n"
         
         result += "\n================================\n"
@@ -90,24 +175,225 @@ def vigenere_cipher_fallback(message, keyword, operation):
         return frequency_analysis(message)
     
     # Regular encrypt/decrypt operations
-    result = ""
-    keyword = keyword.upper()  # Ensure keyword is uppercase
-    key_index = 0
-    
-    for char in message:
-        if char.isalpha():
-            base = ord('A') if char.isupper() else ord('a')
-            shift = ord(keyword[key_index % len(keyword)]) - ord('A')
-            
-            if operation == 'encrypt':
-                result += chr(base + (ord(char) - base + shift) % 26)
-            else:  # decrypt
-                result += chr(base + (ord(char) - base - shift + 26) % 26)
-            
-            key_index += 1
+    return vigenere_transform(message, keyword, decrypt=operation != 'encrypt')
+
+def period_histograms(letters, period):
+    """
+    Count the letters of every residue class for a candidate key length
+    
+    Parameters:
+    letters (bytes): The uppercase letter stream
+    period (int): The candidate key length
+    
+    Returns:
+    list: One list of 26 counts (A to Z) per residue class
+    """
+    if NUMPY_AVAILABLE:
+        values = np.frombuffer(letters, dtype=np.uint8).astype(np.intp) - ord('A')
+        # One bincount over (class, letter) pairs counts every class at once
+        bins = (np.arange(len(values)) % period) * 26 + values
+        return np.bincount(bins, minlength=26 * period).reshape(period, 26).tolist()
+    histograms = []
+    for offset in range(period):
+        residue = letters[offset::period]
+        histograms.append([residue.count(letter) for letter in string.ascii_uppercase.encode('ascii')])
+    return histograms
+
+def mean_index_of_coincidence(histograms):
+    """
+    Average index of coincidence of residue class histograms
+    
+    Parameters:
+    histograms (list): Letter counts of every residue class
+    
+    Returns:
+    float: Probability that two letters of the same class are equal, averaged over the classes
+    """
+    values = [index_of_coincidence(histogram) for histogram in histograms if sum(histogram) > 1]
+    return sum(values) / len(values) if values else 0.0
+
+def kasiski_spacings(letters):
+    """
+    Distances between consecutive occurrences of every repeated trigram
+    
+    Parameters:
+    letters (bytes): The uppercase letter stream
+    
+    Returns:
+    list: The spacings, in letters
+    """
+    if len(letters) < 4:
+        return []
+    if NUMPY_AVAILABLE:
+        values = np.frombuffer(letters, dtype=np.uint8).astype(np.int64) - ord('A')
+        trigrams = values[:-2] * 676 + values[1:-1] * 26 + values[2:]
+        # A stable sort keeps equal trigrams in text order, so the spacings are neighbour differences
+        order = np.argsort(trigrams, kind='stable')
+        repeated = trigrams[order[1:]] == trigrams[order[:-1]]
+        return (order[1:][repeated] - order[:-1][repeated]).tolist()
+    last_seen = {}
+    spacings = []
+    for position in range(len(letters) - 2):
+        trigram = letters[position:position + 3]
+        if trigram in last_seen:
+            spacings.append(position - last_seen[trigram])
+        last_seen[trigram] = position
+    return spacings
+
+def estimate_key_lengths(letters, max_period=MAX_PERIOD):
+    """
+    Rank candidate key lengths of a Vigenere ciphertext
+    
+    A key of length p splits the letters into p Caesar ciphertexts, whose index
+    of coincidence is that of English (about 0.067) instead of random text
+    (0.038). Multiples of the key length score as well, so among the periods
+    close to the best index of coincidence or to that of English, the one
+    dividing most Kasiski spacings comes first, then the shortest.
+    
+    Parameters:
+    letters (bytes): The uppercase letter stream
+    max_period (int): Longest key length to try
+    
+    Returns:
+    list: Dicts with 'period', 'ioc' and 'kasiski' (fraction of spacings it divides), best first
+    """
+    # Every residue class needs a couple of letters for its statistics to mean anything
+    max_period = max(1, min(max_period, len(letters) // 2))
+    spacings = kasiski_spacings(letters)
+    if NUMPY_AVAILABLE and spacings:
+        spacings = np.asarray(spacings)
+    
+    periods = []
+    for period in range(1, max_period + 1):
+        if len(spacings) == 0:
+            kasiski = 0.0
+        elif NUMPY_AVAILABLE:
+            kasiski = float((spacings % period == 0).mean())
         else:
-            result += char
+            kasiski = sum(1 for spacing in spacings if spacing % period == 0) / len(spacings)
+        periods.append({
+            'period': period,
+            'ioc': mean_index_of_coincidence(period_histograms(letters, period)),
+            'kasiski': kasiski,
+        })
+    
+    threshold = PLAUSIBLE_IOC_RATIO * min(ENGLISH_IOC, max(entry['ioc'] for entry in periods))
+    plausible = [entry for entry in periods if entry['ioc'] >= threshold]
+    others = [entry for entry in periods if entry['ioc'] < threshold]
+    plausible.sort(key=lambda entry: (-entry['kasiski'], entry['period']))
+    others.sort(key=lambda entry: -entry['ioc'])
+    return plausible + others
+
+def recover_key(letters, period):
+    """
+    Recover the most likely key of a given length
+    
+    Parameters:
+    letters (bytes): The uppercase letter stream
+    period (int): The key length
     
+    Returns:
+    tuple: (key, summed chi-squared distance from English of the decrypted classes)
+    """
+    key = ''
+    chi_squared = 0.0
+    for histogram in period_histograms(letters, period):
+        scores = chi_squared_scores(histogram)
+        shift = min(range(26), key=scores.__getitem__)
+        key += chr(ord('A') + shift)
+        chi_squared += scores[shift]
+    return key, chi_squared
+
+def _shortest_repeat(key):
+    """Return the shortest key that repeats into the given one, e.g. 'KEY' for 'KEYKEY'"""
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+def vigenere_auto_crack(message, max_period=MAX_PERIOD, top_k=3, preview_chars=PREVIEW_CHARS):
+    """
+    Find the most likely keys of a Vigenere ciphertext without knowing the keyword
+    
+    Key lengths are ranked by estimate_key_lengths, and the key of each of the
+    best lengths is recovered letter by letter with chi-squared scoring. A key
+    found for a multiple of a shorter key length is reduced to the shorter key.
+    Only the first ``preview_chars`` characters of each candidate are decrypted.
+    
+    Parameters:
+    message (str): The ciphertext
+    max_period (int): Longest key length to try
+    top_k (int): Number of candidate keys to return
+    preview_chars (int): Length of each decrypted preview
+    
+    Returns:
+    dict: 'letters' counted, the ranked 'periods' (see estimate_key_lengths) and
+    'candidates', best first, each with 'key', 'period', 'ioc', 'kasiski',
+    'chi_squared' (per letter) and 'preview'
+    """
+    letters = fold_letters(message)
+    if not letters:
+        return {'letters': 0, 'periods': [], 'candidates': []}
+    
+    periods = estimate_key_lengths(letters, max_period)
+    top_k = max(1, top_k)
+    preview = message[:preview_chars]
+    candidates = []
+    seen = set()
+    for entry in periods:
+        key, chi_squared = recover_key(letters, entry['period'])
+        key = _shortest_repeat(key)
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append({
+            'key': key,
+            'period': len(key),
+            'ioc': round(entry['ioc'], 5),
+            'kasiski': round(entry['kasiski'], 4),
+            'chi_squared': round(chi_squared / len(letters), 5),
+            'preview': vigenere_transform(preview, key, decrypt=True),
+        })
+        if len(candidates) == top_k:
+            break
+    
+    return {
+        'letters': len(letters),
+        'periods': [dict(entry, ioc=round(entry['ioc'], 5), kasiski=round(entry['kasiski'], 4))
+                    for entry in periods],
+        'candidates': candidates,
+    }
+
+def format_crack_report(crack, message):
+    """
+    Format the result of vigenere_auto_crack as text, with the best candidate fully decrypted
+    
+    Parameters:
+    crack (dict): Result of vigenere_auto_crack
+    message (str): The ciphertext that was cracked
+    
+    Returns:
+    str: Formatted report
+    """
+    result = "VIGENERE AUTO-CRACK RESULTS:\n"
+    result += "================================\n\n"
+    if not crack['candidates']:
+        return result + "No letters found; there is nothing to crack."
+    
+    result += f"Letters analysed: {crack['letters']}\n\n"
+    result += "Likely key lengths (index of coincidence, share of repeated-trigram spacings):\n"
+    for entry in crack['periods'][:5]:
+        result += f"  {entry['period']:>2}: IoC {entry['ioc']:.4f}, Kasiski {entry['kasiski'] * 100:.1f}%\n"
+    result += f"  (English text is about {ENGLISH_IOC:.4f}, random letters {RANDOM_IOC:.4f})\n\n"
+    
+    result += "Candidate keys, recovered with chi-squared scoring per key letter:\n"
+    for rank, candidate in enumerate(crack['candidates'], 1):
+        result += (f"{rank}. Key '{candidate['key']}' ({candidate['period']} chars): "
+                   f"chi-squared {candidate['chi_squared']:.3f} per letter\n")
+    
+    best = crack['candidates'][0]['key']
+    result += f"\nMost likely plaintext (key '{best}'):\n"
+    result += vigenere_transform(message, best, decrypt=True)
     return result
 
 def frequency_analysis(message):
@@ -122,25 +408,7 @@ def frequency_analysis(message):
     """
     result = "VIGENERE FREQUENCY ANALYSIS:\n"
     result += "==============================\n\n"
-    
-    # Count letter frequencies
-    freq = [0] * 26
-    total_letters = 0
-    
-    for char in message:
-        if char.isalpha():
-            freq[ord(char.upper()) - ord('A')] += 1
-            total_letters += 1
-    
-    result += "Letter frequencies:\n"
-    for i in range(26):
-        letter = chr(ord('A') + i)
-        percentage = (freq[i] * 100.0 / total_letters) if total_letters > 0 else 0.0
-        result += f"{letter}: {freq[i]} ({percentage:.1f}%)\n"
-    
-    result += "\nCommon English letter frequencies:\n"
-    result += "E: 12.7%, T: 9.1%, A: 8.2%, O: 7.5%, I: 7.0%, N: 6.7%\n"
-    result += "S: 6.3%, H: 6.1%, R: 6.0%, D: 4.3%, L: 4.0%, C: 2.8%\n\n"
+    result += format_frequency_report(text_stats(message))
     
     result += "Analysis: Compare the frequencies above with typical English.\n"
     result += "Large deviations may indicate the key length or cipher method."
@@ -6,6 +6,7 @@
 #include <iostream>
 #include <string>
 #include <cctype>
+#include <vector>
 using namespace std;
 
 /**
@@ -71,16 +72,26 @@ public:
     }
 };
 
+// The command line entry point is left out when building libalgovault (see algovault_capi.cpp)
+#ifndef ALGOVAULT_LIBRARY
+#include "algovault_framing.h"
+
 int main(int argc, char* argv[]) {
-    if (argc != 4) {
-        cerr << "Usage: " << argv[0] << " <message> <shift> <operation>" << endl;
+    vector<string> args;
+    bool framed;
+    if (!algovault::collectArgs(argc, argv, args, framed)) {
+        return 1;
+    }
+    if (args.size() != 4) {
+        cerr << "Usage: " << args[0] << " <message> <shift> <operation>" << endl;
+        cerr << "   or: " << args[0] << " --framed  (arguments as a framed message on stdin)" << endl;
         cerr << "operation: encrypt, decrypt, or brute-force" << endl;
         return 1;
     }
 
-    string message = argv[1];
-    int shift = stoi(argv[2]);
-    string operation = argv[3];
+    string message = args[1];
+    int shift = stoi(args[2]);
+    string operation = args[3];
 
     CaesarCipher cipher;
     string result;
@@ -96,6 +107,7 @@ int main(int argc, char* argv[]) {
         return 1;
     }
 
-    cout << result << endl;
+    algovault::emit(result + "\n", framed);
     return 0;
 }
+#endif // ALGOVAULT_LIBRARY
@@ -324,7 +324,7 @@ public:
             
             std::vector<uint8_t> hmac_result(EVP_MD_size(md));
             
-            unsigned char* digest = HMAC(md, key.c_str(), key.length(),
+            unsigned char* digest = ::HMAC(md, key.c_str(), key.length(),
                                        reinterpret_cast<const unsigned char*>(message.c_str()), 
                                        message.length(), hmac_result.data(), &hmacLen);
             
@@ -424,57 +424,68 @@ public:
 };
 
 // JSON output helper
-void outputJSON(const HMAC::HMACResult& result) {
-    std::cout << "{\n";
-    std::cout << "  \"success\": " << (result.success ? "true" : "false") << ",\n";
+void outputJSON(const HMAC::HMACResult& result, std::ostream& out = std::cout) {
+    out << "{\n";
+    out << "  \"success\": " << (result.success ? "true" : "false") << ",\n";
     
     if (result.success) {
-        std::cout << "  \"hmac\": \"" << result.hmac << "\",\n";
-        std::cout << "  \"implementation\": \"C++\",\n";
-        std::cout << "  \"steps\": {\n";
-        std::cout << "    \"originalKey\": \"" << result.originalKey << "\",\n";
-        std::cout << "    \"processedKey\": \"" << result.processedKey << "\",\n";
-        std::cout << "    \"keyAnalysis\": \"" << result.keyAnalysis << "\",\n";
-        std::cout << "    \"innerPad\": \"" << result.innerPad << "\",\n";
-        std::cout << "    \"outerPad\": \"" << result.outerPad << "\",\n";
-        std::cout << "    \"innerKeyMaterial\": \"" << result.innerKeyMaterial << "\",\n";
-        std::cout << "    \"outerKeyMaterial\": \"" << result.outerKeyMaterial << "\",\n";
-        std::cout << "    \"messageHex\": \"" << result.messageHex << "\",\n";
-        std::cout << "    \"innerHash\": \"" << result.innerHash << "\",\n";
-        std::cout << "    \"outerInput\": \"" << result.outerInput << "\",\n";
-        std::cout << "    \"finalHmac\": \"" << result.finalHmac << "\",\n";
-        std::cout << "    \"blockSize\": " << result.blockSize << ",\n";
-        std::cout << "    \"algorithm\": \"" << result.algorithm << "\"\n";
-        std::cout << "  }\n";
+        out << "  \"hmac\": \"" << result.hmac << "\",\n";
+        out << "  \"implementation\": \"C++\",\n";
+        out << "  \"steps\": {\n";
+        out << "    \"originalKey\": \"" << result.originalKey << "\",\n";
+        out << "    \"processedKey\": \"" << result.processedKey << "\",\n";
+        out << "    \"keyAnalysis\": \"" << result.keyAnalysis << "\",\n";
+        out << "    \"innerPad\": \"" << result.innerPad << "\",\n";
+        out << "    \"outerPad\": \"" << result.outerPad << "\",\n";
+        out << "    \"innerKeyMaterial\": \"" << result.innerKeyMaterial << "\",\n";
+        out << "    \"outerKeyMaterial\": \"" << result.outerKeyMaterial << "\",\n";
+        out << "    \"messageHex\": \"" << result.messageHex << "\",\n";
+        out << "    \"innerHash\": \"" << result.innerHash << "\",\n";
+        out << "    \"outerInput\": \"" << result.outerInput << "\",\n";
+        out << "    \"finalHmac\": \"" << result.finalHmac << "\",\n";
+        out << "    \"blockSize\": " << result.blockSize << ",\n";
+        out << "    \"algorithm\": \"" << result.algorithm << "\"\n";
+        out << "  }\n";
     } else {
-        std::cout << "  \"error\": \"" << result.error << "\"\n";
+        out << "  \"error\": \"" << result.error << "\"\n";
     }
     
-    std::cout << "}" << std::endl;
+    out << "}" << std::endl;
 }
 
+// The command line entry point is left out when building libalgovault (see algovault_capi.cpp)
+#ifndef ALGOVAULT_LIBRARY
+#include "algovault_framing.h"
+
 // Command line interface
 int main(int argc, char* argv[]) {
-    if (argc < 3) {
+    std::vector<std::string> args;
+    bool framed;
+    if (!algovault::collectArgs(argc, argv, args, framed)) {
+        return 1;
+    }
+    int argCount = args.size();
+    if (argCount < 3) {
         std::cout << "Usage: " << argv[0] << " <message> <key> [expected_hmac] [algorithm]" << std::endl;
         std::cout << "Algorithms: md5, sha1, sha224, sha256, sha384, sha512 (default: sha256)" << std::endl;
         std::cout << "Examples:" << std::endl;
         std::cout << "  " << argv[0] << " \"Hello World\" \"secret_key\"" << std::endl;
         std::cout << "  " << argv[0] << " \"Hello World\" \"secret_key\" \"\" \"sha512\"" << std::endl;
         std::cout << "  " << argv[0] << " \"Hello World\" \"secret_key\" \"expected_value\" \"md5\"" << std::endl;
+        std::cout << "  " << argv[0] << " --framed  (arguments as a framed message on stdin)" << std::endl;
         return 1;
     }
     
-    std::string message = argv[1];
-    std::string key = argv[2];
+    std::string message = args[1];
+    std::string key = args[2];
     std::string algorithm = "sha256"; // Default algorithm
     
     // Determine algorithm from arguments
-    if (argc >= 5) {
-        algorithm = argv[4];
-    } else if (argc == 4) {
+    if (argCount >= 5) {
+        algorithm = args[4];
+    } else if (argCount == 4) {
         // If 4 arguments, check if 3rd argument looks like an algorithm or HMAC
-        std::string third_arg = argv[3];
+        std::string third_arg = args[3];
         std::transform(third_arg.begin(), third_arg.end(), third_arg.begin(), ::tolower);
         if (third_arg == "md5" || third_arg == "sha1" || third_arg == "sha224" || 
             third_arg == "sha256" || third_arg == "sha384" || third_arg == "sha512") {
@@ -483,28 +494,32 @@ int main(int argc, char* argv[]) {
         }
     }
     
-    HMAC hmacGenerator;
+    // "class" is required because the OpenSSL HMAC() function hides the class name
+    class HMAC hmacGenerator;
     
-    if (argc >= 4 && argv[3][0] != '\0') {
+    std::ostringstream output;
+    if (argCount >= 4 && !args[3].empty()) {
         // Check if third argument is not an algorithm (i.e., it's expected HMAC)
-        std::string third_arg = argv[3];
+        std::string third_arg = args[3];
         std::transform(third_arg.begin(), third_arg.end(), third_arg.begin(), ::tolower);
         if (third_arg != "md5" && third_arg != "sha1" && third_arg != "sha224" && 
             third_arg != "sha256" && third_arg != "sha384" && third_arg != "sha512") {
             // Verification mode
-            std::string expectedHmac = argv[3];
+            std::string expectedHmac = args[3];
             bool isValid = hmacGenerator.verifyHMAC(message, key, expectedHmac, algorithm);
-            std::cout << "{\"valid\": " << (isValid ? "true" : "false") << "}" << std::endl;
+            output << "{\"valid\": " << (isValid ? "true" : "false") << "}\n";
         } else {
             // Generation mode with algorithm specified
             HMAC::HMACResult result = hmacGenerator.generateHMAC(message, key, algorithm);
-            outputJSON(result);
+            outputJSON(result, output);
         }
     } else {
         // Generation mode
         HMAC::HMACResult result = hmacGenerator.generateHMAC(message, key, algorithm);
-        outputJSON(result);
+        outputJSON(result, output);
     }
     
+    algovault::emit(output.str(), framed);
     return 0;
 }
+#endif // ALGOVAULT_LIBRARY
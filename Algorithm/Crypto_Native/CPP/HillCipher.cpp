@@ -424,15 +424,26 @@ string processText(const string& text, const vector<int>& keyMatrixFlat, int dim
     }
 }
 
+// The command line entry point is left out when building libalgovault (see algovault_capi.cpp)
+#ifndef ALGOVAULT_LIBRARY
+#include "algovault_framing.h"
+
 int main(int argc, char* argv[]) {
-    if (argc < 4) {
-        cerr << "Usage: " << argv[0] << " <operation> <dimension> [--key-word <word> | <key_matrix_elements...>] [--text <input_text> | <input_vector_elements...>]" << endl;
+    vector<string> args;
+    bool framed;
+    if (!algovault::collectArgs(argc, argv, args, framed)) {
+        return 1;
+    }
+    int argCount = args.size();
+    if (argCount < 4) {
+        cerr << "Usage: " << args[0] << " <operation> <dimension> [--key-word <word> | <key_matrix_elements...>] [--text <input_text> | <input_vector_elements...>]" << endl;
+        cerr << "   or: " << args[0] << " --framed  (arguments as a framed message on stdin)" << endl;
         cerr << "operation: encrypt or decrypt" << endl;
         return 1;
     }
 
-    string operation = argv[1];
-    int dimension = stoi(argv[2]);
+    string operation = args[1];
+    int dimension = stoi(args[2]);
     
     HillCipher cipher(dimension);
     vector<int> keyMatrix;
@@ -444,13 +455,13 @@ int main(int argc, char* argv[]) {
     
     // Parse arguments to handle both numeric and text inputs
     int argIndex = 3;
-    while (argIndex < argc) {
-        string arg = argv[argIndex];
+    while (argIndex < argCount) {
+        string arg = args[argIndex];
         
         if (arg == "--key-word") {
             // Handle key word input
-            if (argIndex + 1 < argc) {
-                keyWord = argv[argIndex + 1];
+            if (argIndex + 1 < argCount) {
+                keyWord = args[argIndex + 1];
                 useWordKey = true;
                 argIndex += 2;
             } else {
@@ -459,8 +470,8 @@ int main(int argc, char* argv[]) {
             }
         } else if (arg == "--text") {
             // Handle text input
-            if (argIndex + 1 < argc) {
-                inputText = argv[argIndex + 1];
+            if (argIndex + 1 < argCount) {
+                inputText = args[argIndex + 1];
                 useTextInput = true;
                 argIndex += 2;
             } else {
@@ -492,12 +503,13 @@ int main(int argc, char* argv[]) {
     }
     
     // Process based on input type
+    ostringstream output;
     if (useTextInput) {
         // Text-based processing
         string resultText = processText(inputText, keyMatrix, dimension, operation);
         
         // Output as text
-        cout << resultText;
+        output << resultText;
     } else {
         // Pure numeric processing
         if (inputVector.empty()) {
@@ -517,10 +529,12 @@ int main(int argc, char* argv[]) {
         
         // Output numeric result
         for (int val : result) {
-            cout << val << " ";
+            output << val << " ";
         }
     }
     
-    cout << endl;
+    output << "\n";
+    algovault::emit(output.str(), framed);
     return 0;
 }
+#endif // ALGOVAULT_LIBRARY
@@ -2,6 +2,8 @@
 #include <string>
 #include <cstring>
 #include <iomanip>
+#include <sstream>
+#include <vector>
 #include <stdint.h>
 
 /**
@@ -167,22 +169,35 @@ void sha512(const std::string& message, uint8_t digest[64]) {
     delete[] padded_message;
 }
 
+// The command line entry point is left out when building libalgovault (see algovault_capi.cpp)
+#ifndef ALGOVAULT_LIBRARY
+#include "algovault_framing.h"
+
 // Modified main to accept command line input for use with Django
 int main(int argc, char* argv[]) {
-    if (argc != 2) {
-        std::cerr << "Usage: " << argv[0] << " <message>" << std::endl;
+    std::vector<std::string> args;
+    bool framed;
+    if (!algovault::collectArgs(argc, argv, args, framed)) {
+        return 1;
+    }
+    if (args.size() != 2) {
+        std::cerr << "Usage: " << args[0] << " <message>" << std::endl;
+        std::cerr << "   or: " << args[0] << " --framed  (message as a framed request on stdin)" << std::endl;
         return 1;
     }
     
-    std::string input = argv[1];
+    std::string input = args[1];
     uint8_t hash[64];
     sha512(input, hash);
     
     // Output hash as a hex string
+    std::ostringstream output;
     for (int i = 0; i < 64; i++) {
-        std::cout << std::hex << std::setw(2) << std::setfill('0') << (int)hash[i];
+        output << std::hex << std::setw(2) << std::setfill('0') << (int)hash[i];
     }
-    std::cout << std::endl;
+    output << "\n";
+    algovault::emit(output.str(), framed);
     
     return 0;
 }
+#endif // ALGOVAULT_LIBRARY
@@ -166,16 +166,26 @@ public:
     }
 };
 
+// The command line entry point is left out when building libalgovault (see algovault_capi.cpp)
+#ifndef ALGOVAULT_LIBRARY
+#include "algovault_framing.h"
+
 int main(int argc, char* argv[]) {
-    if (argc < 4) {
-        cerr << "Usage: " << argv[0] << " <operation> <message> <keyword>" << endl;
+    vector<string> args;
+    bool framed;
+    if (!algovault::collectArgs(argc, argv, args, framed)) {
+        return 1;
+    }
+    if (args.size() < 4) {
+        cerr << "Usage: " << args[0] << " <operation> <message> <keyword>" << endl;
+        cerr << "   or: " << args[0] << " --framed  (arguments as a framed message on stdin)" << endl;
         cerr << "operation: encrypt, decrypt, brute-force, or frequency" << endl;
         return 1;
     }
 
-    string operation = argv[1];
-    string message = argv[2];
-    string keyword = argv[3];
+    string operation = args[1];
+    string message = args[2];
+    string keyword = args[3];
 
     VigenereCipher cipher;
     string result;
@@ -193,6 +203,7 @@ int main(int argc, char* argv[]) {
         return 1;
     }
 
-    cout << result << endl;
+    algovault::emit(result + "\n", framed);
     return 0;
 }
+#endif // ALGOVAULT_LIBRARY
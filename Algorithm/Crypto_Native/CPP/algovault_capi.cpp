@@ -0,0 +1,278 @@
+/**
+ * AlgoVault Native Library
+ * C ABI over the C++ cryptographic implementations, built as libalgovault.so
+ *
+ * The Django backend loads this library once with ctypes and passes buffers
+ * directly, instead of spawning one executable per request and parsing its
+ * stdout. The individual .cpp files are compiled into this translation unit
+ * with their main() functions left out.
+ *
+ * Build:
+ *   g++ -std=c++11 -O2 -fPIC -shared algovault_capi.cpp -o libalgovault.so [-lcrypto]
+ *
+ * Conventions:
+ *   - Every function returns 0 on success and a negative AV_* code on failure.
+ *   - Text results are returned in a buffer allocated by the library; the caller
+ *     releases it with av_free().
+ *   - Lengths are passed explicitly so inputs are binary safe.
+ */
+
+#define ALGOVAULT_LIBRARY
+
+#include "HMAC.cpp"
+#include "CaesarCipher.cpp"
+#include "VigenereCipher.cpp"
+#include "HillCipher.cpp"
+#include "SHA-512.cpp"
+
+#include <cstdlib>
+
+#define AV_OK 0
+#define AV_INVALID_ARGUMENT -1
+#define AV_INVALID_OPERATION -2
+#define AV_NOT_INVERTIBLE -3
+#define AV_FAILED -4
+
+#define AV_HMAC_FIELD_COUNT 12
+
+extern "C" {
+
+/**
+ * Step-by-step HMAC details, in the same order as the C++ HMACResult fields.
+ * fields: hmac, originalKey, processedKey, keyAnalysis, innerPad, outerPad,
+ *         innerKeyMaterial, outerKeyMaterial, messageHex, innerHash,
+ *         outerInput, algorithm
+ */
+struct av_hmac_result {
+    int success;
+    int block_size;
+    char* fields[AV_HMAC_FIELD_COUNT];
+    char* error;
+};
+
+}
+
+namespace {
+
+/**
+ * @brief Copies a std::string into a malloc'd, NUL-terminated buffer.
+ */
+char* copy_out(const std::string& value, size_t* out_len) {
+    char* buffer = static_cast<char*>(std::malloc(value.size() + 1));
+    if (buffer == nullptr) {
+        return nullptr;
+    }
+    std::memcpy(buffer, value.data(), value.size());
+    buffer[value.size()] = '\0';
+    if (out_len != nullptr) {
+        *out_len = value.size();
+    }
+    return buffer;
+}
+
+}
+
+extern "C" {
+
+/**
+ * @brief Library ABI version, bumped whenever a signature changes.
+ */
+int av_version(void) {
+    return 1;
+}
+
+/**
+ * @brief Releases a buffer returned by any av_* function.
+ */
+void av_free(void* buffer) {
+    std::free(buffer);
+}
+
+/**
+ * @brief Caesar cipher encrypt, decrypt or brute-force.
+ * @param operation "encrypt", "decrypt" or "brute-force"
+ * @param text Input text buffer
+ * @param text_len Length of text in bytes
+ * @param shift Shift value
+ * @param out Receives a malloc'd result buffer
+ * @param out_len Receives the result length
+ */
+int av_caesar(const char* operation, const char* text, size_t text_len, int shift,
+              char** out, size_t* out_len) {
+    if (operation == nullptr || text == nullptr || out == nullptr) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    CaesarCipher cipher;
+    std::string input(text, text_len);
+    std::string op(operation);
+    std::string result;
+
+    if (op == "encrypt") {
+        result = cipher.encrypt(input, shift);
+    } else if (op == "decrypt") {
+        result = cipher.decrypt(input, shift);
+    } else if (op == "brute-force") {
+        result = cipher.bruteForceAnalysis(input);
+    } else {
+        return AV_INVALID_OPERATION;
+    }
+
+    *out = copy_out(result, out_len);
+    return *out != nullptr ? AV_OK : AV_FAILED;
+}
+
+/**
+ * @brief Vigenere cipher encrypt, decrypt, brute-force or frequency analysis.
+ */
+int av_vigenere(const char* operation, const char* text, size_t text_len,
+                const char* key, size_t key_len, char** out, size_t* out_len) {
+    if (operation == nullptr || text == nullptr || key == nullptr || out == nullptr) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    VigenereCipher cipher;
+    std::string input(text, text_len);
+    std::string keyword(key, key_len);
+    std::string op(operation);
+    std::string result;
+
+    if (op == "encrypt" || op == "decrypt") {
+        if (keyword.empty()) {
+            return AV_INVALID_ARGUMENT;
+        }
+        result = op == "encrypt" ? cipher.encrypt(input, keyword) : cipher.decrypt(input, keyword);
+    } else if (op == "brute-force") {
+        result = cipher.bruteForceAnalysis(input);
+    } else if (op == "frequency") {
+        result = cipher.frequencyAnalysis(input);
+    } else {
+        return AV_INVALID_OPERATION;
+    }
+
+    *out = copy_out(result, out_len);
+    return *out != nullptr ? AV_OK : AV_FAILED;
+}
+
+/**
+ * @brief Hill cipher on a numeric vector.
+ * @param key Flat n*n key matrix
+ * @param input Input vector of input_len values
+ * @param out Caller-provided buffer with room for input_len rounded up to a multiple of n
+ * @param out_len Receives the number of values written
+ */
+int av_hill_vector(const char* operation, int n, const int* key, const int* input, size_t input_len,
+                   int* out, size_t* out_len) {
+    if (operation == nullptr || key == nullptr || input == nullptr || out == nullptr || n <= 0) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    HillCipher cipher(n);
+    std::vector<int> keyMatrix(key, key + (size_t)n * n);
+    std::vector<int> inputVector(input, input + input_len);
+    std::string op(operation);
+    std::vector<int> result;
+
+    if (op == "encrypt") {
+        result = cipher.encrypt(inputVector, keyMatrix);
+    } else if (op == "decrypt") {
+        result = cipher.decrypt(inputVector, keyMatrix);
+        if (result.empty() && !inputVector.empty()) {
+            return AV_NOT_INVERTIBLE;
+        }
+    } else {
+        return AV_INVALID_OPERATION;
+    }
+
+    std::copy(result.begin(), result.end(), out);
+    if (out_len != nullptr) {
+        *out_len = result.size();
+    }
+    return AV_OK;
+}
+
+/**
+ * @brief Hill cipher on text, with the same padding rules as the command line tool.
+ */
+int av_hill_text(const char* operation, int n, const int* key, const char* text, size_t text_len,
+                 char** out, size_t* out_len) {
+    if (operation == nullptr || key == nullptr || text == nullptr || out == nullptr || n <= 0) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    std::string op(operation);
+    if (op != "encrypt" && op != "decrypt") {
+        return AV_INVALID_OPERATION;
+    }
+
+    std::vector<int> keyMatrix(key, key + (size_t)n * n);
+    std::string result = processText(std::string(text, text_len), keyMatrix, n, op);
+
+    *out = copy_out(result, out_len);
+    return *out != nullptr ? AV_OK : AV_FAILED;
+}
+
+/**
+ * @brief SHA-512 digest of a binary buffer.
+ * @param digest Caller-provided 64-byte output buffer
+ */
+int av_sha512(const unsigned char* data, size_t len, unsigned char* digest) {
+    if ((data == nullptr && len > 0) || digest == nullptr) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    std::string message(reinterpret_cast<const char*>(data), len);
+    sha512(message, digest);
+    return AV_OK;
+}
+
+/**
+ * @brief HMAC with step-by-step details for visualization.
+ * @param result Filled in on success; release with av_hmac_result_free()
+ */
+int av_hmac(const char* message, size_t message_len, const char* key, size_t key_len,
+            const char* algorithm, struct av_hmac_result* result) {
+    if (message == nullptr || key == nullptr || algorithm == nullptr || result == nullptr) {
+        return AV_INVALID_ARGUMENT;
+    }
+
+    std::memset(result, 0, sizeof(*result));
+
+    class HMAC generator;
+    HMAC::HMACResult r = generator.generateHMAC(std::string(message, message_len),
+                                                std::string(key, key_len), algorithm);
+
+    result->success = r.success ? 1 : 0;
+    result->block_size = r.blockSize;
+    if (!r.success) {
+        result->error = copy_out(r.error, nullptr);
+        return AV_FAILED;
+    }
+
+    const std::string* fields[AV_HMAC_FIELD_COUNT] = {
+        &r.hmac, &r.originalKey, &r.processedKey, &r.keyAnalysis, &r.innerPad, &r.outerPad,
+        &r.innerKeyMaterial, &r.outerKeyMaterial, &r.messageHex, &r.innerHash,
+        &r.outerInput, &r.algorithm
+    };
+    for (int i = 0; i < AV_HMAC_FIELD_COUNT; i++) {
+        result->fields[i] = copy_out(*fields[i], nullptr);
+    }
+    return AV_OK;
+}
+
+/**
+ * @brief Releases the buffers held by an av_hmac_result.
+ */
+void av_hmac_result_free(struct av_hmac_result* result) {
+    if (result == nullptr) {
+        return;
+    }
+    for (int i = 0; i < AV_HMAC_FIELD_COUNT; i++) {
+        std::free(result->fields[i]);
+        result->fields[i] = nullptr;
+    }
+    std::free(result->error);
+    result->error = nullptr;
+}
+
+}
@@ -0,0 +1,117 @@
+/*
+ * Length-prefixed stdin/stdout protocol shared by the C++ executables.
+ *
+ * Passing messages and keys on the command line limits them to ARG_MAX, cannot
+ * carry NUL bytes and exposes them in /proc/<pid>/cmdline. Run an executable
+ * with the single argument --framed and it reads its arguments from stdin
+ * instead, and writes its output back the same way.
+ *
+ * A message is a field count followed by that many fields; every field is a
+ * byte length followed by the bytes. All integers are unsigned 32-bit
+ * big-endian:
+ *
+ *   [count] [len_1] [bytes_1] ... [len_count] [bytes_count]
+ *
+ * Request fields are the positional arguments, in the same order as on the
+ * command line. The response has one field: exactly what the program prints
+ * in argv mode. Errors still go to stderr with a non-zero exit status.
+ *
+ * Cryptography/framing.py implements the Python side; CryptoWorker.java uses
+ * the same format for the long-lived Java workers.
+ */
+#ifndef ALGOVAULT_FRAMING_H
+#define ALGOVAULT_FRAMING_H
+
+#include <cstdint>
+#include <iostream>
+#include <string>
+#include <vector>
+
+namespace algovault {
+
+// Largest field or field count accepted, so a corrupt header cannot trigger a huge allocation
+const uint32_t MAX_FRAME_BYTES = 256u * 1024u * 1024u;
+
+inline bool readU32(std::istream& in, uint32_t& value) {
+    unsigned char bytes[4];
+    if (!in.read(reinterpret_cast<char*>(bytes), 4)) {
+        return false;
+    }
+    value = (uint32_t(bytes[0]) << 24) | (uint32_t(bytes[1]) << 16) | (uint32_t(bytes[2]) << 8) | uint32_t(bytes[3]);
+    return true;
+}
+
+inline void writeU32(std::ostream& out, uint32_t value) {
+    char bytes[4] = {
+        char((value >> 24) & 0xFF), char((value >> 16) & 0xFF), char((value >> 8) & 0xFF), char(value & 0xFF)
+    };
+    out.write(bytes, 4);
+}
+
+// Reads one message. Returns false on end of input or a malformed message.
+inline bool readMessage(std::istream& in, std::vector<std::string>& fields) {
+    uint32_t count;
+    if (!readU32(in, count) || count > MAX_FRAME_BYTES / 4) {
+        return false;
+    }
+    fields.clear();
+    fields.reserve(count);
+    for (uint32_t i = 0; i < count; i++) {
+        uint32_t length;
+        if (!readU32(in, length) || length > MAX_FRAME_BYTES) {
+            return false;
+        }
+        std::string field(length, '\0');
+        if (length > 0 && !in.read(&field[0], length)) {
+            return false;
+        }
+        fields.push_back(field);
+    }
+    return true;
+}
+
+inline void writeMessage(std::ostream& out, const std::vector<std::string>& fields) {
+    writeU32(out, uint32_t(fields.size()));
+    for (size_t i = 0; i < fields.size(); i++) {
+        writeU32(out, uint32_t(fields[i].size()));
+        out.write(fields[i].data(), fields[i].size());
+    }
+    out.flush();
+}
+
+/*
+ * Collects the program arguments, with args[0] the program name, either from
+ * argv or, when the only argument is --framed, from one message on stdin.
+ * Returns false if the framed request could not be read.
+ */
+inline bool collectArgs(int argc, char* argv[], std::vector<std::string>& args, bool& framed) {
+    args.assign(1, argc > 0 ? std::string(argv[0]) : std::string());
+    framed = argc == 2 && std::string(argv[1]) == "--framed";
+    if (!framed) {
+        for (int i = 1; i < argc; i++) {
+            args.push_back(argv[i]);
+        }
+        return true;
+    }
+    std::vector<std::string> fields;
+    if (!readMessage(std::cin, fields)) {
+        std::cerr << "Malformed framed request on stdin" << std::endl;
+        return false;
+    }
+    args.insert(args.end(), fields.begin(), fields.end());
+    return true;
+}
+
+// Writes the program output, as a one-field message in framed mode.
+inline void emit(const std::string& output, bool framed) {
+    if (framed) {
+        writeMessage(std::cout, std::vector<std::string>(1, output));
+    } else {
+        std::cout << output;
+        std::cout.flush();
+    }
+}
+
+} // namespace algovault
+
+#endif // ALGOVAULT_FRAMING_H
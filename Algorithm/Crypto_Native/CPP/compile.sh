@@ -10,9 +10,15 @@ echo "========================================"
 compile_cpp() {
     local source_file=$1
     local executable_name=${source_file%.cpp}
+    local libs=""
+
+    # HMAC.cpp calls into OpenSSL
+    if [[ "$source_file" == "HMAC.cpp" ]]; then
+        libs="-lcrypto"
+    fi
     
     echo "Compiling $source_file..."
-    if g++ -std=c++11 -O2 -Wall -Wextra "$source_file" -o "$executable_name"; then
+    if g++ -std=c++11 -O2 -Wall -Wextra "$source_file" -o "$executable_name" $libs; then
         echo "✓ Successfully compiled $executable_name"
         chmod +x "$executable_name"
     else
@@ -21,11 +27,31 @@ compile_cpp() {
     fi
 }
 
+# Function to compile the shared library loaded in-process by the Django backend
+compile_library() {
+    local library_name="libalgovault.so"
+    if [[ "$(uname)" == "Darwin" ]]; then
+        library_name="libalgovault.dylib"
+    fi
+
+    echo "Compiling $library_name..."
+    if g++ -std=c++11 -O2 -fPIC -shared algovault_capi.cpp -o "$library_name" -lcrypto; then
+        echo "✓ Successfully compiled $library_name"
+    else
+        echo "✗ Failed to compile $library_name"
+        return 1
+    fi
+}
+
 # Compile all C++ files
 files_compiled=0
 files_failed=0
 
 for cpp_file in *.cpp; do
+    # The C API only builds as part of the shared library
+    if [[ "$cpp_file" == "algovault_capi.cpp" ]]; then
+        continue
+    fi
     if [[ -f "$cpp_file" ]]; then
         if compile_cpp "$cpp_file"; then
             ((files_compiled++))
@@ -36,6 +62,13 @@ for cpp_file in *.cpp; do
     fi
 done
 
+if compile_library; then
+    ((files_compiled++))
+else
+    ((files_failed++))
+fi
+echo ""
+
 # Summary
 echo "========================================"
 echo "Compilation Summary:"
@@ -54,23 +54,8 @@ public class AES {
             System.exit(1);
         }
 
-        String message = args[0];
-        String keyStr = args[1];
-        String operation = args[2];
-
         try {
-            if (keyStr.length() != 16) {
-                throw new IllegalArgumentException("Key must be 16 characters long.");
-            }
-            byte[] key = keyStr.getBytes(StandardCharsets.UTF_8);
-
-            if ("encrypt".equalsIgnoreCase(operation)) {
-                System.out.print(encrypt(message, key));
-            } else if ("decrypt".equalsIgnoreCase(operation)) {
-                System.out.print(decrypt(message, key));
-            } else {
-                throw new IllegalArgumentException("Invalid operation. Choose 'encrypt' or 'decrypt'.");
-            }
+            System.out.print(run(args));
         } catch (Exception e) {
             System.err.println("Error: " + e.getMessage());
             e.printStackTrace();
@@ -78,6 +63,32 @@ public class AES {
         }
     }
 
+    /**
+     * Runs one AES request and returns what the command line tool prints.
+     * Shared by main() and the long-lived CryptoWorker.
+     */
+    public static String run(String[] args) throws Exception {
+        if (args.length < 3) {
+            throw new IllegalArgumentException("Usage: AES <message> <key> <encrypt|decrypt>");
+        }
+
+        String message = args[0];
+        String keyStr = args[1];
+        String operation = args[2];
+
+        if (keyStr.length() != 16) {
+            throw new IllegalArgumentException("Key must be 16 characters long.");
+        }
+        byte[] key = keyStr.getBytes(StandardCharsets.UTF_8);
+
+        if ("encrypt".equalsIgnoreCase(operation)) {
+            return encrypt(message, key);
+        } else if ("decrypt".equalsIgnoreCase(operation)) {
+            return decrypt(message, key);
+        }
+        throw new IllegalArgumentException("Invalid operation. Choose 'encrypt' or 'decrypt'.");
+    }
+
     // Convert byte array to hex string
     private static String bytesToHex(byte[] bytes) {
         StringBuilder result = new StringBuilder();
@@ -0,0 +1,120 @@
+import java.io.BufferedInputStream;
+import java.io.BufferedOutputStream;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.EOFException;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+
+/**
+ * Long-lived worker process for the Java cryptographic implementations.
+ *
+ * The Django backend starts a small pool of these workers once and sends them
+ * requests over stdin instead of launching a new JVM for every request.
+ * Requests and responses use the length-prefixed framing shared with the C++
+ * executables (see Cryptography/framing.py): a message is a field count
+ * followed by that many fields, each a byte length followed by the UTF-8
+ * bytes, with all integers unsigned 32-bit big-endian. Arguments of any size
+ * and content pass through unchanged, without escaping.
+ *
+ * Request fields:   id, class name, then the command line arguments of that class
+ *                   e.g. ["7", "AES", "message", "0123456789abcdef", "encrypt"]
+ * Response fields:  id, "ok" and the output, or id, "error" and the message
+ *
+ * "output" is exactly what the matching command line tool prints, so callers can
+ * parse it the same way they parse subprocess output.
+ *
+ * How to Compile:
+ * javac CryptoWorker.java AES.java DES.java MD5.java DiffieHellman.java
+ *
+ * How to Run:
+ * java -cp . CryptoWorker
+ */
+public class CryptoWorker {
+
+    // Largest field or field count accepted; matches MAX_FRAME_BYTES in framing.py
+    private static final int MAX_FRAME_BYTES = 256 * 1024 * 1024;
+
+    public static void main(String[] args) throws Exception {
+        DataInputStream in = new DataInputStream(new BufferedInputStream(System.in));
+        DataOutputStream out = new DataOutputStream(new BufferedOutputStream(System.out));
+
+        // Signal readiness so the pool knows the classes are loaded
+        writeMessage(out, "0", "ok", "ready");
+
+        while (true) {
+            String[] fields;
+            try {
+                fields = readMessage(in);
+            } catch (EOFException e) {
+                break;
+            }
+
+            String id = fields.length > 0 ? fields[0] : "0";
+            try {
+                if (fields.length < 2) {
+                    throw new IllegalArgumentException("Request needs an id and a class name");
+                }
+                String output = dispatch(fields[1], Arrays.copyOfRange(fields, 2, fields.length));
+                writeMessage(out, id, "ok", output);
+            } catch (Exception e) {
+                String message = e.getMessage() != null ? e.getMessage() : e.getClass().getSimpleName();
+                writeMessage(out, id, "error", message);
+            }
+        }
+    }
+
+    /**
+     * Routes a request to the static run() entry point of the named class.
+     */
+    private static String dispatch(String className, String[] args) throws Exception {
+        if ("AES".equals(className)) {
+            return AES.run(args);
+        } else if ("DES".equals(className)) {
+            return DES.run(args);
+        } else if ("MD5".equals(className)) {
+            return MD5.run(args);
+        } else if ("DiffieHellman".equals(className)) {
+            return DiffieHellman.run(args);
+        }
+        throw new IllegalArgumentException("Unknown class: " + className);
+    }
+
+    /**
+     * Reads one framed message. A malformed header leaves the stream out of
+     * sync, so it ends the worker; the pool starts a replacement.
+     *
+     * @throws EOFException at the end of stdin
+     */
+    private static String[] readMessage(DataInputStream in) throws IOException {
+        int count = in.readInt();
+        if (count < 0 || count > MAX_FRAME_BYTES / 4) {
+            throw new IOException("Malformed request: " + count + " fields");
+        }
+        String[] fields = new String[count];
+        for (int i = 0; i < count; i++) {
+            int length = in.readInt();
+            if (length < 0 || length > MAX_FRAME_BYTES) {
+                throw new IOException("Malformed request: field of " + length + " bytes");
+            }
+            byte[] bytes = new byte[length];
+            in.readFully(bytes);
+            fields[i] = new String(bytes, StandardCharsets.UTF_8);
+        }
+        return fields;
+    }
+
+    /**
+     * Writes one framed message and flushes it.
+     */
+    private static void writeMessage(DataOutputStream out, String... fields) throws IOException {
+        out.writeInt(fields.length);
+        for (String field : fields) {
+            byte[] bytes = field.getBytes(StandardCharsets.UTF_8);
+            out.writeInt(bytes.length);
+            out.write(bytes);
+        }
+        out.flush();
+    }
+}
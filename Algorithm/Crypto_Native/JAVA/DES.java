@@ -7,10 +7,10 @@ import javax.crypto.SecretKeyFactory;
 import javax.crypto.spec.DESKeySpec;
 
 /**
- * @class DESProcessor
+ * @class DES
  * @brief Implements DES encryption and decryption with initial permutation and Feistel rounds.
  */
-public class DESProcessor {
+public class DES {
     private static final int[] IP = {
         58, 50, 42, 34, 26, 18, 10, 2,
         60, 52, 44, 36, 28, 20, 12, 4,
@@ -31,31 +31,14 @@ public class DESProcessor {
      */
     public static void main(String[] args) {
         try {
-            if (args.length < 2) {
-                System.err.println("Usage: java DESProcessor <operation> <key> <text>");
+            if (args.length < 3) {
+                System.err.println("Usage: java DES <operation> <key> <text>");
                 System.err.println("operation: encrypt or decrypt");
                 System.exit(1);
             }
 
-            String operation = args[0];
-            key = args[1];
-            plainText = args[2];
-            
-            if ("encrypt".equalsIgnoreCase(operation)) {
-                // Encrypt using Java's DES implementation
-                byte[] encryptedBytes = encrypt();
-                String cipherText = Base64.getEncoder().encodeToString(encryptedBytes);
-                System.out.println(cipherText);
-            } else if ("decrypt".equalsIgnoreCase(operation)) {
-                // Decrypt text
-                byte[] encryptedBytes = Base64.getDecoder().decode(plainText);
-                String decryptedText = decrypt(encryptedBytes);
-                System.out.println(decryptedText);
-            } else {
-                System.err.println("Invalid operation. Use 'encrypt' or 'decrypt'");
-                System.exit(1);
-            }
-            
+            System.out.println(run(args));
+
         } catch (Exception e) {
             System.err.println("Error: " + e.getMessage());
             e.printStackTrace();
@@ -63,6 +46,31 @@ public class DESProcessor {
         }
     }
 
+    /**
+     * @brief Runs one DES request and returns the result text.
+     * Shared by main() and the long-lived CryptoWorker.
+     */
+    public static String run(String[] args) throws Exception {
+        if (args.length < 3) {
+            throw new IllegalArgumentException("Usage: DES <operation> <key> <text>");
+        }
+
+        String operation = args[0];
+        key = args[1];
+        plainText = args[2];
+
+        if ("encrypt".equalsIgnoreCase(operation)) {
+            // Encrypt using Java's DES implementation
+            byte[] encryptedBytes = encrypt();
+            return Base64.getEncoder().encodeToString(encryptedBytes);
+        } else if ("decrypt".equalsIgnoreCase(operation)) {
+            // Decrypt text
+            byte[] encryptedBytes = Base64.getDecoder().decode(plainText);
+            return decrypt(encryptedBytes);
+        }
+        throw new IllegalArgumentException("Invalid operation. Use 'encrypt' or 'decrypt'");
+    }
+
     /**
      * @brief Performs initial permutation on the input text.
      * This function applies an initial permutation to rearrange the bits according to a predefined table.
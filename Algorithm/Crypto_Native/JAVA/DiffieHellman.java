@@ -31,56 +31,8 @@ public class DiffieHellman {
         }
 
         try {
-            // 2. Parse arguments into BigInteger for safe handling of large numbers
-            BigInteger p = new BigInteger(args[0]);         // Public prime
-            BigInteger g = new BigInteger(args[1]);         // Public generator
-            BigInteger privateA = new BigInteger(args[2]);  // Alice's private key
-            BigInteger privateB = new BigInteger(args[3]);  // Bob's private key
-
-            // 3. Calculate public keys
-            // Alice's public key A = g^privateA mod p
-            BigInteger publicA = g.modPow(privateA, p);
-
-            // Bob's public key B = g^privateB mod p
-            BigInteger publicB = g.modPow(privateB, p);
-
-            // 4. Calculate the shared secret from both perspectives
-            // Alice computes the secret: S = B^privateA mod p
-            BigInteger secretA = publicB.modPow(privateA, p);
-
-            // Bob computes the secret: S = A^privateB mod p
-            BigInteger secretB = publicA.modPow(privateB, p);
-
-            // 5. Verify that the secrets match
-            boolean secretsMatch = secretA.equals(secretB);
-
-            // 6. Format the results into a single-line JSON string
-            // This is the ideal format for machine-to-machine communication
-            String jsonOutput = String.format(
-                "{" +
-                    "\"success\": true, " +
-                    "\"inputs\": {" +
-                        "\"prime_p\": \"%s\", " +
-                        "\"generator_g\": \"%s\", " +
-                        "\"private_a\": \"%s\", " +
-                        "\"private_b\": \"%s\"" +
-                    "}, " +
-                    "\"results\": {" +
-                        "\"public_a\": \"%s\", " +
-                        "\"public_b\": \"%s\", " +
-                        "\"shared_secret_alice\": \"%s\", " +
-                        "\"shared_secret_bob\": \"%s\", " +
-                        "\"secrets_match\": %b" +
-                    "}" +
-                "}",
-                p.toString(), g.toString(), privateA.toString(), privateB.toString(), // Inputs
-                publicA.toString(), publicB.toString(), // Public Keys
-                secretA.toString(), secretB.toString(), // Shared Secrets
-                secretsMatch // Verification
-            );
-
             // Print the final JSON string to standard output
-            System.out.println(jsonOutput);
+            System.out.println(run(args));
 
         } catch (NumberFormatException e) {
             // Handle cases where arguments are not valid integers
@@ -92,4 +44,62 @@ public class DiffieHellman {
             System.exit(1);
         }
     }
+
+    /**
+     * Performs one key exchange calculation and returns the single-line JSON result.
+     * Shared by main() and the long-lived CryptoWorker.
+     */
+    public static String run(String[] args) {
+        if (args.length != 4) {
+            throw new IllegalArgumentException("Usage: DiffieHellman <prime p> <generator g> <private_a> <private_b>");
+        }
+
+        // 2. Parse arguments into BigInteger for safe handling of large numbers
+        BigInteger p = new BigInteger(args[0]);         // Public prime
+        BigInteger g = new BigInteger(args[1]);         // Public generator
+        BigInteger privateA = new BigInteger(args[2]);  // Alice's private key
+        BigInteger privateB = new BigInteger(args[3]);  // Bob's private key
+
+        // 3. Calculate public keys
+        // Alice's public key A = g^privateA mod p
+        BigInteger publicA = g.modPow(privateA, p);
+
+        // Bob's public key B = g^privateB mod p
+        BigInteger publicB = g.modPow(privateB, p);
+
+        // 4. Calculate the shared secret from both perspectives
+        // Alice computes the secret: S = B^privateA mod p
+        BigInteger secretA = publicB.modPow(privateA, p);
+
+        // Bob computes the secret: S = A^privateB mod p
+        BigInteger secretB = publicA.modPow(privateB, p);
+
+        // 5. Verify that the secrets match
+        boolean secretsMatch = secretA.equals(secretB);
+
+        // 6. Format the results into a single-line JSON string
+        // This is the ideal format for machine-to-machine communication
+        return String.format(
+            "{" +
+                "\"success\": true, " +
+                "\"inputs\": {" +
+                    "\"prime_p\": \"%s\", " +
+                    "\"generator_g\": \"%s\", " +
+                    "\"private_a\": \"%s\", " +
+                    "\"private_b\": \"%s\"" +
+                "}, " +
+                "\"results\": {" +
+                    "\"public_a\": \"%s\", " +
+                    "\"public_b\": \"%s\", " +
+                    "\"shared_secret_alice\": \"%s\", " +
+                    "\"shared_secret_bob\": \"%s\", " +
+                    "\"secrets_match\": %b" +
+                "}" +
+            "}",
+            p.toString(), g.toString(), privateA.toString(), privateB.toString(), // Inputs
+            publicA.toString(), publicB.toString(), // Public Keys
+            secretA.toString(), secretB.toString(), // Shared Secrets
+            secretsMatch // Verification
+        );
+    }
 }
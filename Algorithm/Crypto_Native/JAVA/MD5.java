@@ -4,29 +4,7 @@ import java.util.Scanner;
 public class MD5 {
     public static void main(String[] args) {
         if (args.length > 0) {
-            // Check if this is a verification request (4 arguments: input, format, expected_hash, "verify")
-            if (args.length >= 4 && "verify".equals(args[3])) {
-                String input = args[0];
-                String format = args[1];
-                String expectedHash = args[2];
-                
-                String generatedHash = getMD5Hash(input, format);
-                boolean matches = generatedHash.equalsIgnoreCase(expectedHash);
-                
-                // Output minimal verification result as JSON
-                System.out.println("{");
-                System.out.println("  \"generated_hash\": \"" + generatedHash + "\",");
-                System.out.println("  \"expected_hash\": \"" + expectedHash + "\",");
-                System.out.println("  \"matches\": " + matches);
-                System.out.println("}");
-                return;
-            }
-            
-            // Regular hash generation mode
-            String input = args[0];
-            String format = args.length > 1 ? args[1] : "hex";
-            String md5Hash = getMD5Hash(input, format);
-            System.out.println(md5Hash);
+            System.out.println(run(args));
         } else {
             // Create a Scanner object to read input from the user
             Scanner scanner = new Scanner(System.in);
@@ -46,6 +24,40 @@ public class MD5 {
         }
     }
 
+    /**
+     * Runs one hash or verify request and returns what the command line tool prints.
+     * Shared by main() and the long-lived CryptoWorker.
+     * @param args input, format, and optionally expected_hash and "verify".
+     * @return The hash, or a small JSON object for verification requests.
+     */
+    public static String run(String[] args) {
+        if (args.length == 0) {
+            throw new IllegalArgumentException("Usage: MD5 <input> [format] [expected_hash verify]");
+        }
+
+        // Check if this is a verification request (4 arguments: input, format, expected_hash, "verify")
+        if (args.length >= 4 && "verify".equals(args[3])) {
+            String input = args[0];
+            String format = args[1];
+            String expectedHash = args[2];
+            
+            String generatedHash = getMD5Hash(input, format);
+            boolean matches = generatedHash.equalsIgnoreCase(expectedHash);
+            
+            // Output minimal verification result as JSON
+            return "{\n"
+                + "  \"generated_hash\": \"" + generatedHash + "\",\n"
+                + "  \"expected_hash\": \"" + expectedHash + "\",\n"
+                + "  \"matches\": " + matches + "\n"
+                + "}";
+        }
+        
+        // Regular hash generation mode
+        String input = args[0];
+        String format = args.length > 1 ? args[1] : "hex";
+        return getMD5Hash(input, format);
+    }
+
     /**
      * Computes the MD5 hash of a given input string.
      * @param input The input string to hash.
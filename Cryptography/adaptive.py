@@ -0,0 +1,151 @@
+"""
+Latency-aware backend selection.
+
+The fixed preference order (native library, executable or JVM, Python) is not
+always the fastest: for a short message ``hashlib`` answers long before a C++
+process has even started. The selector keeps a rolling window of recent call
+latencies per (algorithm, backend, input-size bucket) and moves the backend
+with the lowest median to the front of the chain. A small share of requests
+(ADAPTIVE_EXPLORATION_RATE) goes to another backend instead, so the windows of
+the losers stay current and a backend that gets faster is noticed.
+
+Failed attempts are recorded as infinitely slow, so a backend that keeps
+falling through loses its place without being disabled outright.
+"""
+
+import math
+import random
+import threading
+from collections import deque
+
+from django.conf import settings
+
+DEFAULT_WINDOW = 64
+DEFAULT_MIN_SAMPLES = 3
+DEFAULT_EXPLORATION_RATE = 0.05
+
+# Inputs below this many bytes share the first bucket; each bucket above it doubles
+SMALLEST_BUCKET = 64
+
+
+def input_size(params):
+    """Return the input size of a call: the total length of its string, bytes and list parameters."""
+    return sum(len(value) for value in params.values() if isinstance(value, (str, bytes, list, tuple)))
+
+
+def size_bucket(size):
+    """
+    Map an input size to a power-of-two bucket.
+
+    Returns:
+        int: 0 for sizes below SMALLEST_BUCKET, otherwise 1 + log2(size / SMALLEST_BUCKET) rounded down
+    """
+    if size < SMALLEST_BUCKET:
+        return 0
+    return size.bit_length() - SMALLEST_BUCKET.bit_length() + 1
+
+
+def bucket_label(bucket):
+    """Return a readable size range for a bucket, e.g. '<64' or '64-127'."""
+    if bucket == 0:
+        return f"<{SMALLEST_BUCKET}"
+    low = SMALLEST_BUCKET << (bucket - 1)
+    return f"{low}-{2 * low - 1}"
+
+
+class LatencyWindow:
+    """The most recent latencies of one backend for one size bucket."""
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        self._samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, fraction):
+        """Return the given percentile (0-1) of the window, or None if it is empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def median(self):
+        return self.percentile(0.5)
+
+
+class AdaptiveSelector:
+    """Rolling latency windows per (algorithm, backend, size bucket) and the choice made from them."""
+
+    def __init__(self, window=None, min_samples=None, exploration_rate=None):
+        self.window = window or getattr(settings, 'ADAPTIVE_WINDOW', DEFAULT_WINDOW)
+        self.min_samples = min_samples or getattr(settings, 'ADAPTIVE_MIN_SAMPLES', DEFAULT_MIN_SAMPLES)
+        if exploration_rate is None:
+            exploration_rate = getattr(settings, 'ADAPTIVE_EXPLORATION_RATE', DEFAULT_EXPLORATION_RATE)
+        self.exploration_rate = exploration_rate
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def record(self, algorithm, backend, bucket, seconds, failed=False):
+        """Add one call to the window of a backend; failed calls count as infinitely slow."""
+        key = (algorithm, backend, bucket)
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = LatencyWindow(self.window)
+            window.add(math.inf if failed else seconds)
+
+    def _median(self, algorithm, backend, bucket):
+        with self._lock:
+            window = self._windows.get((algorithm, backend, bucket))
+            if window is None or len(window) < self.min_samples:
+                return None
+            return window.median()
+
+    def choose(self, algorithm, candidates, bucket):
+        """
+        Pick the backend to try first.
+
+        A candidate with fewer than ADAPTIVE_MIN_SAMPLES calls in this bucket is
+        picked so it gets measured; otherwise the lowest median wins, except for
+        the exploration share of calls, which go to a random other candidate.
+
+        Args:
+            algorithm (str): Algorithm name
+            candidates (list): Backend names that can currently serve the call, in preference order
+            bucket (int): Size bucket of the input
+
+        Returns:
+            str: The chosen backend name
+        """
+        medians = {}
+        for name in candidates:
+            median = self._median(algorithm, name, bucket)
+            if median is None:
+                return name
+            medians[name] = median
+        best = min(candidates, key=lambda name: medians[name])
+        others = [name for name in candidates if name != best]
+        if others and random.random() < self.exploration_rate:
+            return random.choice(others)
+        return best
+
+    def snapshot(self):
+        """Return the median and p95 of every window in milliseconds, keyed by algorithm, bucket and backend."""
+        with self._lock:
+            items = [(key, window.percentile(0.5), window.percentile(0.95), len(window))
+                     for key, window in self._windows.items()]
+        report = {}
+        for (algorithm, backend, bucket), median, p95, samples in sorted(items, key=lambda item: item[0]):
+            report.setdefault(algorithm, {}).setdefault(bucket_label(bucket), {})[backend] = {
+                'samples': samples,
+                'p50_ms': None if math.isinf(median) else round(median * 1000, 3),
+                'p95_ms': None if math.isinf(p95) else round(p95 * 1000, 3),
+            }
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
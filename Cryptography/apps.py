@@ -1,6 +1,41 @@
+import os
+import sys
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+def _serves_requests():
+    """Return False for one-off management commands and the runserver autoreloader parent."""
+    if os.path.basename(sys.argv[0]) == 'manage.py':
+        if 'runserver' not in sys.argv:
+            return False
+        if os.environ.get('RUN_MAIN') != 'true' and '--noreload' not in sys.argv:
+            return False
+    return True
+
+
+def _warm_up(probe_java):
+    from .backends import JAVA, get_registry
+    from .jvm_pool import get_jvm_pool
+
+    registry = get_registry()
+    registry.probe_all(skip=() if probe_java else (JAVA,))
+    # The Java probes already started one worker; fill the rest of the pool
+    if probe_java and any(registry.is_usable(algorithm, JAVA) for algorithm in ('aes', 'des', 'md5')):
+        get_jvm_pool().warm()
 
 
 class CryptographyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Cryptography'
+
+    def ready(self):
+        # Probe the native backends once so requests go straight to a working implementation,
+        # and pre-warm the JVM worker pool so the first AES/DES/MD5 request does not pay JVM startup.
+        if not getattr(settings, 'BACKEND_PROBE_ON_STARTUP', True) or not _serves_requests():
+            return
+
+        probe_java = getattr(settings, 'JVM_POOL_PREWARM', False)
+        threading.Thread(target=_warm_up, args=(probe_java,), name='backend-warmup', daemon=True).start()
@@ -0,0 +1,318 @@
+"""
+Async variants of the Cryptography JSON APIs for ASGI servers (algovault/asgi.py).
+
+The synchronous views block a worker thread for the whole native call. These
+views await ``dispatcher.dispatch_async`` instead:
+
+- C++ executables run through ``asyncio.create_subprocess_exec``, so a single
+  event loop can have hundreds of them in flight.
+- The in-process C++ library and the JVM worker pool are blocking APIs and run
+  via ``asyncio.to_thread``.
+- Every backend has its own ``asyncio.Semaphore`` (ASYNC_BACKEND_CONCURRENCY)
+  bounding how many calls are in flight at once.
+- Python fallbacks run via ``asyncio.to_thread``; the pure-Python AES
+  visualization is CPU-bound and runs in a process pool instead, so it does
+  not hold the GIL against the event loop.
+
+Backend chains, circuit breakers, latency budgets and timing statistics are
+shared with the synchronous views.
+"""
+
+import functools
+import json
+
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+
+from .backends import NATIVE
+from .dispatcher import dispatch_async, format_vigenere_crack_report, hill_key_word_to_matrix
+from .result_cache import cached_dispatch_async
+from .streaming import aes_events_async, error_events, hmac_events, iterate_in_thread, sse_response
+from .views import aes_response_fields, aes_trace_response, hmac_step_details, parse_aes_mode, parse_aes_trace
+
+
+def _parse_body(request):
+    try:
+        return json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+@csrf_exempt
+async def vigenere_process_api(request):
+    """Async API endpoint for Vigenere Cipher processing with C++ primary and Python fallback."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    operation = str(data.get('operation', 'encrypt')).lower()
+    text = data.get('message')
+    key = data.get('keyword')
+
+    if operation == 'auto-crack':
+        # The key is what is being looked for
+        if not text:
+            return JsonResponse({'error': 'Missing required fields.'}, status=400)
+        try:
+            served = await dispatch_async('vigenere_crack', text=text)
+            return JsonResponse({'result': format_vigenere_crack_report(served.value, text), 'backend': served.backend})
+        except Exception as e:
+            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+    if not all([operation, text, key]):
+        return JsonResponse({'error': 'Missing required fields.'}, status=400)
+
+    try:
+        served = await dispatch_async('vigenere', operation=operation, text=text, key=key)
+        return JsonResponse({'result': served.value, 'backend': served.backend})
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+async def des_process_api(request):
+    """Async API endpoint for DES processing with Java primary and Python fallback."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    operation = str(data.get('operation', 'encrypt')).lower()
+    message_str = data.get('message')
+    key_str = data.get('key')
+
+    if not all([operation, message_str, key_str]):
+        return JsonResponse({'error': 'Missing required fields.'}, status=400)
+
+    # Prepare key (must be 8 bytes for DES)
+    if len(key_str) < 8:
+        key_str = key_str + '\0' * (8 - len(key_str))
+    elif len(key_str) > 8:
+        key_str = key_str[:8]
+
+    try:
+        served = await cached_dispatch_async('des', operation=operation, key=key_str, message=message_str)
+        return JsonResponse({'result': served.value, 'backend': served.backend, 'cached': served.cached})
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+async def sha512_process_api(request):
+    """Async API endpoint for SHA-512 hashing with C++ primary and Python fallback."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message')
+
+    if message is None:
+        return JsonResponse({'error': 'Missing required message field.'}, status=400)
+
+    try:
+        served = await cached_dispatch_async('sha512', message=message)
+        return JsonResponse({'result': served.value, 'backend': served.backend, 'cached': served.cached})
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+async def hill_process_api(request):
+    """Async API endpoint for Hill Cipher processing with C++ primary and Python fallback."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    operation = data.get('operation')
+    dimension = data.get('dimension')
+    key_matrix_flat = data.get('key_matrix_flat')
+    input_vector_flat = data.get('input_vector_flat')
+    key_word = data.get('key_word')
+    input_text = data.get('input_text')
+
+    if not operation:
+        return JsonResponse({'error': 'Operation is required.'}, status=400)
+    if not dimension:
+        return JsonResponse({'error': 'Dimension is required.'}, status=400)
+    if not key_matrix_flat and not key_word:
+        return JsonResponse({'error': 'Either key_matrix_flat or key_word is required.'}, status=400)
+    if not input_vector_flat and not input_text:
+        return JsonResponse({'error': 'Either input_vector_flat or input_text is required.'}, status=400)
+
+    try:
+        dimension = int(dimension)
+        if key_word:
+            key_matrix_flat = hill_key_word_to_matrix(key_word, dimension)
+
+        served = await dispatch_async('hill', operation=operation, dimension=dimension,
+                                      key_matrix_flat=key_matrix_flat,
+                                      input_vector_flat=input_vector_flat, input_text=input_text)
+        result_vector, result_text = served.value
+
+        if result_text is not None:
+            return JsonResponse({'result_text': result_text, 'backend': served.backend})
+        return JsonResponse({'result_vector': result_vector, 'backend': served.backend})
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+async def aes_process_api(request):
+    """Async API endpoint for AES processing with Java primary and Python fallback."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    operation = data.get('operation', 'encrypt')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+    elif len(key) != 16:
+        return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
+    try:
+        trace_blocks = parse_aes_trace(data.get('trace'))
+        mode = parse_aes_mode(data.get('mode'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    if mode != 'ECB':
+        try:
+            served = await dispatch_async('aes_mode', operation=operation, mode=mode, message=message, key=key,
+                                          iv=data.get('iv'), trace_blocks=trace_blocks)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+        return aes_trace_response(request, aes_response_fields(served, operation), served.value['blocks'])
+
+    try:
+        served = await cached_dispatch_async('aes', operation=operation, message=message, key=key,
+                                             trace_blocks=trace_blocks)
+    except Exception as e:
+        print(f"AES processing failed on every backend: {str(e)}")
+        return JsonResponse({'error': 'Failed to process AES operation.'}, status=500)
+
+    return aes_trace_response(request, aes_response_fields(served, operation), served.value.get('blocks', []))
+
+
+@csrf_exempt
+async def aes_block_trace_api(request):
+    """Async API endpoint returning the round visualization of a single AES block."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    operation = data.get('operation', 'encrypt')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+    elif len(key) != 16:
+        return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
+    try:
+        block = int(data.get('block'))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'block must be a block number starting at 1.'}, status=400)
+    try:
+        mode = parse_aes_mode(data.get('mode'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    if mode != 'ECB':
+        try:
+            served = await dispatch_async('aes_mode', operation=operation, mode=mode, message=message, key=key,
+                                          iv=data.get('iv'), trace_blocks=(block - 1, block))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except Exception as e:
+            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+        if block < 1 or not served.value['blocks']:
+            return JsonResponse({'error': f"Block {block} is out of range, the message has "
+                                          f"{served.value['totalBlocks']} blocks"}, status=400)
+        fields = aes_response_fields(served, operation)
+        del fields['result']
+        return aes_trace_response(request, fields, served.value['blocks'])
+
+    try:
+        served = await cached_dispatch_async('aes_block_trace', operation=operation, message=message,
+                                             key=key, block=block)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+    return aes_trace_response(request, {
+        'total_blocks': served.value['totalBlocks'],
+        'operation': operation,
+        'mode': 'ECB',
+        'backend': served.backend,
+        'cached': served.cached,
+    }, [served.value['block']])
+
+
+@csrf_exempt
+async def aes_stream_api(request):
+    """Async variant of the AES server-sent event stream; each block is computed in a worker thread."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    operation = data.get('operation', 'encrypt')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+    elif len(key) != 16:
+        return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
+    try:
+        trace_blocks = parse_aes_trace(data.get('trace'))
+        mode = parse_aes_mode(data.get('mode'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if mode != 'ECB':
+        return JsonResponse({'error': 'Streaming is only available in ECB mode.'}, status=400)
+
+    # Only the result, dispatched while the rounds stream
+    dispatch_result = functools.partial(cached_dispatch_async, 'aes', operation=operation, message=message, key=key,
+                                        trace_blocks=(0, 0))
+    return sse_response(aes_events_async(dispatch_result, operation, message, key, trace_blocks))
+
+
+@csrf_exempt
+async def hmac_stream_api(request):
+    """Async variant of the HMAC server-sent event stream."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    data = _parse_body(request)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    algorithm = data.get('algorithm', 'sha256')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+
+    try:
+        served = await cached_dispatch_async('hmac', pin=NATIVE, message=message, key=key, hash_algorithm=algorithm)
+    except Exception as e:
+        return sse_response(iterate_in_thread(error_events(f'All implementations failed. Error: {str(e)}')))
+    return sse_response(iterate_in_thread(hmac_events(served, hmac_step_details(served.value['steps'], algorithm))))
@@ -0,0 +1,538 @@
+"""
+Registry of the native backends that can serve each algorithm.
+
+Every algorithm has an ordered list of implementations: the in-process C++
+library, the standalone C++ executables, the Java classes, and finally the
+Python fallback, which is always available. Instead of checking
+``os.path.exists`` (and paying an ``OSError`` for executables built for another
+platform) on every request, each native backend is probed once with a real
+smoke call. The outcome is remembered, so views go straight to the first
+implementation that works.
+
+Probes run in a background thread when the app starts (see apps.py), and
+lazily on first use for anything that has not been probed yet.
+
+Requests go through ``call_native``, ``call_executable`` (or
+``call_executable_async``) and ``call_java``, normally via dispatcher.py. These
+add a per-algorithm latency budget and a circuit breaker (see
+circuit_breaker.py) on top of the probe result.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import signal
+import subprocess
+import threading
+import time
+
+from . import native_lib
+from .circuit_breaker import OPEN, breaker_states, get_breaker, latency_budget, run_process
+from .framing import FramingError, decode_message, encode_message
+from .jvm_pool import JVMPoolError, JVMRequestError, run_java
+from .native_lib import NativeLibraryError
+
+CPP_DIR = native_lib.CPP_DIR
+
+# Backend names, in the order views try them
+NATIVE = 'native'    # libalgovault loaded with ctypes
+CPP_EXE = 'cpp_exe'  # one C++ process per request
+JAVA = 'java'        # pooled JVM worker
+PYTHON = 'python'    # Algorithm/Crypto_Fallback/Python
+
+PROBE_TIMEOUT = 10
+
+# Executable base names in Algorithm/Crypto_Native/CPP
+EXECUTABLES = {
+    'caesar': 'CaesarCipher',
+    'vigenere': 'VigenereCipher',
+    'hill': 'HillCipher',
+    'sha512': 'SHA-512',
+    'hmac': 'HMAC',
+}
+
+
+class BackendUnavailable(Exception):
+    """Raised by a probe when a backend cannot serve its algorithm."""
+
+
+def executable_path(algorithm):
+    """
+    Return the path of the C++ executable for an algorithm.
+
+    compile.sh names its output without an extension while the checked-in
+    builds end in ``.exe``; the extensionless file wins if both exist.
+    """
+    base = os.path.join(CPP_DIR, EXECUTABLES[algorithm])
+    if os.path.isfile(base):
+        return base
+    return base + '.exe'
+
+
+def framed_command(algorithm):
+    """Return the command that runs an algorithm's executable with its arguments read from stdin."""
+    return [executable_path(algorithm), '--framed']
+
+
+def framed_result(command, returncode, stdout, stderr):
+    """
+    Decode the output of an executable run with ``--framed``.
+
+    Args:
+        command (list): The command that was run
+        returncode (int): Its exit status
+        stdout (bytes): Its raw stdout, one framed message on success
+        stderr (bytes): Its raw stderr
+
+    Returns:
+        subprocess.CompletedProcess: With the text the executable would print in argv mode as stdout
+
+    Raises:
+        FramingError: The process succeeded but its stdout is not a framed message, e.g. a
+            build from before ``--framed`` existed
+    """
+    text = ''
+    if returncode == 0:
+        fields = decode_message(stdout)
+        if len(fields) != 1:
+            raise FramingError(f"Expected one output field, got {len(fields)}")
+        text = fields[0].decode('utf-8', errors='replace')
+    return subprocess.CompletedProcess(command, returncode, text, stderr.decode('utf-8', errors='replace'))
+
+
+def _expect(actual, expected):
+    if actual != expected:
+        raise BackendUnavailable(f"Smoke call returned {actual!r}, expected {expected!r}")
+
+
+def _run_executable(algorithm, args):
+    """Run a C++ executable in framed mode for a probe and return its stripped stdout."""
+    path = executable_path(algorithm)
+    if not os.path.isfile(path):
+        raise BackendUnavailable(f"{path} not found")
+    command = framed_command(algorithm)
+    try:
+        process = run_process(command, PROBE_TIMEOUT, input=encode_message(args))
+        result = framed_result(command, process.returncode, process.stdout, process.stderr)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise BackendUnavailable(f"{path} could not be run: {e}")
+    except FramingError as e:
+        raise BackendUnavailable(f"{path} does not support --framed, rebuild it with compile.sh: {e}")
+    if result.returncode != 0:
+        raise BackendUnavailable(f"{path} exited with {result.returncode}: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def _run_java(class_name, args):
+    try:
+        return run_java(class_name, args, timeout=PROBE_TIMEOUT).strip()
+    except JVMPoolError as e:
+        raise BackendUnavailable(str(e))
+
+
+# Known answers shared by the probes
+SHA512_ABC = hashlib.sha512(b'abc').hexdigest()
+HMAC_ABC = hmac.new(b'key', b'abc', hashlib.sha256).hexdigest()
+
+
+def _probe_native_caesar():
+    _expect(native_lib.caesar('encrypt', 'ABC xyz', 1), 'BCD yza')
+
+
+def _probe_native_vigenere():
+    _expect(native_lib.vigenere('encrypt', 'ATTACKATDAWN', 'LEMON'), 'LXFOPVEFRNHR')
+
+
+def _probe_native_hill():
+    _expect(native_lib.hill_vector('encrypt', 2, [3, 3, 2, 5], [7, 8]), [19, 2])
+
+
+def _probe_native_sha512():
+    _expect(native_lib.sha512('abc'), SHA512_ABC)
+
+
+def _probe_native_hmac():
+    _expect(native_lib.hmac('abc', 'key', 'SHA256')['hmac'], HMAC_ABC)
+
+
+def _probe_exe_caesar():
+    _expect(_run_executable('caesar', ['ABC xyz', '1', 'encrypt']), 'BCD yza')
+
+
+def _probe_exe_vigenere():
+    _expect(_run_executable('vigenere', ['encrypt', 'ATTACKATDAWN', 'LEMON']), 'LXFOPVEFRNHR')
+
+
+def _probe_exe_hill():
+    _expect(_run_executable('hill', ['encrypt', '2', '3', '3', '2', '5', '7', '8']), '19 2')
+
+
+def _probe_exe_sha512():
+    _expect(_run_executable('sha512', ['abc']), SHA512_ABC)
+
+
+def _probe_exe_hmac():
+    if HMAC_ABC not in _run_executable('hmac', ['abc', 'key', 'SHA256']):
+        raise BackendUnavailable("HMAC executable returned an unexpected result")
+
+
+def _probe_java_aes():
+    if not _run_java('AES', ['abc', '0123456789abcdef', 'encrypt']):
+        raise BackendUnavailable("AES returned no output")
+
+
+def _probe_java_des():
+    if not _run_java('DES', ['encrypt', 'secret12', 'abc']):
+        raise BackendUnavailable("DES returned no output")
+
+
+def _probe_java_md5():
+    _expect(_run_java('MD5', ['abc', 'hex']), '900150983cd24fb0d6963f7d28e17f72')
+
+
+def _probe_java_diffie_hellman():
+    if not _run_java('DiffieHellman', ['23', '5', '6', '15']):
+        raise BackendUnavailable("DiffieHellman returned no output")
+
+
+# Native backends per algorithm, in preference order. The Python fallback
+# always comes last and is not probed.
+BACKENDS = {
+    'caesar': [(NATIVE, _probe_native_caesar), (CPP_EXE, _probe_exe_caesar)],
+    'vigenere': [(NATIVE, _probe_native_vigenere), (CPP_EXE, _probe_exe_vigenere)],
+    'hill': [(NATIVE, _probe_native_hill), (CPP_EXE, _probe_exe_hill)],
+    'sha512': [(NATIVE, _probe_native_sha512), (CPP_EXE, _probe_exe_sha512)],
+    'hmac': [(NATIVE, _probe_native_hmac), (CPP_EXE, _probe_exe_hmac)],
+    'aes': [(JAVA, _probe_java_aes)],
+    'des': [(JAVA, _probe_java_des)],
+    'md5': [(JAVA, _probe_java_md5)],
+    'diffie_hellman': [(JAVA, _probe_java_diffie_hellman)],
+}
+
+
+class BackendRegistry:
+    """
+    Probe results for every (algorithm, backend) pair.
+
+    A backend that fails its probe, or later fails at runtime through
+    ``mark_unusable``, stays unusable until ``refresh()`` is called.
+    """
+
+    def __init__(self, backends=BACKENDS):
+        self.backends = backends
+        self._status = {}
+        self._lock = threading.Lock()
+        self._probe_locks = {}
+
+    def _probe_lock(self, key):
+        with self._lock:
+            return self._probe_locks.setdefault(key, threading.Lock())
+
+    def probe(self, algorithm, backend):
+        """
+        Run the smoke call for one backend and record the outcome.
+
+        Returns:
+            bool: True if the backend is usable
+        """
+        probes = dict(self.backends.get(algorithm, []))
+        if backend == PYTHON:
+            return True
+        if backend not in probes:
+            return False
+
+        key = (algorithm, backend)
+        with self._probe_lock(key):
+            # Another thread may have finished the probe while we waited
+            if key in self._status:
+                return self._status[key]['usable']
+
+            started = time.monotonic()
+            try:
+                probes[backend]()
+                usable, reason = True, None
+            except (BackendUnavailable, NativeLibraryError, OSError) as e:
+                usable, reason = False, str(e)
+            elapsed = time.monotonic() - started
+
+            with self._lock:
+                self._status[key] = {'usable': usable, 'reason': reason, 'probe_seconds': round(elapsed, 4)}
+            if not usable:
+                print(f"Backend {backend} disabled for {algorithm}: {reason}")
+            return usable
+
+    def is_usable(self, algorithm, backend):
+        """Return True if the backend passed its probe, probing it on first use."""
+        status = self._status.get((algorithm, backend))
+        if status is not None:
+            return status['usable']
+        return self.probe(algorithm, backend)
+
+    def known(self, algorithm, backend):
+        """Return the recorded probe result without probing: True, False, or None if not probed yet."""
+        status = self._status.get((algorithm, backend))
+        return None if status is None else status['usable']
+
+    def mark_unusable(self, algorithm, backend, reason):
+        """Remember a runtime failure so later requests skip the backend."""
+        with self._lock:
+            self._status[(algorithm, backend)] = {'usable': False, 'reason': str(reason), 'probe_seconds': None}
+        print(f"Backend {backend} disabled for {algorithm}: {reason}")
+
+    def available(self, algorithm):
+        """Return the usable backends with a closed breaker, in preference order, ending with Python."""
+        names = [name for name, _ in self.backends.get(algorithm, [])
+                 if self.is_usable(algorithm, name) and get_breaker(algorithm, name).state != OPEN]
+        return names + [PYTHON]
+
+    def probe_all(self, skip=()):
+        """Probe every registered backend except those named in ``skip``."""
+        for algorithm, backends in self.backends.items():
+            for name, _ in backends:
+                if name not in skip:
+                    self.is_usable(algorithm, name)
+
+    def status(self):
+        """Return the recorded probe results keyed by algorithm, then backend."""
+        with self._lock:
+            report = {}
+            for (algorithm, backend), status in self._status.items():
+                report.setdefault(algorithm, {})[backend] = dict(status)
+        return report
+
+    def refresh(self):
+        """Forget all results so every backend is probed again."""
+        with self._lock:
+            self._status.clear()
+
+
+_registry = BackendRegistry()
+
+
+def get_registry():
+    """Return the process-wide backend registry."""
+    return _registry
+
+
+def is_usable(algorithm, backend):
+    """Shortcut for ``get_registry().is_usable(...)``."""
+    return _registry.is_usable(algorithm, backend)
+
+
+def mark_unusable(algorithm, backend, reason):
+    """Shortcut for ``get_registry().mark_unusable(...)``."""
+    _registry.mark_unusable(algorithm, backend, reason)
+
+
+def call_native(algorithm, func, *args):
+    """
+    Call a native_lib function for an algorithm under its breaker and latency budget.
+
+    An in-process call cannot be interrupted, so a call that overruns its
+    budget still returns its result but counts as a failure; enough of them
+    open the breaker and route requests to the next backend.
+
+    Raises:
+        NativeLibraryError: The library is unusable, the breaker is open or the call failed
+    """
+    if not _registry.is_usable(algorithm, NATIVE):
+        raise NativeLibraryError(f"Native library unavailable for {algorithm}")
+    breaker = get_breaker(algorithm, NATIVE)
+    if not breaker.allow():
+        raise NativeLibraryError(f"Circuit open for {algorithm}/{NATIVE}")
+
+    budget = latency_budget(algorithm)
+    started = time.monotonic()
+    try:
+        result = func(*args)
+    except Exception:
+        # Rejected input; the library itself answered
+        breaker.record_success()
+        raise
+    elapsed = time.monotonic() - started
+    if elapsed > budget:
+        breaker.record_failure(f"Call took {elapsed:.3f}s, budget is {budget}s")
+    else:
+        breaker.record_success()
+    return result
+
+
+def call_executable(algorithm, args):
+    """
+    Run the C++ executable for an algorithm under its breaker and latency budget.
+
+    The arguments are sent as one framed message on stdin (see framing.py), so
+    they are not limited by ARG_MAX and do not show up in the process list.
+
+    Args:
+        algorithm (str): Algorithm name
+        args (list): Positional arguments, in command line order
+
+    Returns:
+        subprocess.CompletedProcess: The finished process with text stdout; a non-zero exit code
+            is left to the caller
+
+    Raises:
+        BackendUnavailable: The executable is unusable, the breaker is open, it could not be
+            started, or it was killed for exceeding its budget
+    """
+    if not _registry.is_usable(algorithm, CPP_EXE):
+        raise BackendUnavailable(f"C++ executable unavailable for {algorithm}")
+    breaker = get_breaker(algorithm, CPP_EXE)
+    if not breaker.allow():
+        raise BackendUnavailable(f"Circuit open for {algorithm}/{CPP_EXE}")
+
+    budget = latency_budget(algorithm)
+    command = framed_command(algorithm)
+    try:
+        process = run_process(command, budget, input=encode_message(args))
+    except subprocess.TimeoutExpired:
+        reason = f"Killed after exceeding its {budget}s budget"
+        breaker.record_failure(reason)
+        raise BackendUnavailable(reason)
+    except OSError as e:
+        breaker.record_failure(e)
+        _registry.mark_unusable(algorithm, CPP_EXE, e)
+        raise BackendUnavailable(str(e))
+
+    if process.returncode < 0:
+        # Killed by a signal, i.e. crashed rather than rejecting the input
+        breaker.record_failure(f"Terminated by signal {-process.returncode}")
+    else:
+        breaker.record_success()
+    return _framed_or_unusable(algorithm, command, process.returncode, process.stdout, process.stderr)
+
+
+def _framed_or_unusable(algorithm, command, returncode, stdout, stderr):
+    try:
+        return framed_result(command, returncode, stdout, stderr)
+    except FramingError as e:
+        reason = f"Unframed output, rebuild with compile.sh: {e}"
+        _registry.mark_unusable(algorithm, CPP_EXE, reason)
+        raise BackendUnavailable(reason)
+
+
+async def call_executable_async(algorithm, args):
+    """
+    Run the C++ executable for an algorithm without blocking the event loop.
+
+    Mirrors ``call_executable``: same registry check, breaker and latency
+    budget, and the whole process group is killed on timeout or cancellation.
+
+    Returns:
+        subprocess.CompletedProcess: The finished process with text stdout and stderr
+
+    Raises:
+        BackendUnavailable: The executable is unusable, the breaker is open, it could not be
+            started, or it was killed for exceeding its budget
+    """
+    usable = _registry.known(algorithm, CPP_EXE)
+    if usable is None:
+        usable = await asyncio.to_thread(_registry.is_usable, algorithm, CPP_EXE)
+    if not usable:
+        raise BackendUnavailable(f"C++ executable unavailable for {algorithm}")
+    breaker = get_breaker(algorithm, CPP_EXE)
+    if not breaker.allow():
+        raise BackendUnavailable(f"Circuit open for {algorithm}/{CPP_EXE}")
+
+    budget = latency_budget(algorithm)
+    command = framed_command(algorithm)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+    except OSError as e:
+        breaker.record_failure(e)
+        _registry.mark_unusable(algorithm, CPP_EXE, e)
+        raise BackendUnavailable(str(e))
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(encode_message(args)), timeout=budget)
+    except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+        await process.wait()
+        if isinstance(e, asyncio.CancelledError):
+            # The client went away; free the trial slot without blaming the backend
+            breaker.record_success()
+            raise
+        reason = f"Killed after exceeding its {budget}s budget"
+        breaker.record_failure(reason)
+        raise BackendUnavailable(reason)
+
+    if process.returncode < 0:
+        # Killed by a signal, i.e. crashed rather than rejecting the input
+        breaker.record_failure(f"Terminated by signal {-process.returncode}")
+    else:
+        breaker.record_success()
+    return _framed_or_unusable(algorithm, command, process.returncode, stdout, stderr)
+
+
+def call_java(algorithm, class_name, args):
+    """
+    Run a Java class on the JVM pool under the algorithm's breaker and latency budget.
+
+    A worker that exceeds the budget is killed with its process group and
+    replaced by the pool.
+
+    Raises:
+        JVMRequestError: The Java code rejected the input
+        JVMPoolError: The Java backend is unusable, the breaker is open or no worker answered in time
+    """
+    if not _registry.is_usable(algorithm, JAVA):
+        raise JVMPoolError(f"Java backend unavailable for {algorithm}")
+    breaker = get_breaker(algorithm, JAVA)
+    if not breaker.allow():
+        raise JVMPoolError(f"Circuit open for {algorithm}/{JAVA}")
+
+    try:
+        output = run_java(class_name, args, timeout=latency_budget(algorithm))
+    except JVMRequestError:
+        breaker.record_success()
+        raise
+    except JVMPoolError as e:
+        breaker.record_failure(e)
+        raise
+    breaker.record_success()
+    return output
+
+
+def status_report():
+    """
+    Describe which implementation currently serves each algorithm.
+
+    Backends that have not been probed yet are reported with ``usable: None``
+    and are not probed by this call. The report is ``degraded`` when an
+    algorithm has a native backend registered but is being served by Python,
+    or when any breaker is not closed.
+    """
+    probes = _registry.status()
+    breakers = breaker_states()
+    algorithms = {}
+    degraded = False
+    for algorithm, registered in _registry.backends.items():
+        entries = {}
+        serving = PYTHON
+        for name, _ in registered:
+            probe = probes.get(algorithm, {}).get(name, {})
+            breaker = breakers.get(algorithm, {}).get(name, {'state': 'closed'})
+            entries[name] = {
+                'usable': probe.get('usable'),
+                'reason': probe.get('reason'),
+                'breaker': breaker,
+            }
+            if breaker['state'] != 'closed':
+                degraded = True
+            if serving == PYTHON and probe.get('usable') and breaker['state'] != OPEN:
+                serving = name
+        if registered and serving == PYTHON:
+            degraded = True
+        algorithms[algorithm] = {'serving': serving, 'backends': entries}
+    return {'degraded': degraded, 'algorithms': algorithms}
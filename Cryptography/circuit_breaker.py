@@ -0,0 +1,181 @@
+"""
+Circuit breakers and latency budgets for the native backends.
+
+Each (algorithm, backend) pair gets its own breaker. After
+``CIRCUIT_BREAKER_FAILURE_THRESHOLD`` consecutive failures or budget overruns
+the breaker opens, and requests go straight to the Python fallback for
+``CIRCUIT_BREAKER_COOLDOWN`` seconds. After that a single trial call is let
+through (half-open); it closes the breaker on success and re-opens it on
+failure.
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+
+from django.conf import settings
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30
+DEFAULT_LATENCY_BUDGET = 5
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one backend."""
+
+    def __init__(self, name, failure_threshold=DEFAULT_FAILURE_THRESHOLD, cooldown=DEFAULT_COOLDOWN):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = float(cooldown)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._last_error = None
+        self._total_failures = 0
+        self._times_opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self):
+        """
+        Return True if a call may go to the backend.
+
+        While half-open only one trial call is allowed at a time.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, reason):
+        with self._lock:
+            self._failures += 1
+            self._total_failures += 1
+            self._last_error = str(reason)
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._times_opened += 1
+                    print(f"Circuit breaker {self.name} opened: {reason}")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        """Return the breaker state as a JSON-serializable dict."""
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == OPEN:
+                retry_in = round(max(0.0, self.cooldown - (time.monotonic() - self._opened_at)), 1)
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'total_failures': self._total_failures,
+                'times_opened': self._times_opened,
+                'retry_in_seconds': retry_in,
+                'last_error': self._last_error,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(algorithm, backend):
+    """Return the breaker for an (algorithm, backend) pair, creating it on first use."""
+    key = (algorithm, backend)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    f"{algorithm}/{backend}",
+                    failure_threshold=getattr(settings, 'CIRCUIT_BREAKER_FAILURE_THRESHOLD', DEFAULT_FAILURE_THRESHOLD),
+                    cooldown=getattr(settings, 'CIRCUIT_BREAKER_COOLDOWN', DEFAULT_COOLDOWN),
+                )
+                _breakers[key] = breaker
+    return breaker
+
+
+def breaker_states():
+    """Return every breaker snapshot keyed by algorithm, then backend."""
+    with _breakers_lock:
+        items = list(_breakers.items())
+    report = {}
+    for (algorithm, backend), breaker in items:
+        report.setdefault(algorithm, {})[backend] = breaker.snapshot()
+    return report
+
+
+def latency_budget(algorithm):
+    """Return the latency budget in seconds for one call to a native backend of an algorithm."""
+    budgets = getattr(settings, 'NATIVE_LATENCY_BUDGETS', {})
+    return float(budgets.get(algorithm, getattr(settings, 'NATIVE_LATENCY_BUDGET', DEFAULT_LATENCY_BUDGET)))
+
+
+def run_process(command, timeout, input=None):
+    """
+    Run a command in its own process group with a hard deadline.
+
+    On timeout the whole process group is killed, so nothing the command
+    started keeps running after the request has moved on.
+
+    Args:
+        command (list): Program and arguments
+        timeout (float): Seconds before the process group is killed
+        input (bytes): Written to the process's stdin, which is then closed
+
+    Returns:
+        subprocess.CompletedProcess: With bytes stdout and stderr
+
+    Raises:
+        subprocess.TimeoutExpired: The deadline passed and the group was killed
+        OSError: The command could not be started
+    """
+    process = subprocess.Popen(command, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+    try:
+        stdout, stderr = process.communicate(input=input, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            process.kill()
+        process.communicate()
+        raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
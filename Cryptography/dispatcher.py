@@ -0,0 +1,693 @@
+"""
+Unified dispatch of algorithm calls to their backends.
+
+Every algorithm registers its backends in preference order: the in-process C++
+library, the C++ executable or the pooled JVM, and finally the Python fallback.
+``dispatch()`` tries them in turn, skipping backends that failed their probe or
+whose circuit breaker is open, and returns a ``DispatchResult`` naming the
+backend that served the call and how long it took.
+
+With ADAPTIVE_BACKEND_SELECTION on, the backend measured fastest for inputs of
+that size is tried first instead (see adaptive.py); callers that need one
+backend's output pass ``pin``. Only operations that give the same output on
+every backend are reordered: the others, such as the brute-force and frequency
+reports, are pinned to one backend with ``pin_operation``.
+
+Wall time and failures are recorded per (algorithm, backend) pair and reported
+by the backend status API, so it is visible which implementation is actually
+serving requests and what it costs.
+
+``dispatch_async()`` walks the same chains for the async views without
+blocking the event loop (see async_views.py).
+"""
+
+import asyncio
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+from . import backends, native_lib
+from .adaptive import AdaptiveSelector, input_size, size_bucket
+from .backends import CPP_EXE, JAVA, NATIVE, PYTHON, BackendUnavailable
+from .circuit_breaker import OPEN, get_breaker
+from .jvm_pool import JVMPoolError
+from .native_lib import NativeLibraryError
+
+# Same fallback location views.py puts on sys.path
+algorithm_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Fallback', 'Python')
+if algorithm_path not in sys.path:
+    sys.path.append(algorithm_path)
+
+from CaesarCipher.CaesarCipher import caesar_auto_crack, caesar_cipher_fallback, format_crack_report
+from VigenereCipher.VigenereCipher import format_crack_report as format_vigenere_crack_report
+from VigenereCipher.VigenereCipher import vigenere_auto_crack, vigenere_cipher_fallback
+from HillCipher.HillCipher import hill_cipher_fallback
+from DES.DES import des_fallback
+from SHA512.SHA512 import sha512_hash
+from AES.AES import aes_block_trace, aes_fallback
+from AES.AESModes import aes_mode_fallback
+from DiffieHellman.DiffieHellman import diffie_hellman_fallback
+from MD5.MD5 import MD5Hash
+from HMAC.HMAC import HMACHash
+from KeyCache import key_cache_stats
+
+# Names shown to users for the backend that served a request
+BACKEND_LABELS = {
+    NATIVE: 'C++ Native Library',
+    CPP_EXE: 'C++ Native Implementation',
+    JAVA: 'Java',
+    PYTHON: 'Python (Fallback)',
+}
+
+DEFAULT_CONCURRENCY = {
+    NATIVE: 32,
+    CPP_EXE: 256,
+    JAVA: 2,
+    PYTHON: 32,
+}
+
+
+class Fallthrough(Exception):
+    """Raised by a handler when its backend answered but the answer cannot be used."""
+
+
+# Errors that mean "try the next backend" rather than a bug in the handler
+FALLTHROUGH_ERRORS = (Fallthrough, BackendUnavailable, NativeLibraryError, JVMPoolError)
+
+
+class DispatchResult:
+    """
+    Outcome of one dispatched call.
+
+    Attributes:
+        algorithm (str): Algorithm name
+        value: Whatever the serving handler returned
+        backend (str): Name of the backend that served the call
+        elapsed (float): Wall time of the whole call in seconds, including failed attempts
+        attempts (list): One dict per backend tried, with 'backend', 'seconds' and 'error'
+        cached (bool): True if the value came from the result cache (see result_cache.py);
+            ``backend`` is then the backend that originally computed it
+    """
+
+    def __init__(self, algorithm, value, backend, elapsed, attempts, cached=False):
+        self.algorithm = algorithm
+        self.value = value
+        self.backend = backend
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.cached = cached
+
+    @property
+    def label(self):
+        """Human-readable name of the serving backend."""
+        return BACKEND_LABELS.get(self.backend, self.backend)
+
+    @property
+    def elapsed_ms(self):
+        return round(self.elapsed * 1000, 3)
+
+    def __repr__(self):
+        source = 'cache' if self.cached else self.backend
+        return f"<DispatchResult {self.algorithm} via {source} in {self.elapsed_ms}ms>"
+
+
+# Semaphores are bound to the event loop that first waits on them
+_semaphores = weakref.WeakKeyDictionary()
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _semaphore(backend):
+    """Return the semaphore limiting in-flight calls to a backend on the running event loop."""
+    loop = asyncio.get_running_loop()
+    loop_semaphores = _semaphores.setdefault(loop, {})
+    if backend not in loop_semaphores:
+        limits = getattr(settings, 'ASYNC_BACKEND_CONCURRENCY', {})
+        loop_semaphores[backend] = asyncio.Semaphore(limits.get(backend, DEFAULT_CONCURRENCY[backend]))
+    return loop_semaphores[backend]
+
+
+def _get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(max_workers=getattr(settings, 'ASYNC_FALLBACK_PROCESSES', None) or None)
+    return _process_pool
+
+
+class FunctionBackend:
+    """
+    A backend served by calling a Python function with the dispatch parameters.
+
+    Async dispatch runs the function in a thread, or in the process pool when it
+    is CPU-bound Python that would otherwise hold the GIL against the event loop.
+    """
+
+    def __init__(self, name, func, cpu_bound=False):
+        self.name = name
+        self.func = func
+        self.cpu_bound = cpu_bound
+
+    def run(self, algorithm, params):
+        return self.func(**params)
+
+    async def run_async(self, algorithm, params):
+        if self.cpu_bound:
+            return await asyncio.get_running_loop().run_in_executor(
+                _get_process_pool(), functools.partial(self.func, **params))
+        return await asyncio.to_thread(self.func, **params)
+
+
+class ExecutableBackend:
+    """
+    A backend served by the C++ executable of the algorithm.
+
+    Args:
+        build_args (callable): Maps the dispatch parameters to the command line arguments
+        parse (callable): Maps the finished process and the dispatch parameters to the result
+    """
+
+    name = CPP_EXE
+
+    def __init__(self, build_args, parse):
+        self.build_args = build_args
+        self.parse = parse
+
+    def run(self, algorithm, params):
+        process = backends.call_executable(algorithm, self.build_args(**params))
+        return self.parse(process, **params)
+
+    async def run_async(self, algorithm, params):
+        process = await backends.call_executable_async(algorithm, self.build_args(**params))
+        return self.parse(process, **params)
+
+
+class Dispatcher:
+    """
+    Ordered backends per algorithm, with wall-time statistics per backend.
+
+    Args:
+        selector (AdaptiveSelector): Reorders each chain by measured latency; None keeps the registered order
+    """
+
+    def __init__(self, selector=None):
+        self.selector = selector
+        self._chains = {}
+        self._pinned = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+
+    def register(self, algorithm, backend):
+        """Append a backend to the chain of an algorithm; register the Python fallback last."""
+        self._chains.setdefault(algorithm, []).append(backend)
+
+    def pin_operation(self, algorithm, operation, backend):
+        """Always try one backend first for an operation whose output differs between backends."""
+        if backend not in self.backends(algorithm):
+            raise ValueError(f"{backend} is not a backend of {algorithm}")
+        self._pinned[(algorithm, operation)] = backend
+
+    def pinned_backend(self, algorithm, params):
+        """Return the backend the operation in ``params`` is pinned to, or None if any backend may serve it."""
+        return self._pinned.get((algorithm, params.get('operation')))
+
+    def backends(self, algorithm):
+        """Return the registered backend names of an algorithm, in preference order."""
+        return [backend.name for backend in self._chain(algorithm)]
+
+    def get_backend(self, algorithm, name):
+        """Return one registered backend of an algorithm, e.g. to benchmark it on its own."""
+        for backend in self._chain(algorithm):
+            if backend.name == name:
+                return backend
+        raise ValueError(f"{name} is not a backend of {algorithm}")
+
+    def _chain(self, algorithm):
+        try:
+            return self._chains[algorithm]
+        except KeyError:
+            raise ValueError(f"No backends registered for {algorithm}")
+
+    def _record(self, algorithm, backend, bucket, seconds, failed):
+        with self._lock:
+            stats = self._timings.get((algorithm, backend))
+            if stats is None:
+                stats = self._timings[(algorithm, backend)] = {
+                    'calls': 0, 'failures': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'last_seconds': None,
+                }
+            stats['calls'] += 1
+            if failed:
+                stats['failures'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['last_seconds'] = seconds
+        if self.selector is not None:
+            self.selector.record(algorithm, backend, bucket, seconds, failed)
+
+    def _is_open(self, algorithm, backend):
+        return get_breaker(algorithm, backend.name).state == OPEN
+
+    def _order(self, algorithm, bucket, pin):
+        """
+        Return the backends of an algorithm in the order to try them for one call.
+
+        A pinned backend goes first with the rest in registered order behind it,
+        so a call still succeeds if the pinned backend is down. Otherwise the
+        selector picks the first backend among those not known to be unusable.
+        """
+        chain = self._chain(algorithm)
+        if pin is not None:
+            if pin not in self.backends(algorithm):
+                raise ValueError(f"{pin} is not a backend of {algorithm}")
+            first = pin
+        elif self.selector is not None:
+            registry = backends.get_registry()
+            candidates = [backend.name for backend in chain
+                          if backend.name == PYTHON or (registry.known(algorithm, backend.name) is not False
+                                                        and not self._is_open(algorithm, backend))]
+            first = self.selector.choose(algorithm, candidates, bucket)
+        else:
+            return chain
+        return [backend for backend in chain if backend.name == first] + \
+               [backend for backend in chain if backend.name != first]
+
+    def _attempt_failed(self, algorithm, backend, bucket, seconds, error, attempts):
+        self._record(algorithm, backend.name, bucket, seconds, failed=True)
+        attempts.append({'backend': backend.name, 'seconds': round(seconds, 6), 'error': str(error)})
+        if backend.name != PYTHON and not isinstance(error, FALLTHROUGH_ERRORS):
+            print(f"{algorithm}/{backend.name} failed, trying the next backend: {error}")
+
+    def _served(self, algorithm, backend, bucket, value, seconds, started, attempts):
+        self._record(algorithm, backend.name, bucket, seconds, failed=False)
+        attempts.append({'backend': backend.name, 'seconds': round(seconds, 6), 'error': None})
+        return DispatchResult(algorithm, value, backend.name, time.perf_counter() - started, attempts)
+
+    def dispatch(self, algorithm, pin=None, **params):
+        """
+        Run an algorithm on the first backend that can serve it.
+
+        Args:
+            algorithm (str): Registered algorithm name
+            pin (str): Backend to try first regardless of measured latency, e.g. for
+                visualizations that need the step output of that backend; defaults to
+                the backend the operation is pinned to, if any
+            **params: Keyword arguments passed to the backend handlers
+
+        Returns:
+            DispatchResult: The value and the backend that produced it
+
+        Raises:
+            Exception: What the last backend tried raised, usually the Python fallback
+        """
+        bucket = size_bucket(input_size(params))
+        started = time.perf_counter()
+        attempts = []
+        error = None
+        for backend in self._order(algorithm, bucket, pin or self.pinned_backend(algorithm, params)):
+            if backend.name != PYTHON and (not backends.is_usable(algorithm, backend.name)
+                                           or self._is_open(algorithm, backend)):
+                continue
+            attempt_started = time.perf_counter()
+            try:
+                value = backend.run(algorithm, params)
+            except Exception as e:
+                error = e
+                self._attempt_failed(algorithm, backend, bucket, time.perf_counter() - attempt_started, e, attempts)
+                continue
+            return self._served(algorithm, backend, bucket, value, time.perf_counter() - attempt_started,
+                                started, attempts)
+        raise error or BackendUnavailable(f"No backend could serve {algorithm}")
+
+    async def dispatch_async(self, algorithm, pin=None, **params):
+        """
+        Async version of ``dispatch`` for the ASGI views.
+
+        Each backend call holds that backend's semaphore (ASYNC_BACKEND_CONCURRENCY),
+        and the recorded time excludes the wait for it.
+        """
+        bucket = size_bucket(input_size(params))
+        started = time.perf_counter()
+        attempts = []
+        error = None
+        for backend in self._order(algorithm, bucket, pin or self.pinned_backend(algorithm, params)):
+            if backend.name != PYTHON:
+                usable = backends.get_registry().known(algorithm, backend.name)
+                if usable is None:
+                    # Not probed yet; the probe blocks, so keep it off the event loop
+                    usable = await asyncio.to_thread(backends.is_usable, algorithm, backend.name)
+                if not usable or self._is_open(algorithm, backend):
+                    continue
+            async with _semaphore(backend.name):
+                attempt_started = time.perf_counter()
+                try:
+                    value = await backend.run_async(algorithm, params)
+                except Exception as e:
+                    error = e
+                    self._attempt_failed(algorithm, backend, bucket, time.perf_counter() - attempt_started, e, attempts)
+                    continue
+            return self._served(algorithm, backend, bucket, value, time.perf_counter() - attempt_started,
+                                started, attempts)
+        raise error or BackendUnavailable(f"No backend could serve {algorithm}")
+
+    def timings(self):
+        """Return the recorded statistics keyed by algorithm, then backend."""
+        with self._lock:
+            items = [(key, dict(stats)) for key, stats in self._timings.items()]
+        report = {}
+        for (algorithm, backend), stats in items:
+            stats['mean_ms'] = round(stats['total_seconds'] / stats['calls'] * 1000, 3)
+            stats['max_ms'] = round(stats.pop('max_seconds') * 1000, 3)
+            stats['last_ms'] = round(stats.pop('last_seconds') * 1000, 3)
+            stats['total_seconds'] = round(stats['total_seconds'], 6)
+            report.setdefault(algorithm, {})[backend] = stats
+        return report
+
+    def reset_timings(self):
+        with self._lock:
+            self._timings.clear()
+
+
+def _stdout(process, **params):
+    """Return the stdout of a finished executable without its trailing newline, or fall through on a non-zero exit."""
+    if process.returncode != 0:
+        raise Fallthrough(f"Exited with {process.returncode}: {process.stderr.strip()}")
+    # Only the newline the executable adds is removed; any other leading or
+    # trailing whitespace belongs to the result, e.g. a Caesar message
+    return process.stdout.removesuffix('\n')
+
+
+# --- Caesar ---
+
+def _native_caesar(operation, text, shift):
+    return backends.call_native('caesar', native_lib.caesar, operation, text, shift)
+
+
+def _caesar_args(operation, text, shift):
+    # The executable takes <message> <shift> <operation>
+    return [text, shift, operation]
+
+
+def _python_caesar(operation, text, shift):
+    return caesar_cipher_fallback(text, shift, operation)
+
+
+def _python_caesar_crack(text, top_k=3):
+    return caesar_auto_crack(text, top_k)
+
+
+# --- Vigenere ---
+
+def _native_vigenere(operation, text, key):
+    return backends.call_native('vigenere', native_lib.vigenere, operation, text, key)
+
+
+def _vigenere_args(operation, text, key):
+    return [operation, text, key]
+
+
+def _python_vigenere(operation, text, key):
+    return vigenere_cipher_fallback(text, key, operation)
+
+
+def _python_vigenere_crack(text, top_k=3):
+    return vigenere_auto_crack(text, top_k=top_k)
+
+
+# --- Hill ---
+# Handlers return (result_vector, result_text); exactly one of them is None,
+# depending on whether input_text was given.
+
+def hill_key_word_to_matrix(key_word, dimension):
+    """Same key word rules as HillCipher::keyWordToMatrix: letters only, padded with X."""
+    needed = dimension * dimension
+    key_matrix_flat = [ord(c) - ord('A') for c in key_word.upper() if 'A' <= c <= 'Z']
+    return (key_matrix_flat + [ord('X') - ord('A')] * needed)[:needed]
+
+
+def _native_hill(operation, dimension, key_matrix_flat, input_vector_flat=None, input_text=None):
+    if input_text:
+        return None, backends.call_native('hill', native_lib.hill_text, operation, dimension, key_matrix_flat, input_text)
+    return backends.call_native('hill', native_lib.hill_vector, operation, dimension, key_matrix_flat, input_vector_flat), None
+
+
+def _hill_args(operation, dimension, key_matrix_flat, input_vector_flat=None, input_text=None):
+    args = [operation, dimension] + list(key_matrix_flat)
+    return args + (['--text', input_text] if input_text else list(input_vector_flat))
+
+
+def _parse_hill(process, input_text=None, **params):
+    output = _stdout(process)
+    if input_text:
+        return None, output
+    try:
+        return [int(value) for value in output.split()], None
+    except ValueError:
+        raise Fallthrough(f"Unexpected output: {output!r}")
+
+
+def _python_hill(operation, dimension, key_matrix_flat, input_vector_flat=None, input_text=None):
+    if input_text:
+        input_vector_flat = [ord(c) - ord('A') for c in input_text.upper() if 'A' <= c <= 'Z']
+
+    result_vector = hill_cipher_fallback(operation, dimension, key_matrix_flat, input_vector_flat)
+    if not input_text:
+        return result_vector, None
+
+    result_text = ''.join(chr(n + ord('A')) for n in result_vector)
+    if operation == 'decrypt':
+        # Remove trailing X padding added during encryption
+        original_length = len(input_vector_flat)
+        while result_text and result_text[-1] == 'X' and len(result_text) > original_length:
+            result_text = result_text[:-1]
+    return None, result_text
+
+
+# --- SHA-512 ---
+
+def _native_sha512(message):
+    return backends.call_native('sha512', native_lib.sha512, message)
+
+
+def _sha512_args(message):
+    return [message]
+
+
+def _python_sha512(message):
+    return sha512_hash(message)
+
+
+# --- HMAC ---
+# Handlers return {'hmac': lowercase hex digest, 'steps': step details or None}.
+
+def _native_hmac(message, key, hash_algorithm):
+    details = backends.call_native('hmac', native_lib.hmac, message, key, hash_algorithm.upper())
+    return {'hmac': details['hmac'].lower(), 'steps': details}
+
+
+def _hmac_args(message, key, hash_algorithm):
+    return [message, key, hash_algorithm.upper()]
+
+
+def _parse_hmac(process, **params):
+    try:
+        result = json.loads(_stdout(process))
+    except json.JSONDecodeError as e:
+        raise Fallthrough(f"Invalid JSON from HMAC: {e}")
+    if not result.get('success', False):
+        raise Fallthrough(result.get('error', 'Unknown error'))
+    return {'hmac': result['hmac'].lower(), 'steps': result.get('steps')}
+
+
+def _python_hmac(message, key, hash_algorithm):
+    return {'hmac': HMACHash.generate_hmac(message, key, hash_algorithm.lower(), 'hex'), 'steps': None}
+
+
+# --- DES ---
+
+def _java_des(operation, key, message):
+    return backends.call_java('des', 'DES', [operation, key, message]).strip()
+
+
+def _python_des(operation, key, message):
+    return des_fallback(operation, key, message)
+
+
+# --- AES ---
+# Handlers return the visualization dict with 'finalResult', 'blocks' and
+# 'totalBlocks'. ``trace_blocks`` is a (start, stop) range of 0-based blocks to
+# keep in 'blocks', or None for all of them.
+
+def _java_aes(operation, message, key, trace_blocks=None):
+    output = backends.call_java('aes', 'AES', [message, key, operation]).strip()
+    if not output:
+        raise Fallthrough("Java AES returned no output")
+    try:
+        output_data = json.loads(output)
+    except json.JSONDecodeError as e:
+        raise Fallthrough(f"Invalid JSON from Java AES: {e}")
+    # The Java worker always traces every block; keep only the requested ones
+    blocks = output_data.get('blocks') or []
+    output_data.setdefault('totalBlocks', len(blocks))
+    if trace_blocks is not None:
+        output_data['blocks'] = blocks[trace_blocks[0]:trace_blocks[1]]
+    return output_data
+
+
+def _python_aes(operation, message, key, trace_blocks=None):
+    output_data = aes_fallback(operation, message, key, trace_blocks)
+    if not output_data or output_data.get('finalResult', '').startswith('Error'):
+        raise ValueError((output_data or {}).get('finalResult') or "Python AES returned no output")
+    return output_data
+
+
+def _python_aes_block_trace(operation, message, key, block):
+    return aes_block_trace(operation, message, key, block)
+
+
+def _python_aes_mode(operation, mode, message, key, iv=None, trace_blocks=None):
+    output_data = aes_mode_fallback(operation, mode, message, key, iv, trace_blocks)
+    if output_data.get('finalResult', '').startswith('Error'):
+        raise ValueError(output_data['finalResult'])
+    return output_data
+
+
+# --- MD5 ---
+
+def _java_md5(message, output_format):
+    return backends.call_java('md5', 'MD5', [message, output_format]).strip()
+
+
+def _python_md5(message, output_format):
+    return MD5Hash.generate_hash(message, output_format)
+
+
+# --- Diffie-Hellman ---
+# Handlers return {'inputs': ..., 'results': ...} in the Java output format.
+
+def _java_diffie_hellman(p, g, alice_private, bob_private):
+    output = backends.call_java('diffie_hellman', 'DiffieHellman',
+                                [str(p), str(g), str(alice_private), str(bob_private)]).strip()
+    try:
+        result = json.loads(output)
+    except json.JSONDecodeError as e:
+        raise Fallthrough(f"Invalid JSON from Java DiffieHellman: {e}")
+    if not result.get('success'):
+        raise Fallthrough(result.get('error', 'Java execution failed'))
+    return {'inputs': result['inputs'], 'results': result['results']}
+
+
+def _python_diffie_hellman(p, g, alice_private, bob_private):
+    result = diffie_hellman_fallback(int(p), int(g), int(alice_private), int(bob_private))
+    if not result['success']:
+        raise ValueError(result['error'])
+    return {
+        'inputs': {
+            'prime_p': str(p),
+            'generator_g': str(g),
+            'private_a': str(alice_private),
+            'private_b': str(bob_private),
+        },
+        'results': result['result'],
+    }
+
+
+_dispatcher = Dispatcher(AdaptiveSelector() if getattr(settings, 'ADAPTIVE_BACKEND_SELECTION', True) else None)
+
+for _algorithm, _chain in {
+    'caesar': [
+        FunctionBackend(NATIVE, _native_caesar),
+        ExecutableBackend(_caesar_args, _stdout),
+        FunctionBackend(PYTHON, _python_caesar),
+    ],
+    # Ranked shifts by chi-squared scoring; only the Python fallback has it
+    'caesar_crack': [
+        FunctionBackend(PYTHON, _python_caesar_crack),
+    ],
+    'vigenere': [
+        FunctionBackend(NATIVE, _native_vigenere),
+        ExecutableBackend(_vigenere_args, _stdout),
+        FunctionBackend(PYTHON, _python_vigenere),
+    ],
+    # Key length estimation and key recovery; only the Python fallback has it
+    'vigenere_crack': [
+        FunctionBackend(PYTHON, _python_vigenere_crack),
+    ],
+    'hill': [
+        FunctionBackend(NATIVE, _native_hill),
+        ExecutableBackend(_hill_args, _parse_hill),
+        FunctionBackend(PYTHON, _python_hill),
+    ],
+    'sha512': [
+        FunctionBackend(NATIVE, _native_sha512),
+        ExecutableBackend(_sha512_args, _stdout),
+        FunctionBackend(PYTHON, _python_sha512),
+    ],
+    'hmac': [
+        FunctionBackend(NATIVE, _native_hmac),
+        ExecutableBackend(_hmac_args, _parse_hmac),
+        FunctionBackend(PYTHON, _python_hmac),
+    ],
+    'des': [
+        FunctionBackend(JAVA, _java_des),
+        FunctionBackend(PYTHON, _python_des),
+    ],
+    'aes': [
+        FunctionBackend(JAVA, _java_aes),
+        # The pure-Python AES visualization is CPU-bound
+        FunctionBackend(PYTHON, _python_aes, cpu_bound=True),
+    ],
+    # One block traced on demand; ECB blocks are independent, so this is cheap
+    'aes_block_trace': [
+        FunctionBackend(PYTHON, _python_aes_block_trace),
+    ],
+    # CBC, CTR and GCM; the Java AES class only has ECB
+    'aes_mode': [
+        FunctionBackend(PYTHON, _python_aes_mode, cpu_bound=True),
+    ],
+    'md5': [
+        FunctionBackend(JAVA, _java_md5),
+        FunctionBackend(PYTHON, _python_md5),
+    ],
+    'diffie_hellman': [
+        FunctionBackend(JAVA, _java_diffie_hellman),
+        FunctionBackend(PYTHON, _python_diffie_hellman),
+    ],
+}.items():
+    for _backend in _chain:
+        _dispatcher.register(_algorithm, _backend)
+
+# Operations whose output differs between backends, so adaptive selection
+# cannot change what a request returns
+for _algorithm, _operation, _backend in (
+    # The C++ and Python brute-force reports end with different advice
+    ('caesar', 'brute-force', NATIVE),
+    # Only the Python fallback has a Caesar frequency analysis
+    ('caesar', 'frequency', PYTHON),
+    # Only the Python frequency report has the "Text statistics" section
+    ('vigenere', 'frequency', PYTHON),
+):
+    _dispatcher.pin_operation(_algorithm, _operation, _backend)
+
+
+def get_dispatcher():
+    """Return the process-wide dispatcher."""
+    return _dispatcher
+
+
+def dispatch(algorithm, pin=None, **params):
+    """Shortcut for ``get_dispatcher().dispatch(...)``."""
+    return _dispatcher.dispatch(algorithm, pin=pin, **params)
+
+
+async def dispatch_async(algorithm, pin=None, **params):
+    """Shortcut for ``get_dispatcher().dispatch_async(...)``."""
+    return await _dispatcher.dispatch_async(algorithm, pin=pin, **params)
@@ -0,0 +1,116 @@
+"""
+Length-prefixed framing for talking to the native programs over stdin/stdout.
+
+Passing messages, keys and matrices as command line arguments limits them to
+ARG_MAX, cannot carry NUL bytes and exposes them in ``/proc/<pid>/cmdline``.
+The C++ executables run with ``--framed`` and the Java ``CryptoWorker`` read
+their arguments as one framed message from stdin and answer the same way.
+
+A message is a field count followed by that many fields; every field is a byte
+length followed by the bytes. All integers are unsigned 32-bit big-endian::
+
+    [count] [len_1] [bytes_1] ... [len_count] [bytes_count]
+
+See Algorithm/Crypto_Native/CPP/algovault_framing.h for the C++ side.
+"""
+
+import struct
+
+_U32 = struct.Struct('>I')
+
+# Same limit as MAX_FRAME_BYTES in algovault_framing.h
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+class FramingError(ValueError):
+    """Raised for a message that is truncated, oversized or has trailing bytes."""
+
+
+def _to_bytes(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return str(value).encode('utf-8')
+
+
+def encode_message(fields):
+    """
+    Encode a list of fields as one framed message.
+
+    Args:
+        fields (list): Fields as bytes or str; anything else is converted with str()
+
+    Returns:
+        bytes: The framed message
+    """
+    parts = [_U32.pack(len(fields))]
+    for field in fields:
+        data = _to_bytes(field)
+        if len(data) > MAX_FRAME_BYTES:
+            raise FramingError(f"Field of {len(data)} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+        parts.append(_U32.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def _parse(data, offset):
+    """
+    Parse one message starting at ``offset``.
+
+    Returns:
+        tuple: (fields, offset after the message), or (None, offset) if the data ends mid-message
+    """
+    view = memoryview(data)
+    if len(data) - offset < 4:
+        return None, offset
+    count, = _U32.unpack_from(data, offset)
+    if count > MAX_FRAME_BYTES // 4:
+        raise FramingError(f"Message claims {count} fields")
+    position = offset + 4
+    fields = []
+    for _ in range(count):
+        if len(data) - position < 4:
+            return None, offset
+        length, = _U32.unpack_from(data, position)
+        if length > MAX_FRAME_BYTES:
+            raise FramingError(f"Field claims {length} bytes")
+        position += 4
+        if len(data) - position < length:
+            return None, offset
+        fields.append(bytes(view[position:position + length]))
+        position += length
+    return fields, position
+
+
+def decode_message(data):
+    """
+    Decode a buffer holding exactly one framed message.
+
+    Returns:
+        list: The fields as bytes
+
+    Raises:
+        FramingError: The buffer is truncated or has bytes after the message
+    """
+    fields, end = _parse(data, 0)
+    if fields is None:
+        raise FramingError(f"Truncated message ({len(data)} bytes)")
+    if end != len(data):
+        raise FramingError(f"{len(data) - end} unexpected bytes after the message")
+    return fields
+
+
+class FrameReader:
+    """Incremental decoder for a stream of framed messages, e.g. a worker's stdout."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        self._buffer += chunk
+
+    def next_message(self):
+        """Return the fields of the next complete message, or None if more data is needed."""
+        fields, end = _parse(self._buffer, 0)
+        if fields is not None:
+            del self._buffer[:end]
+        return fields
@@ -0,0 +1,336 @@
+"""
+Persistent JVM worker pool for the Java cryptographic implementations.
+
+Starting a JVM costs hundreds of milliseconds, while the AES, DES, MD5 and
+Diffie-Hellman calculations themselves take microseconds. Instead of running
+``java -cp ... AES`` for every request, this module keeps a small pool of
+long-lived ``CryptoWorker`` processes that load the classes in
+Algorithm/Crypto_Native/JAVA once and answer length-prefixed requests (see
+framing.py) over stdin/stdout.
+"""
+
+import atexit
+import fcntl
+import itertools
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+
+from django.conf import settings
+
+from .framing import FrameReader, FramingError, encode_message
+
+JAVA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
+
+# Sources the worker needs; CryptoWorker calls straight into the others
+WORKER_SOURCES = ['CryptoWorker.java', 'AES.java', 'DES.java', 'MD5.java', 'DiffieHellman.java']
+
+DEFAULT_TIMEOUT = 10
+
+# Serializes javac across Django processes sharing the same checkout
+COMPILE_LOCK_FILE = '.javac.lock'
+
+
+class JVMPoolError(Exception):
+    """Raised when the pool cannot serve a request (no Java, crashed worker, timeout)."""
+
+
+class JVMRequestError(JVMPoolError):
+    """Raised when a worker is healthy but the Java code rejected the request."""
+
+
+def _stale_sources(java_dir):
+    """Return (sources, stale) for the worker sources present in java_dir."""
+    sources = []
+    stale = False
+    for source in WORKER_SOURCES:
+        source_path = os.path.join(java_dir, source)
+        class_path = os.path.join(java_dir, source[:-len('.java')] + '.class')
+        if not os.path.exists(source_path):
+            continue
+        sources.append(source_path)
+        if not os.path.exists(class_path) or os.path.getmtime(source_path) > os.path.getmtime(class_path):
+            stale = True
+    return sources, stale
+
+
+def compile_worker_classes(java_dir=JAVA_DIR):
+    """
+    Compile the worker sources if any class file is missing or older than its source.
+
+    All sources are recompiled together so the checked-in class files never get
+    mixed with a freshly compiled CryptoWorker that expects newer entry points.
+    An exclusive file lock keeps concurrent server processes from running javac
+    over each other; whoever waits on the lock re-checks and usually finds the
+    classes already fresh.
+
+    Returns:
+        bool: True if all class files are up to date after the call
+    """
+    if not _stale_sources(java_dir)[1]:
+        return True
+
+    try:
+        lock_file = open(os.path.join(java_dir, COMPILE_LOCK_FILE), 'a')
+    except OSError as e:
+        print(f"Java compilation failed: {e}")
+        return False
+
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            sources, stale = _stale_sources(java_dir)
+            if not stale:
+                return True
+            return _javac(java_dir, sources)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _javac(java_dir, sources):
+    """Run javac over the worker sources. Returns True on success."""
+    try:
+        result = subprocess.run(['javac', '-encoding', 'UTF-8', '-d', java_dir, '-cp', java_dir] + sources,
+                                capture_output=True, text=True, timeout=120)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"Java compilation failed: {e}")
+        return False
+
+    if result.returncode != 0:
+        print(f"Java compilation failed: {result.stderr}")
+        return False
+    return True
+
+
+class JVMWorker:
+    """A single ``CryptoWorker`` process speaking the framed protocol."""
+
+    def __init__(self, java_dir=JAVA_DIR, startup_timeout=30):
+        self.java_dir = java_dir
+        self._reader = FrameReader()
+        self._ids = itertools.count(1)
+        try:
+            self.process = subprocess.Popen(
+                ['java', '-cp', java_dir, 'CryptoWorker'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as e:
+            raise JVMPoolError(f"Could not start JVM worker: {e}")
+
+        # The worker sends a ready message once its classes are loaded
+        try:
+            ready = self._read_message(startup_timeout)
+        except JVMPoolError:
+            self.kill()
+            raise
+        if ready[1:2] != [b'ok']:
+            self.kill()
+            raise JVMPoolError("JVM worker failed to start")
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def call(self, class_name, args, timeout=DEFAULT_TIMEOUT):
+        """
+        Send one request to the worker and wait for its response.
+
+        Args:
+            class_name (str): Java class to run (AES, DES, MD5, DiffieHellman)
+            args (list): Command line style arguments for the class
+            timeout (float): Seconds to wait for the response
+
+        Returns:
+            str: The text the command line tool would have printed
+        """
+        request_id = str(next(self._ids))
+        try:
+            self.process.stdin.write(encode_message([request_id, class_name] + list(args)))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise JVMPoolError(f"JVM worker pipe closed: {e}")
+
+        response = self._read_message(timeout)
+        if len(response) != 3 or response[0].decode('ascii', errors='replace') != request_id:
+            raise JVMPoolError("JVM worker returned an out-of-order response")
+        text = response[2].decode('utf-8', errors='replace')
+        if response[1] != b'ok':
+            raise JVMRequestError(text or 'Java execution failed')
+        return text
+
+    def _read_message(self, timeout):
+        """Read one framed message from the worker's stdout and return its fields as bytes."""
+        deadline = time.monotonic() + timeout
+        fd = self.process.stdout.fileno()
+        while True:
+            try:
+                fields = self._reader.next_message()
+            except FramingError as e:
+                raise JVMPoolError(f"Invalid response from JVM worker: {e}")
+            if fields is not None:
+                return fields
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise JVMPoolError(f"JVM worker timed out after {timeout}s")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise JVMPoolError("JVM worker exited unexpectedly")
+            self._reader.feed(chunk)
+
+    def kill(self):
+        """Terminate the worker process and its process group."""
+        if self.process.poll() is None:
+            try:
+                os.killpg(self.process.pid, 9)
+            except (ProcessLookupError, PermissionError):
+                self.process.kill()
+            self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class JVMWorkerPool:
+    """
+    Bounded pool of ``JVMWorker`` processes.
+
+    Workers are started lazily up to ``size`` (or eagerly via ``warm()``),
+    handed out one request at a time, and replaced when they crash or time out.
+    """
+
+    def __init__(self, size=2, java_dir=JAVA_DIR):
+        self.size = max(1, int(size))
+        self.java_dir = java_dir
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._compiled = False
+        self._closed = False
+
+    def _ensure_compiled(self):
+        with self._lock:
+            if not self._compiled:
+                self._compiled = compile_worker_classes(self.java_dir)
+            if not self._compiled:
+                raise JVMPoolError("Java classes are not available")
+
+    def _spawn(self):
+        self._ensure_compiled()
+        worker = JVMWorker(self.java_dir)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker):
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+
+    def _acquire(self, timeout):
+        if self._closed:
+            raise JVMPoolError("JVM pool is shut down")
+        if not self._slots.acquire(timeout=timeout):
+            raise JVMPoolError("Timed out waiting for a free JVM worker")
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            worker = None
+
+        try:
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    # Restart crashed worker
+                    self._discard(worker)
+                worker = self._spawn()
+        except Exception:
+            self._slots.release()
+            raise
+        return worker
+
+    def _release(self, worker):
+        if self._closed or not worker.is_alive():
+            self._discard(worker)
+        else:
+            self._idle.put(worker)
+        self._slots.release()
+
+    def call(self, class_name, args, timeout=DEFAULT_TIMEOUT):
+        """
+        Run a Java class on a pooled worker.
+
+        Raises:
+            JVMRequestError: The Java code rejected the input
+            JVMPoolError: No worker could serve the request
+        """
+        worker = self._acquire(timeout)
+        try:
+            return worker.call(class_name, args, timeout)
+        except JVMRequestError:
+            raise
+        except JVMPoolError:
+            # The worker state is unknown after a pipe error or timeout
+            worker.kill()
+            raise
+        finally:
+            self._release(worker)
+
+    def warm(self):
+        """Start workers until the pool is full. Returns the number of live workers."""
+        started = []
+        try:
+            for _ in range(self.size - self._idle.qsize()):
+                if not self._slots.acquire(blocking=False):
+                    break
+                try:
+                    started.append(self._spawn())
+                except JVMPoolError:
+                    self._slots.release()
+                    break
+        finally:
+            for worker in started:
+                self._release(worker)
+        return self._idle.qsize()
+
+    def shutdown(self):
+        """Stop all workers. Subsequent calls raise ``JVMPoolError``."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_jvm_pool():
+    """Return the process-wide JVM worker pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JVMWorkerPool(size=getattr(settings, 'JVM_POOL_SIZE', 2))
+                atexit.register(_pool.shutdown)
+    return _pool
+
+
+def run_java(class_name, args, timeout=DEFAULT_TIMEOUT):
+    """Shortcut for ``get_jvm_pool().call(...)``."""
+    return get_jvm_pool().call(class_name, args, timeout)
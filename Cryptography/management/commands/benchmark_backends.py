@@ -0,0 +1,357 @@
+"""
+Benchmark every algorithm on every backend that can serve it.
+
+Runs each algorithm x backend x operation x input size, calling the backend
+handlers registered in dispatcher.py directly, so the numbers are not mixed up
+with fallthrough and do not feed the adaptive selector of a running server.
+The report is JSON with throughput, p50/p99 latency and peak RSS per case, a
+check that all backends produced the same output, and enough metadata (commit,
+Python, platform, seed) to compare two runs.
+
+Usage:
+    python manage.py benchmark_backends --output bench.json
+    python manage.py benchmark_backends --algorithms aes hill --sizes 16 1K 64K
+    python manage.py benchmark_backends --baseline bench.json --threshold 0.2
+"""
+
+import datetime
+import hashlib
+import hmac
+import json
+import platform
+import random
+import resource
+import string
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Cryptography import backends
+from Cryptography.adaptive import LatencyWindow
+from Cryptography.backends import CPP_EXE, PYTHON
+from Cryptography.dispatcher import get_dispatcher
+
+# 16 B to 16 MB in steps of 16x
+DEFAULT_SIZES = ['16', '256', '4K', '64K', '1M', '16M']
+DEFAULT_ITERATIONS = 20
+DEFAULT_SEED = 1234
+
+DES_KEY = 'benchkey'
+AES_KEY = 'benchmarkkey0123'
+HMAC_KEY = 'benchmark-secret'
+HILL_KEY = [3, 3, 2, 5]
+VIGENERE_KEY = 'LEMON'
+
+_UNITS = {'K': 1024, 'M': 1024 * 1024}
+
+
+def parse_size(value):
+    """Parse a size such as 16, 4K or 16M into bytes."""
+    value = value.strip().upper().rstrip('B')
+    try:
+        if value and value[-1] in _UNITS:
+            return int(value[:-1]) * _UNITS[value[-1]]
+        return int(value)
+    except ValueError:
+        raise CommandError(f"Invalid size: {value!r}")
+
+
+def make_text(size, seed):
+    """Return ``size`` uppercase letters, the same for the same seed; valid input for every algorithm."""
+    rng = random.Random(seed + size)
+    return ''.join(rng.choices(string.ascii_uppercase, k=size))
+
+
+def _digest(value):
+    """Short fingerprint of a normalized output, so 16 MB results are not kept around."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]
+
+
+class Case:
+    """
+    One operation of an algorithm, e.g. AES decrypt.
+
+    Args:
+        algorithm (str): Algorithm name registered with the dispatcher
+        operation (str): Operation name used in the report
+        build (callable): Maps the input text to the handler parameters; runs outside the timing
+        normalize (callable): Maps a handler result and its parameters to a value comparable across
+            backends; runs inside the timing, so a verify step belongs here. Defaults to the raw
+            result, so a backend that drops or adds whitespace shows up as a mismatch
+        sized (bool): False for algorithms whose cost does not depend on a message, which run once
+    """
+
+    def __init__(self, algorithm, operation, build, normalize=None, sized=True):
+        self.algorithm = algorithm
+        self.operation = operation
+        self.build = build
+        self.normalize = normalize or (lambda value, params: value)
+        self.sized = sized
+
+    def run(self, backend, params):
+        return self.normalize(backend.run(self.algorithm, params), params)
+
+
+def _expected_hmac(params):
+    return hmac.new(params['key'].encode('utf-8'), params['message'].encode('utf-8'),
+                    params['hash_algorithm'].lower()).hexdigest()
+
+
+def _verify_hmac(value, params):
+    if not hmac.compare_digest(value['hmac'], _expected_hmac(params)):
+        raise ValueError("HMAC verification failed")
+    return True
+
+
+def _python_encrypt(algorithm, **params):
+    """Ciphertext from the Python backend, used as decrypt input for every backend."""
+    return get_dispatcher().get_backend(algorithm, PYTHON).run(algorithm, dict(params, operation='encrypt'))
+
+
+CASES = [
+    Case('caesar', 'encrypt', lambda text: {'operation': 'encrypt', 'text': text, 'shift': 3}),
+    Case('caesar', 'decrypt', lambda text: {'operation': 'decrypt', 'text': text, 'shift': 3}),
+    Case('vigenere', 'encrypt', lambda text: {'operation': 'encrypt', 'text': text, 'key': VIGENERE_KEY}),
+    Case('vigenere', 'decrypt', lambda text: {'operation': 'decrypt', 'text': text, 'key': VIGENERE_KEY}),
+    Case('hill', 'encrypt',
+         lambda text: {'operation': 'encrypt', 'dimension': 2, 'key_matrix_flat': HILL_KEY, 'input_text': text},
+         lambda value, params: value[1]),
+    Case('hill', 'decrypt',
+         lambda text: {'operation': 'decrypt', 'dimension': 2, 'key_matrix_flat': HILL_KEY, 'input_text': text},
+         lambda value, params: value[1]),
+    Case('sha512', 'hash', lambda text: {'message': text}, lambda value, params: value.lower()),
+    Case('md5', 'hash', lambda text: {'message': text, 'output_format': 'hex'},
+         lambda value, params: value.lower()),
+    Case('hmac', 'generate', lambda text: {'message': text, 'key': HMAC_KEY, 'hash_algorithm': 'sha256'},
+         lambda value, params: value['hmac']),
+    Case('hmac', 'verify', lambda text: {'message': text, 'key': HMAC_KEY, 'hash_algorithm': 'sha256'},
+         _verify_hmac),
+    Case('des', 'encrypt', lambda text: {'operation': 'encrypt', 'key': DES_KEY, 'message': text}),
+    Case('des', 'decrypt',
+         lambda text: {'operation': 'decrypt', 'key': DES_KEY,
+                       'message': _python_encrypt('des', key=DES_KEY, message=text)}),
+    # trace_blocks=(0, 0) leaves out the round traces, which the page only shows for a few blocks
+    Case('aes', 'encrypt',
+         lambda text: {'operation': 'encrypt', 'message': text, 'key': AES_KEY, 'trace_blocks': (0, 0)},
+         lambda value, params: value['finalResult']),
+    Case('aes', 'decrypt',
+         lambda text: {'operation': 'decrypt', 'key': AES_KEY, 'trace_blocks': (0, 0),
+                       'message': _python_encrypt('aes', key=AES_KEY, message=text,
+                                                  trace_blocks=(0, 0))['finalResult']},
+         lambda value, params: value['finalResult']),
+    # The traced call the AES page makes, bounded to the blocks it shows
+    Case('aes', 'encrypt-trace',
+         lambda text: {'operation': 'encrypt', 'message': text, 'key': AES_KEY, 'trace_blocks': (0, 16)},
+         lambda value, params: value['finalResult']),
+    Case('diffie_hellman', 'exchange',
+         lambda text: {'p': 23, 'g': 5, 'alice_private': 6, 'bob_private': 15},
+         lambda value, params: value['results'], sized=False),
+]
+
+
+def _peak_rss_kb(backend):
+    """
+    Peak resident set size in KiB: of the C++ child processes for the executable
+    backend, otherwise of this process. Both are high-water marks over the whole
+    run, which is why sizes run in ascending order.
+    """
+    who = resource.RUSAGE_CHILDREN if backend == CPP_EXE else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def _case_key(result):
+    return (result['algorithm'], result['operation'], result['backend'], result['size'])
+
+
+class Command(BaseCommand):
+    help = "Benchmark every algorithm on every backend and report throughput, latency and peak RSS as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--algorithms', nargs='+', help="Algorithms to run (default: all)")
+        parser.add_argument('--backends', nargs='+', help="Backends to run (default: all registered)")
+        parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                            help="Input sizes in bytes, with optional K/M suffix (default: 16 256 4K 64K 1M 16M)")
+        parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                            help="Timed calls per case after one warm-up call")
+        parser.add_argument('--time-budget', type=float, default=5.0,
+                            help="Stop timing a case after this many seconds, even short of --iterations")
+        parser.add_argument('--max-call-seconds', type=float, default=10.0,
+                            help="Skip larger sizes of a backend once one call, or of a case once building "
+                                 "its input, takes longer than this")
+        parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Seed for the generated inputs")
+        parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+        parser.add_argument('--baseline', help="Earlier report to compare p50 latencies against")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative p50 slowdown against --baseline that counts as a regression")
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(parse_size(size) for size in options['sizes']))
+        cases = [case for case in CASES if not options['algorithms'] or case.algorithm in options['algorithms']]
+        if not cases:
+            raise CommandError(f"No such algorithms: {', '.join(options['algorithms'])}")
+
+        report = {
+            'meta': {
+                'commit': _git_commit(),
+                'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'seed': options['seed'],
+                'iterations': options['iterations'],
+                'sizes': sizes,
+            },
+            'results': [],
+            'mismatches': [],
+        }
+
+        dispatcher = get_dispatcher()
+        for case in cases:
+            names = [name for name in dispatcher.backends(case.algorithm)
+                     if not options['backends'] or name in options['backends']]
+            too_slow = set()
+            slow_build = False
+            for size in (sizes if case.sized else [0]):
+                if slow_build:
+                    report['results'].extend({
+                        'algorithm': case.algorithm,
+                        'operation': case.operation,
+                        'backend': name,
+                        'size': size,
+                        'skipped': f"Building a smaller input took longer than {options['max_call_seconds']}s",
+                    } for name in names)
+                    continue
+                started = time.perf_counter()
+                params = case.build(make_text(size, options['seed']))
+                # Building decrypt inputs runs the Python backend, so it is bounded too
+                slow_build = time.perf_counter() - started > options['max_call_seconds']
+                results = [self._run_case(case, dispatcher.get_backend(case.algorithm, name), params, size,
+                                          too_slow, options) for name in names]
+                report['results'].extend(result for result in results if result is not None)
+                mismatch = self._compare(case, size, results)
+                if mismatch:
+                    report['mismatches'].append(mismatch)
+
+        regressions = []
+        if options['baseline']:
+            regressions = self._regressions(report['results'], options['baseline'], options['threshold'])
+            report['regressions'] = regressions
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(f"Wrote {len(report['results'])} results to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+        for mismatch in report['mismatches']:
+            self.stderr.write(f"Outputs differ for {mismatch['algorithm']} {mismatch['operation']} "
+                              f"at {mismatch['size']} bytes: {mismatch['digests']}")
+        if regressions:
+            raise CommandError(f"{len(regressions)} case(s) slower than the baseline by more than "
+                               f"{options['threshold']:.0%}")
+
+    def _run_case(self, case, backend, params, size, too_slow, options):
+        """
+        Time one backend on one input.
+
+        Returns:
+            dict: The result row, with 'skipped' or 'error' set instead of timings when it did not run
+        """
+        result = {
+            'algorithm': case.algorithm,
+            'operation': case.operation,
+            'backend': backend.name,
+            'size': size,
+        }
+        if backend.name in too_slow:
+            result['skipped'] = f"A smaller input took longer than {options['max_call_seconds']}s"
+            return result
+        if backend.name != PYTHON and not backends.is_usable(case.algorithm, backend.name):
+            status = backends.get_registry().status().get(case.algorithm, {}).get(backend.name, {})
+            result['skipped'] = status.get('reason') or "Backend unavailable"
+            return result
+
+        self.stderr.write(f"{case.algorithm} {case.operation} {backend.name} {size}B")
+        try:
+            # The warm-up call loads classes, fills caches and gives the output to compare
+            started = time.perf_counter()
+            output = case.run(backend, params)
+            warm_up = time.perf_counter() - started
+
+            window = LatencyWindow(options['iterations'])
+            deadline = time.perf_counter() + options['time_budget']
+            while len(window) < options['iterations'] and (not len(window) or time.perf_counter() < deadline):
+                started = time.perf_counter()
+                case.run(backend, params)
+                window.add(time.perf_counter() - started)
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+
+        if warm_up > options['max_call_seconds']:
+            too_slow.add(backend.name)
+
+        p50 = window.percentile(0.5)
+        result.update({
+            'iterations': len(window),
+            'p50_ms': round(p50 * 1000, 4),
+            'p99_ms': round(window.percentile(0.99) * 1000, 4),
+            'throughput_mb_s': round(size / p50 / (1024 * 1024), 3) if case.sized and p50 > 0 else None,
+            'peak_rss_kb': _peak_rss_kb(backend.name),
+            'output_digest': _digest(output),
+        })
+        return result
+
+    def _compare(self, case, size, results):
+        """Return a mismatch entry if the backends that ran disagree on the output."""
+        digests = {result['backend']: result['output_digest'] for result in results
+                   if result is not None and 'output_digest' in result}
+        if len(set(digests.values())) <= 1:
+            return None
+        return {'algorithm': case.algorithm, 'operation': case.operation, 'size': size, 'digests': digests}
+
+    def _regressions(self, results, baseline_path, threshold):
+        """Compare p50 latencies with an earlier report and return the cases that got slower."""
+        try:
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        previous = {_case_key(result): result for result in baseline.get('results', []) if 'p50_ms' in result}
+        regressions = []
+        for result in results:
+            before = previous.get(_case_key(result))
+            if before is None or 'p50_ms' not in result or not before['p50_ms']:
+                continue
+            change = result['p50_ms'] / before['p50_ms'] - 1
+            if change > threshold:
+                regressions.append({
+                    'algorithm': result['algorithm'],
+                    'operation': result['operation'],
+                    'backend': result['backend'],
+                    'size': result['size'],
+                    'baseline_p50_ms': before['p50_ms'],
+                    'p50_ms': result['p50_ms'],
+                    'change': round(change, 3),
+                })
+                self.stderr.write(f"Regression: {result['algorithm']} {result['operation']} {result['backend']} "
+                                  f"{result['size']}B p50 {before['p50_ms']}ms -> {result['p50_ms']}ms")
+        return regressions
@@ -0,0 +1,268 @@
+"""
+In-process access to the C++ cryptographic implementations.
+
+Algorithm/Crypto_Native/CPP/compile.sh builds ``libalgovault.so`` (``.dylib`` on
+macOS) from algovault_capi.cpp. Loading it once with ctypes lets the views call
+the C++ code directly with explicit-length buffers, instead of spawning one
+executable per request and parsing its stdout.
+"""
+
+import ctypes
+import os
+import sys
+import threading
+
+from django.conf import settings
+
+CPP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'CPP')
+
+LIBRARY_NAME = 'libalgovault.dylib' if sys.platform == 'darwin' else 'libalgovault.so'
+
+# Must match av_version() in algovault_capi.cpp
+ABI_VERSION = 1
+
+# Return codes from algovault_capi.cpp
+AV_OK = 0
+AV_INVALID_ARGUMENT = -1
+AV_INVALID_OPERATION = -2
+AV_NOT_INVERTIBLE = -3
+AV_FAILED = -4
+
+_ERRORS = {
+    AV_INVALID_ARGUMENT: 'Invalid argument',
+    AV_INVALID_OPERATION: 'Invalid operation',
+    AV_NOT_INVERTIBLE: 'Key matrix is not invertible modulo 26',
+    AV_FAILED: 'Native call failed',
+}
+
+# Field order of av_hmac_result.fields
+HMAC_FIELDS = [
+    'hmac', 'originalKey', 'processedKey', 'keyAnalysis', 'innerPad', 'outerPad',
+    'innerKeyMaterial', 'outerKeyMaterial', 'messageHex', 'innerHash',
+    'outerInput', 'algorithm',
+]
+
+
+class NativeLibraryError(Exception):
+    """Raised when the shared library is unavailable or a native call fails."""
+
+
+class _HMACResult(ctypes.Structure):
+    _fields_ = [
+        ('success', ctypes.c_int),
+        ('block_size', ctypes.c_int),
+        ('fields', ctypes.c_void_p * len(HMAC_FIELDS)),
+        ('error', ctypes.c_void_p),
+    ]
+
+
+def library_path():
+    """Return the configured library path, or the default location next to the C++ sources."""
+    return getattr(settings, 'ALGOVAULT_NATIVE_LIB', '') or os.path.join(CPP_DIR, LIBRARY_NAME)
+
+
+def _declare(lib):
+    """Attach argument and return types to the exported functions."""
+    c_size_p = ctypes.POINTER(ctypes.c_size_t)
+    c_char_pp = ctypes.POINTER(ctypes.c_void_p)
+    c_int_p = ctypes.POINTER(ctypes.c_int)
+
+    lib.av_version.argtypes = []
+    lib.av_version.restype = ctypes.c_int
+    lib.av_free.argtypes = [ctypes.c_void_p]
+    lib.av_free.restype = None
+
+    lib.av_caesar.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int,
+                              c_char_pp, c_size_p]
+    lib.av_vigenere.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t,
+                                ctypes.c_char_p, ctypes.c_size_t, c_char_pp, c_size_p]
+    lib.av_hill_vector.argtypes = [ctypes.c_char_p, ctypes.c_int, c_int_p, c_int_p, ctypes.c_size_t,
+                                   c_int_p, c_size_p]
+    lib.av_hill_text.argtypes = [ctypes.c_char_p, ctypes.c_int, c_int_p, ctypes.c_char_p, ctypes.c_size_t,
+                                 c_char_pp, c_size_p]
+    lib.av_sha512.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p]
+    lib.av_hmac.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t,
+                            ctypes.c_char_p, ctypes.POINTER(_HMACResult)]
+    lib.av_hmac_result_free.argtypes = [ctypes.POINTER(_HMACResult)]
+    lib.av_hmac_result_free.restype = None
+    for name in ('av_caesar', 'av_vigenere', 'av_hill_vector', 'av_hill_text', 'av_sha512', 'av_hmac'):
+        getattr(lib, name).restype = ctypes.c_int
+
+
+_lib = None
+_load_error = None
+_lib_lock = threading.Lock()
+
+
+def get_native_library():
+    """
+    Load libalgovault once per process.
+
+    A failed load is remembered so requests do not retry dlopen() every time;
+    restart the server after building the library.
+
+    Raises:
+        NativeLibraryError: The library is missing, cannot be loaded or has a different ABI version
+    """
+    global _lib, _load_error
+    if _lib is not None:
+        return _lib
+    with _lib_lock:
+        if _lib is None and _load_error is None:
+            path = library_path()
+            try:
+                lib = ctypes.CDLL(path)
+                _declare(lib)
+                version = lib.av_version()
+                if version != ABI_VERSION:
+                    raise OSError(f"ABI version {version}, expected {ABI_VERSION}")
+                _lib = lib
+            except (OSError, AttributeError) as e:
+                _load_error = f"Native library {path} unavailable: {e}"
+                print(_load_error)
+        if _lib is None:
+            raise NativeLibraryError(_load_error)
+    return _lib
+
+
+def is_available():
+    """Return True if the shared library could be loaded."""
+    try:
+        get_native_library()
+        return True
+    except NativeLibraryError:
+        return False
+
+
+def _check(code):
+    if code != AV_OK:
+        raise NativeLibraryError(_ERRORS.get(code, f'Native call failed with code {code}'))
+
+
+def _encode(value):
+    return value.encode('utf-8') if isinstance(value, str) else bytes(value)
+
+
+def _take_string(lib, pointer, length):
+    """Copy a library-allocated buffer into a Python string and free it."""
+    try:
+        return ctypes.string_at(pointer, length).decode('utf-8', errors='replace')
+    finally:
+        lib.av_free(pointer)
+
+
+def _call_text(func_name, *args):
+    lib = get_native_library()
+    out = ctypes.c_void_p()
+    out_len = ctypes.c_size_t()
+    _check(getattr(lib, func_name)(*args, ctypes.byref(out), ctypes.byref(out_len)))
+    return _take_string(lib, out.value, out_len.value)
+
+
+def caesar(operation, text, shift):
+    """
+    Caesar cipher via the C++ implementation.
+
+    Args:
+        operation (str): 'encrypt', 'decrypt' or 'brute-force'
+        text (str): Input text
+        shift (int): Shift value
+
+    Returns:
+        str: The processed text
+    """
+    data = _encode(text)
+    return _call_text('av_caesar', _encode(operation), data, len(data), int(shift))
+
+
+def vigenere(operation, text, key):
+    """
+    Vigenere cipher via the C++ implementation.
+
+    Args:
+        operation (str): 'encrypt', 'decrypt', 'brute-force' or 'frequency'
+        text (str): Input text
+        key (str): Keyword
+
+    Returns:
+        str: The processed text
+    """
+    data = _encode(text)
+    key_data = _encode(key)
+    return _call_text('av_vigenere', _encode(operation), data, len(data), key_data, len(key_data))
+
+
+def hill_vector(operation, dimension, key_matrix_flat, input_vector_flat):
+    """
+    Hill cipher on a numeric vector via the C++ implementation.
+
+    Returns:
+        list: The resulting vector, padded to a multiple of the dimension
+    """
+    lib = get_native_library()
+    n = int(dimension)
+    if n <= 0 or len(key_matrix_flat) != n * n:
+        raise NativeLibraryError('Key matrix does not match the dimension')
+    key = (ctypes.c_int * (n * n))(*[int(v) for v in key_matrix_flat])
+    values = (ctypes.c_int * len(input_vector_flat))(*[int(v) for v in input_vector_flat])
+    out = (ctypes.c_int * (len(input_vector_flat) + n))()
+    out_len = ctypes.c_size_t()
+    _check(lib.av_hill_vector(_encode(operation), n, key, values, len(input_vector_flat), out, ctypes.byref(out_len)))
+    return list(out[:out_len.value])
+
+
+def hill_text(operation, dimension, key_matrix_flat, text):
+    """
+    Hill cipher on text via the C++ implementation.
+
+    Returns:
+        str: The processed text (decryption strips the trailing X padding)
+    """
+    n = int(dimension)
+    if n <= 0 or len(key_matrix_flat) != n * n:
+        raise NativeLibraryError('Key matrix does not match the dimension')
+    key = (ctypes.c_int * (n * n))(*[int(v) for v in key_matrix_flat])
+    data = _encode(text)
+    return _call_text('av_hill_text', _encode(operation), n, key, data, len(data))
+
+
+def sha512(message):
+    """
+    SHA-512 via the C++ implementation.
+
+    Returns:
+        str: Lowercase hex digest
+    """
+    lib = get_native_library()
+    data = _encode(message)
+    digest = ctypes.create_string_buffer(64)
+    _check(lib.av_sha512(data, len(data), digest))
+    return digest.raw.hex()
+
+
+def hmac(message, key, algorithm='SHA256'):
+    """
+    HMAC with step-by-step details via the C++ implementation.
+
+    Returns:
+        dict: The same keys as the "steps" object printed by the HMAC executable,
+              plus 'hmac', 'finalHmac' and 'blockSize'
+    """
+    lib = get_native_library()
+    message_data = _encode(message)
+    key_data = _encode(key)
+    result = _HMACResult()
+    code = lib.av_hmac(message_data, len(message_data), key_data, len(key_data),
+                       _encode(algorithm), ctypes.byref(result))
+    try:
+        if code != AV_OK:
+            error = ctypes.string_at(result.error).decode('utf-8', errors='replace') if result.error else None
+            raise NativeLibraryError(error or _ERRORS.get(code, 'HMAC generation failed'))
+        details = {}
+        for name, pointer in zip(HMAC_FIELDS, result.fields):
+            details[name] = ctypes.string_at(pointer).decode('utf-8', errors='replace') if pointer else ''
+        details['finalHmac'] = details['hmac']
+        details['blockSize'] = result.block_size
+        return details
+    finally:
+        lib.av_hmac_result_free(ctypes.byref(result))
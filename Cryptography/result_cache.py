@@ -0,0 +1,237 @@
+"""
+Cache for the results of deterministic algorithm calls.
+
+SHA-512, MD5, HMAC, and AES/DES in ECB mode always give the same output for
+the same input, and classroom traffic repeats the same textbook examples over
+and over. ``cached_dispatch()`` wraps ``dispatch()`` for those algorithms and
+keeps results keyed by a SHA-256 digest of (algorithm, pinned backend,
+parameters), so a repeated request skips the backend entirely. For AES the
+cached value is the full visualization dict with every round of every block,
+which is the expensive part to build.
+
+Results are stored as JSON, so every hit returns a fresh copy that the views
+are free to modify. Secret keys and messages only appear in the digest, never
+in a cache key, but cached outputs (e.g. decrypted plaintext) are held in
+memory until they expire.
+
+The default store is an in-process LRU with a byte cap and TTL. Setting
+RESULT_CACHE_ALIAS to one of the Django CACHES aliases uses that cache instead,
+e.g. Redis shared by all workers; eviction is then left to that backend.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .dispatcher import DispatchResult, dispatch, dispatch_async
+
+# Algorithms whose output depends only on their parameters
+DETERMINISTIC_ALGORITHMS = ('sha512', 'md5', 'hmac', 'aes', 'aes_block_trace', 'des')
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 3600
+
+KEY_PREFIX = 'algovault:result:'
+
+
+def cache_key(algorithm, params, pin=None):
+    """Return the cache key for one call: a digest of the algorithm, the pinned backend and the parameters."""
+    material = json.dumps([algorithm, pin, params], sort_keys=True, separators=(',', ':'))
+    return KEY_PREFIX + hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class LRUResultCache:
+    """
+    In-process store evicting the least recently used entries beyond ``max_bytes``.
+
+    Args:
+        max_bytes (int): Total size of the stored entries
+        ttl (float): Seconds an entry stays valid
+        max_entry_bytes (int): Larger entries are not stored; defaults to an eighth of ``max_bytes``
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, max_entry_bytes=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 8
+        self._entries = OrderedDict()  # key -> (expires_at, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'rejected': 0}
+
+    def get(self, key):
+        """Return the stored bytes for a key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return data
+
+    def set(self, key, data):
+        """Store bytes under a key, evicting the least recently used entries to stay under the cap."""
+        if len(data) > self.max_entry_bytes:
+            with self._lock:
+                self._counters['rejected'] += 1
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def _remove(self, key):
+        _, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, store='lru', entries=len(self._entries), bytes=self._bytes,
+                        max_bytes=self.max_bytes, ttl=self.ttl)
+
+
+class DjangoResultCache:
+    """
+    Store backed by one of the Django CACHES, so results are shared between processes.
+
+    Args:
+        alias (str): Name of the cache in settings.CACHES
+        ttl (float): Seconds an entry stays valid
+        max_entry_bytes (int): Larger entries are not stored
+    """
+
+    def __init__(self, alias, ttl=DEFAULT_TTL, max_entry_bytes=DEFAULT_MAX_BYTES // 8):
+        from django.core.cache import caches
+
+        self.alias = alias
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        # Bumped by clear() so this process stops seeing old entries without wiping the shared cache
+        self._version = 1
+        self._counters = {'hits': 0, 'misses': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, key):
+        data = self.cache.get(key, version=self._version)
+        self._count('misses' if data is None else 'hits')
+        return data
+
+    def set(self, key, data):
+        if len(data) > self.max_entry_bytes:
+            self._count('rejected')
+            return
+        self.cache.set(key, data, timeout=self.ttl, version=self._version)
+
+    def clear(self):
+        self._version += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, store=f'django:{self.alias}', ttl=self.ttl)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide result store configured by the RESULT_CACHE_* settings, or None if disabled."""
+    global _cache
+    if not getattr(settings, 'RESULT_CACHE_ENABLED', True):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttl = getattr(settings, 'RESULT_CACHE_TTL', DEFAULT_TTL)
+                max_bytes = getattr(settings, 'RESULT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+                max_entry_bytes = getattr(settings, 'RESULT_CACHE_MAX_ENTRY_BYTES', 0) or max_bytes // 8
+                alias = getattr(settings, 'RESULT_CACHE_ALIAS', '')
+                if alias:
+                    _cache = DjangoResultCache(alias, ttl, max_entry_bytes)
+                else:
+                    _cache = LRUResultCache(max_bytes, ttl, max_entry_bytes)
+    return _cache
+
+
+def _lookup(store, algorithm, key):
+    started = time.perf_counter()
+    data = store.get(key)
+    if data is None:
+        return None
+    entry = json.loads(data)
+    return DispatchResult(algorithm, entry['value'], entry['backend'], time.perf_counter() - started, [],
+                          cached=True)
+
+
+def _encode(served):
+    return json.dumps({'backend': served.backend, 'value': served.value}, separators=(',', ':')).encode('utf-8')
+
+
+def cached_dispatch(algorithm, pin=None, **params):
+    """
+    ``dispatch()`` with the result cache in front of it.
+
+    Only algorithms in DETERMINISTIC_ALGORITHMS are cached; anything else is
+    dispatched as usual. Failed calls are never cached.
+
+    Returns:
+        DispatchResult: With ``cached`` True when served from the cache
+    """
+    store = get_result_cache()
+    if store is None or algorithm not in DETERMINISTIC_ALGORITHMS:
+        return dispatch(algorithm, pin=pin, **params)
+
+    key = cache_key(algorithm, params, pin)
+    served = _lookup(store, algorithm, key)
+    if served is None:
+        served = dispatch(algorithm, pin=pin, **params)
+        store.set(key, _encode(served))
+    return served
+
+
+async def cached_dispatch_async(algorithm, pin=None, **params):
+    """Async version of ``cached_dispatch`` for the ASGI views."""
+    store = get_result_cache()
+    if store is None or algorithm not in DETERMINISTIC_ALGORITHMS:
+        return await dispatch_async(algorithm, pin=pin, **params)
+
+    key = cache_key(algorithm, params, pin)
+    if isinstance(store, LRUResultCache):
+        served = _lookup(store, algorithm, key)
+    else:
+        # A shared cache is a network round trip; keep it off the event loop
+        served = await asyncio.to_thread(_lookup, store, algorithm, key)
+    if served is None:
+        served = await dispatch_async(algorithm, pin=pin, **params)
+        if isinstance(store, LRUResultCache):
+            store.set(key, _encode(served))
+        else:
+            await asyncio.to_thread(store.set, key, _encode(served))
+    return served
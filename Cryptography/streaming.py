@@ -0,0 +1,174 @@
+"""
+Server-sent event streams of the step-by-step visualizations.
+
+The JSON APIs only answer once the whole visualization is computed and
+serialized. The stream APIs send a ``text/event-stream`` instead, one event
+per step as soon as it exists, so a page can draw the first AES round of a
+long message right away.
+
+Every stream is ``start``, the step events, then ``end``; a failure is sent
+as an ``error`` event and ends the stream. The data of every event is JSON.
+
+AES rounds come from the Python engine's block generator
+(``aes_trace_stream``), one block at a time. When the client disconnects the
+server closes the generator (WSGI) or cancels the response (ASGI), so at most
+the block in progress is computed after that. The final ciphertext or
+plaintext is still dispatched as usual, to the JVM worker if it is up; its
+output is the same because every ECB block is independent. It comes last, so
+the first round is sent without waiting for the whole message: the WSGI view
+dispatches it once the rounds are sent, the ASGI view while they stream.
+
+HMAC steps are the step details of the C++ backends, which compute them in a
+single call; DES has no step output on any backend and so has no stream.
+"""
+
+import asyncio
+import json
+
+from django.http import StreamingHttpResponse
+
+# Importable once the dispatcher has put the fallback directory on sys.path
+from . import dispatcher  # noqa: F401
+from AES.AES import aes_block_count, aes_trace_stream
+
+
+def sse_event(event, data):
+    """Format one server-sent event with JSON data."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
+def sse_response(events):
+    """Wrap an iterator (or async iterator) of encoded events in a streaming response."""
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def iterate_in_thread(iterator):
+    """
+    Async iterator over a blocking iterator, running each step in a worker thread.
+
+    If the consumer is cancelled, the step in progress finishes in its thread and
+    the iterator is closed once the last reference to it is gone.
+    """
+    done = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+def aes_round_events(operation, message, key, trace_blocks=None):
+    """
+    Yield the step events of an AES visualization.
+
+    Args:
+        operation (str): 'encrypt' or 'decrypt'
+        message (str): Plaintext, or base64 ciphertext to decrypt
+        key (str): The key
+        trace_blocks (tuple): (start, stop) range of 0-based blocks to stream; None for all
+
+    Yields:
+        bytes: 'start' with the block count, then one 'round' per round of
+        every traced block with its hex states
+
+    Raises:
+        ValueError: Invalid input, before the first event
+    """
+    total_blocks = aes_block_count(operation, message)
+    yield sse_event('start', {'operation': operation, 'total_blocks': total_blocks})
+
+    start, stop = trace_blocks if trace_blocks is not None else (0, None)
+    for block in aes_trace_stream(operation, message, key, start, stop):
+        for round_info in block['rounds']:
+            yield sse_event('round', dict(round_info, block=block['block']))
+
+
+def aes_result_events(served):
+    """Yield the 'result' of a dispatched 'aes' call with the backend that served it, then 'end'."""
+    yield sse_event('result', {
+        'result': served.value.get('finalResult'),
+        'backend': served.backend,
+        'cached': served.cached,
+    })
+    yield sse_event('end', {})
+
+
+def aes_events(dispatch_result, operation, message, key, trace_blocks=None):
+    """
+    Yield the events of an AES visualization: the rounds, then the result.
+
+    Args:
+        dispatch_result (callable): Returns the dispatched 'aes' call giving the
+            final result; called once the rounds are sent
+        operation, message, key, trace_blocks: As for aes_round_events
+
+    Yields:
+        bytes: The events of aes_round_events, then those of aes_result_events
+    """
+    try:
+        yield from aes_round_events(operation, message, key, trace_blocks)
+    except ValueError as e:
+        yield sse_event('error', {'error': str(e)})
+        return
+    try:
+        served = dispatch_result()
+    except Exception as e:
+        yield sse_event('error', {'error': f'All implementations failed. Error: {str(e)}'})
+        return
+    yield from aes_result_events(served)
+
+
+async def aes_events_async(dispatch_result, operation, message, key, trace_blocks=None):
+    """
+    Async variant of aes_events; each block is traced in a worker thread.
+
+    Args:
+        dispatch_result (callable): Returns a coroutine giving the dispatched 'aes'
+            call; it runs while the rounds stream and is cancelled if the stream ends early
+        operation, message, key, trace_blocks: As for aes_round_events
+    """
+    served = asyncio.ensure_future(dispatch_result())
+    try:
+        try:
+            async for event in iterate_in_thread(aes_round_events(operation, message, key, trace_blocks)):
+                yield event
+        except ValueError as e:
+            yield sse_event('error', {'error': str(e)})
+            return
+        try:
+            result = await served
+        except Exception as e:
+            yield sse_event('error', {'error': f'All implementations failed. Error: {str(e)}'})
+            return
+        for event in aes_result_events(result):
+            yield event
+    finally:
+        served.cancel()
+
+
+def hmac_events(served, steps):
+    """
+    Yield the events of an HMAC visualization.
+
+    Args:
+        served (DispatchResult): The dispatched 'hmac' call
+        steps (dict): Step details as shown by the HMAC page, or None if the
+            backend that served the call has none
+
+    Yields:
+        bytes: 'start', one 'step' per entry of ``steps`` in order, 'result', then 'end'
+    """
+    yield sse_event('start', {'backend': served.backend, 'cached': served.cached, 'has_steps': bool(steps)})
+    for name, value in (steps or {}).items():
+        yield sse_event('step', {'name': name, 'value': value})
+    yield sse_event('result', {'result': served.value['hmac']})
+    yield sse_event('end', {})
+
+
+def error_events(message):
+    """Yield a stream made of a single 'error' event."""
+    yield sse_event('error', {'error': message})
@@ -1,3 +1,1208 @@
-from django.test import TestCase
+import base64
+import copy
+import itertools
+import os
+import random
+import signal
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import shared_memory
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+
+from . import backends, circuit_breaker, framing, result_cache, trace_format
+from .backends import CPP_EXE, JAVA, NATIVE, PYTHON, BackendRegistry, BackendUnavailable
+from .circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from .framing import FrameReader, FramingError, decode_message, encode_message
+from .jvm_pool import JVMPoolError, JVMRequestError, JVMWorkerPool
+from .result_cache import LRUResultCache, cache_key, cached_dispatch
+from .views import add_state_grids
+# The dispatcher puts the Python fallbacks on sys.path
+from . import dispatcher
+from AES.AES import (
+    aes_fallback, decrypt_block, encrypt_block, key_expansion, normalize_key, prepare_input, run_blocks,
+)
+from AES.AESModes import (
+    aes_mode_fallback, cbc_decrypt, cbc_encrypt, counter_blocks, ctr_transform, gcm_tag,
+)
+from CaesarCipher.CaesarCipher import caesar_auto_crack, caesar_cipher_fallback, format_crack_report
+from HillCipher.HillCipher import hill_cipher_fallback, inverse, is_invertible, multiply
+from TextStats.TextStats import LetterStatistics, fold_letters
+import VigenereCipher.DictionaryAttack as dictionary_attack
+from VigenereCipher import VigenereCipher
+from VigenereCipher.VigenereCipher import (
+    estimate_key_lengths, vigenere_auto_crack, vigenere_cipher_fallback,
+)
+from VigenereCipher.VigenereCipher import format_crack_report as format_vigenere_crack_report
+
+FIPS_197_PLAINTEXT = bytes.fromhex('00112233445566778899aabbccddeeff')
+
+# FIPS-197 Appendix C.1-C.3: key size -> ciphertext of FIPS_197_PLAINTEXT under the key 00 01 02 ...
+FIPS_197_CIPHERTEXTS = {
+    16: '69c4e0d86a7b0430d8cdb78070b4c55a',
+    24: 'dda97ca4864cdfe06eaf70a0ec0d7191',
+    32: '8ea2b7ca516745bfeafc49904b496089',
+}
+
+# NIST SP 800-38A Appendix F: the four-block plaintext of F.2 and F.5
+SP800_38A_PLAINTEXT = bytes.fromhex(
+    '6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51'
+    '30c81c46a35ce411e5fbc1191a0a52eff69f2445df4f9b17ad2b417be66c3710'
+)
+SP800_38A_CBC_IV = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+SP800_38A_CTR_COUNTER = bytes.fromhex('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')
+
+# Key -> (F.2.1/F.2.5 CBC ciphertext, F.5.1/F.5.5 CTR ciphertext)
+SP800_38A_CIPHERTEXTS = {
+    '2b7e151628aed2a6abf7158809cf4f3c': (
+        '7649abac8119b246cee98e9b12e9197d5086cb9b507219ee95db113a917678b2'
+        '73bed6b8e3c1743b7116e69e222295163ff1caa1681fac09120eca307586e1a7',
+        '874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff'
+        '5ae4df3edbd5d35e5b4f09020db03eab1e031dda2fbe03d1792170a0f3009cee',
+    ),
+    '603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4': (
+        'f58c4c04d6e5f1ba779eabfb5f7bfbd69cfc4e967edb808d679f777bc6702c7d'
+        '39f23369a9d9bacfa530e26304231461b2eb05e2c39be9fcda6c19078c6a9d1b',
+        '601ec313775789a5b7a7f504bbf3d228f443e3ca4d62b59aca84e990cacaf5c5'
+        '2b0930daa23de94ce87017ba2d84988ddfc9c58db67aada613c2dd08457941a6',
+    ),
+}
+
+# GCM specification test cases 2-4, as referenced by SP 800-38D:
+# (key, nonce, plaintext, additional data, ciphertext, tag)
+GCM_VECTORS = [
+    ('00000000000000000000000000000000', '000000000000000000000000', '00000000000000000000000000000000', '',
+     '0388dace60b6a392f328c2b971b2fe78', 'ab6e47d42cec13bdf53a67b21257bddf'),
+    ('feffe9928665731c6d6a8f9467308308', 'cafebabefacedbaddecaf888',
+     'd9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+     '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b391aafd255', '',
+     '42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+     '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091473f5985', '4d5c2af327cd64a62cf35abd2ba6fab4'),
+    ('feffe9928665731c6d6a8f9467308308', 'cafebabefacedbaddecaf888',
+     'd9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72'
+     '1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39',
+     'feedfacedeadbeeffeedfacedeadbeefabaddad2',
+     '42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e'
+     '21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091', '5bc94fbc3221a5db94fae95ae7121a47'),
+]
+
+# Plain English for the frequency-based crackers
+ENGLISH_PARAGRAPH = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of "
+    "foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light, "
+    "it was the season of Darkness, it was the spring of hope, it was the winter of despair, we had "
+    "everything before us, we had nothing before us, we were all going direct to Heaven, we were all going "
+    "direct the other way."
+)
+
+TRACE_KEY = 'Thats my Kung Fu'
+TRACE_MESSAGE = 'Two One Nine Two'
+
+# Output of aes_fallback for TRACE_MESSAGE and TRACE_KEY before AES-192/256 were added
+TRACE_CIPHERTEXT = 'KcNQX1cUIPZAIpmzGgLXOrPkbxG6jSuXwYdpRJqJ6Gg='
+TRACE_ENCRYPT_ROUNDS = {
+    1: {
+        'round': 1,
+        'startOfRound': '001F0E543C4E08596E221B0B4774311A',
+        'afterSubBytes': '63C0AB20EB2F30CB9F93AF2BA092C7A2',
+        'afterShiftRows': '632FAFA2EB93C7209F92ABCBA0C0302B',
+        'afterMixColumns': 'BA75F47A84A48D32E88D060E1B407D5D',
+        'afterAddRoundKey': '5847088B15B61CBA59D4E2E8CD39DFCE',
+    },
+    10: {
+        'round': 10,
+        'startOfRound': '09668B78A2D19A65F0FCE6C47B3B3089',
+        'afterSubBytes': '01333DBC3A3EB84D8CB08E1C21E204A7',
+        'afterShiftRows': '013E8EA73AB004BC8CE23D4D2133B81C',
+        'afterMixColumns': '013E8EA73AB004BC8CE23D4D2133B81C',
+        'afterAddRoundKey': '29C3505F571420F6402299B31A02D73A',
+    },
+}
+TRACE_DECRYPT_ROUNDS = {
+    1: {
+        'round': 1,
+        'startOfRound': '013E8EA73AB004BC8CE23D4D2133B81C',
+        'afterInvShiftRows': '01333DBC3A3EB84D8CB08E1C21E204A7',
+        'afterInvSubBytes': '09668B78A2D19A65F0FCE6C47B3B3089',
+        'afterAddRoundKey': 'B68434E8E78860D7519866708CCAFB51',
+        'afterInvMixColumns': '338B762051667D92798FEBC20A3FBE67',
+    },
+    10: {
+        'round': 10,
+        'startOfRound': '632FAFA2EB93C7209F92ABCBA0C0302B',
+        'afterInvShiftRows': '63C0AB20EB2F30CB9F93AF2BA092C7A2',
+        'afterInvSubBytes': '001F0E543C4E08596E221B0B4774311A',
+        'afterAddRoundKey': '54776F204F6E65204E696E652054776F',
+        'afterInvMixColumns': '54776F204F6E65204E696E652054776F',
+    },
+}
+
+
+class AESFallbackTests(SimpleTestCase):
+
+    def test_fips_197_vectors(self):
+        for size, ciphertext in FIPS_197_CIPHERTEXTS.items():
+            with self.subTest(size=size):
+                expanded_keys = key_expansion(bytes(range(size)))
+                self.assertEqual(encrypt_block(FIPS_197_PLAINTEXT, expanded_keys).hex(), ciphertext)
+                self.assertEqual(decrypt_block(bytes.fromhex(ciphertext), expanded_keys), FIPS_197_PLAINTEXT)
+
+    def test_round_trip(self):
+        message = 'AlgoVault round trip é中 ' * 9
+        for key in ('sixteen byte key', 'twenty-four byte key 192', 'a thirty-two byte key for AES256'):
+            with self.subTest(size=len(key)):
+                self.assertEqual(len(normalize_key(key)), len(key))
+                encrypted = aes_fallback('encrypt', message, key, trace_blocks=(0, 0))
+                self.assertEqual(encrypted['blocks'], [])
+                decrypted = aes_fallback('decrypt', encrypted['finalResult'], key, trace_blocks=(0, 0))
+                self.assertEqual(decrypted['finalResult'], message)
+
+    def test_16_byte_key_trace_unchanged(self):
+        encrypted = aes_fallback('encrypt', TRACE_MESSAGE, TRACE_KEY)
+        self.assertEqual(encrypted['finalResult'], TRACE_CIPHERTEXT)
+        # The message fills one block, so PKCS7 adds a second
+        self.assertEqual([block['block'] for block in encrypted['blocks']], [1, 2])
+        rounds = encrypted['blocks'][0]['rounds']
+        self.assertEqual(len(rounds), 10)
+        for number, expected in TRACE_ENCRYPT_ROUNDS.items():
+            self.assertEqual(rounds[number - 1], expected)
+
+        decrypted = aes_fallback('decrypt', TRACE_CIPHERTEXT, TRACE_KEY)
+        self.assertEqual(decrypted['finalResult'], TRACE_MESSAGE)
+        rounds = decrypted['blocks'][0]['rounds']
+        self.assertEqual(len(rounds), 10)
+        for number, expected in TRACE_DECRYPT_ROUNDS.items():
+            self.assertEqual(rounds[number - 1], expected)
+
+    def test_long_message_trace_matches_block_engine(self):
+        # Long messages may go through the batched engine; its trace must match block by block
+        expanded_keys = key_expansion(normalize_key(TRACE_KEY))
+        for operation in ('encrypt', 'decrypt'):
+            with self.subTest(operation=operation):
+                message = TRACE_MESSAGE * 20
+                if operation == 'decrypt':
+                    message = aes_fallback('encrypt', message, TRACE_KEY, trace_blocks=(0, 0))['finalResult']
+                data = prepare_input(operation, message)
+                block_function = encrypt_block if operation == 'encrypt' else decrypt_block
+                expected = []
+                for i in range(0, len(data), 16):
+                    rounds = []
+                    block_function(data[i:i + 16], expanded_keys, rounds)
+                    expected.append({'block': i // 16 + 1, 'rounds': rounds})
+                self.assertEqual(run_blocks(data, expanded_keys, operation == 'encrypt')[1], expected)
+                self.assertEqual(aes_fallback(operation, message, TRACE_KEY)['blocks'], expected)
+
+
+def brute_force_inverse(matrix, n):
+    """
+    Inverse of a matrix modulo 26 found by applying it to every vector
+
+    The matrix is invertible exactly when x -> matrix * x is a bijection of
+    Z_26^n, and column j of the inverse is the vector mapped to the unit vector e_j.
+    """
+    preimages = {}
+    for vector in itertools.product(range(26), repeat=n):
+        image = tuple(multiply(matrix, vector, n))
+        if image in preimages:
+            return None
+        preimages[image] = vector
+    columns = [preimages[tuple(int(i == j) for i in range(n))] for j in range(n)]
+    return [[columns[j][i] for j in range(n)] for i in range(n)]
+
+
+def random_invertible_key(rng, n):
+    while True:
+        matrix = [[rng.randrange(26) for _ in range(n)] for _ in range(n)]
+        if is_invertible(matrix, n):
+            return matrix
+
+
+class AESModesTests(SimpleTestCase):
+
+    def test_cbc_matches_sp800_38a(self):
+        for key, (ciphertext, _) in SP800_38A_CIPHERTEXTS.items():
+            with self.subTest(key_bits=len(key) * 4):
+                expanded_keys = key_expansion(bytes.fromhex(key))
+                encrypted = cbc_encrypt(SP800_38A_PLAINTEXT, SP800_38A_CBC_IV, expanded_keys)
+                self.assertEqual(encrypted.hex(), ciphertext)
+                self.assertEqual(cbc_decrypt(encrypted, SP800_38A_CBC_IV, expanded_keys), SP800_38A_PLAINTEXT)
+
+    def test_ctr_matches_sp800_38a(self):
+        for key, (_, ciphertext) in SP800_38A_CIPHERTEXTS.items():
+            with self.subTest(key_bits=len(key) * 4):
+                expanded_keys = key_expansion(bytes.fromhex(key))
+                encrypted, counters, _ = ctr_transform(SP800_38A_PLAINTEXT, SP800_38A_CTR_COUNTER, expanded_keys)
+                self.assertEqual(encrypted.hex(), ciphertext)
+                self.assertEqual(counters[-16:].hex(), 'f0f1f2f3f4f5f6f7f8f9fafbfcfdff02')
+                # CTR is its own inverse; a partial last block uses part of the keystream
+                self.assertEqual(ctr_transform(encrypted, SP800_38A_CTR_COUNTER, expanded_keys)[0],
+                                 SP800_38A_PLAINTEXT)
+                self.assertEqual(ctr_transform(SP800_38A_PLAINTEXT[:20], SP800_38A_CTR_COUNTER, expanded_keys)[0],
+                                 bytes.fromhex(ciphertext)[:20])
+
+    def test_gcm_matches_sp800_38d(self):
+        for key, nonce, plaintext, aad, ciphertext, tag in GCM_VECTORS:
+            with self.subTest(key=key, aad=bool(aad)):
+                key_bytes, nonce = bytes.fromhex(key), bytes.fromhex(nonce)
+                expanded_keys = key_expansion(key_bytes)
+                # The first GCM counter block is the nonce followed by 2, incremented in its last 32 bits
+                encrypted = ctr_transform(bytes.fromhex(plaintext), nonce + b'\x00\x00\x00\x02', expanded_keys,
+                                          inc32=True)[0]
+                self.assertEqual(encrypted.hex(), ciphertext)
+                self.assertEqual(gcm_tag(key_bytes, expanded_keys, nonce, encrypted, bytes.fromhex(aad)).hex(), tag)
+
+    def test_round_trip(self):
+        message = 'Block modes chain blocks: ' * 5
+        for mode in ('CBC', 'CTR', 'GCM'):
+            with self.subTest(mode=mode):
+                encrypted = aes_mode_fallback('encrypt', mode, message, TRACE_KEY)
+                self.assertEqual(encrypted['totalBlocks'], len(encrypted['blocks']))
+                decrypted = aes_mode_fallback('decrypt', mode, encrypted['finalResult'], TRACE_KEY)
+                self.assertEqual(decrypted['finalResult'], message)
+                self.assertEqual(decrypted['iv'], encrypted['iv'])
+
+    def test_gcm_rejects_a_modified_message(self):
+        encrypted = aes_mode_fallback('encrypt', 'GCM', 'Attack at dawn', TRACE_KEY, iv='cafebabefacedbaddecaf888')
+        raw = base64.b64decode(encrypted['finalResult'])
+        # Flip one bit of the nonce, the ciphertext and the tag in turn
+        for position in (0, 12, len(raw) - 1):
+            with self.subTest(position=position):
+                tampered = bytearray(raw)
+                tampered[position] ^= 1
+                decrypted = aes_mode_fallback('decrypt', 'GCM', base64.b64encode(tampered).decode(), TRACE_KEY)
+                self.assertIn("GCM authentication failed", decrypted['finalResult'])
+                self.assertEqual(decrypted['blocks'], [])
+
+    def test_ctr_counter_wraps(self):
+        self.assertEqual(counter_blocks(b'\xff' * 16, 2), b'\xff' * 16 + bytes(16))
+        # GCM increments only the last 32 bits, so the nonce is never carried into
+        nonce = bytes.fromhex('cafebabefacedbaddecaf888')
+        self.assertEqual(counter_blocks(nonce + b'\xff' * 4, 2, inc32=True), nonce + b'\xff' * 4 + nonce + bytes(4))
+
+        expanded_keys = key_expansion(bytes.fromhex('feffe9928665731c6d6a8f9467308308'))
+        encrypted, _, keystream = ctr_transform(bytes(32), b'\xff' * 16, expanded_keys)
+        self.assertEqual(keystream[16:], encrypt_block(bytes(16), expanded_keys))
+        self.assertEqual(encrypted.hex(), 'c06388d524637cced312c0961533cd99b83b533708bf535d0aa6e52980d53b78')
+
+
+class HillFallbackTests(SimpleTestCase):
+
+    def test_inverse_matches_brute_force(self):
+        rng = random.Random(2024)
+        for n, count in ((2, 150), (3, 8)):
+            for _ in range(count):
+                matrix = [[rng.randrange(26) for _ in range(n)] for _ in range(n)]
+                with self.subTest(matrix=matrix):
+                    expected = brute_force_inverse(matrix, n)
+                    inv = [[0] * n for _ in range(n)]
+                    self.assertEqual(inverse(matrix, inv, n), expected is not None)
+                    self.assertEqual(is_invertible(matrix, n), expected is not None)
+                    if expected is not None:
+                        self.assertEqual(inv, expected)
+
+    def test_singular_modulo_2_or_13(self):
+        # Determinants 2 and 13 are nonzero but share a factor with 26
+        for matrix in ([[2, 0], [0, 1]], [[13, 0], [0, 1]], [[1, 2], [2, 4]]):
+            with self.subTest(matrix=matrix):
+                self.assertFalse(is_invertible(matrix, 2))
+                self.assertFalse(inverse(matrix, [[0, 0], [0, 0]], 2))
+                self.assertEqual(hill_cipher_fallback('decrypt', 2, sum(matrix, []), [1, 2, 3, 4]), [])
+
+    def test_round_trip_large_keys(self):
+        rng = random.Random(7)
+        for n in (5, 6, 8):
+            with self.subTest(n=n):
+                key = random_invertible_key(rng, n)
+                inv = [[0] * n for _ in range(n)]
+                self.assertTrue(inverse(key, inv, n))
+                for i in range(n):
+                    product = multiply(key, [row[i] for row in inv], n)
+                    self.assertEqual(product, [int(i == j) for j in range(n)])
+
+                # A length that is not a multiple of n is padded with X (23)
+                message = [rng.randrange(26) for _ in range(4 * n + 2)]
+                padded = message + [23] * (n - 2)
+                encrypted = hill_cipher_fallback('encrypt', n, sum(key, []), message)
+                self.assertNotEqual(encrypted, padded)
+                self.assertEqual(hill_cipher_fallback('decrypt', str(n), ','.join(map(str, sum(key, []))), encrypted),
+                                 padded)
+
+
+class LetterStatisticsTests(SimpleTestCase):
+
+    def test_entropy(self):
+        for text, expected in (('', 0.0), ('zzzz', 0.0), ('abab', 1.0), ('abcd', 2.0)):
+            with self.subTest(text=text):
+                entropy = LetterStatistics(text).entropy
+                self.assertEqual(entropy, expected)
+                # Not -0.0, which formats as "-0.000"
+                self.assertEqual(f"{entropy:.3f}", f"{expected:.3f}")
+
+
+# Whitespace at both ends and inside, which every backend must keep
+BACKEND_TEXT = ' Attack at dawn!\nMeet me by the old oak tree. \n'
+
+# (algorithm, dispatch parameters, the part of the value users see)
+BACKEND_CASES = [
+    ('caesar', {'operation': 'encrypt', 'text': BACKEND_TEXT, 'shift': 3}, None),
+    ('caesar', {'operation': 'decrypt', 'text': BACKEND_TEXT, 'shift': 3}, None),
+    ('caesar', {'operation': 'brute-force', 'text': BACKEND_TEXT, 'shift': 3}, None),
+    ('caesar', {'operation': 'frequency', 'text': BACKEND_TEXT, 'shift': 3}, None),
+    ('vigenere', {'operation': 'encrypt', 'text': BACKEND_TEXT, 'key': 'LEMON'}, None),
+    ('vigenere', {'operation': 'decrypt', 'text': BACKEND_TEXT, 'key': 'LEMON'}, None),
+    ('vigenere', {'operation': 'brute-force', 'text': BACKEND_TEXT, 'key': 'LEMON'}, None),
+    ('vigenere', {'operation': 'frequency', 'text': BACKEND_TEXT, 'key': 'LEMON'}, None),
+    ('hill', {'operation': 'encrypt', 'dimension': 2, 'key_matrix_flat': [3, 3, 2, 5], 'input_text': 'HELPME'}, None),
+    ('hill', {'operation': 'decrypt', 'dimension': 2, 'key_matrix_flat': [3, 3, 2, 5], 'input_text': 'HIAT'}, None),
+    ('hill', {'operation': 'encrypt', 'dimension': 3, 'key_matrix_flat': [6, 24, 1, 13, 16, 10, 20, 17, 15],
+              'input_vector_flat': [0, 2, 19, 4, 11]}, None),
+    ('sha512', {'message': BACKEND_TEXT}, None),
+    # The step details only come from the C++ backends; the HMAC page pins them
+    ('hmac', {'message': BACKEND_TEXT, 'key': 'key', 'hash_algorithm': 'sha256'}, lambda value: value['hmac']),
+    ('des', {'operation': 'encrypt', 'key': 'secret12', 'message': BACKEND_TEXT}, None),
+    ('md5', {'message': BACKEND_TEXT, 'output_format': 'hex'}, None),
+    ('aes', {'operation': 'encrypt', 'message': BACKEND_TEXT, 'key': TRACE_KEY},
+     lambda value: (value['finalResult'], value['blocks'], value['totalBlocks'])),
+    ('diffie_hellman', {'p': 23, 'g': 5, 'alice_private': 6, 'bob_private': 15}, None),
+]
+
+
+class FixedSelector:
+    """Stands in for AdaptiveSelector and always picks one backend."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def choose(self, algorithm, candidates, bucket):
+        return self.name if self.name in candidates else candidates[0]
+
+    def record(self, algorithm, backend, bucket, seconds, failed):
+        pass
+
+
+class BackendEquivalenceTests(SimpleTestCase):
+
+    def test_unpinned_operations_agree_across_backends(self):
+        """Every operation the selector may reorder gives the same output on every available backend."""
+        registry = dispatcher.get_dispatcher()
+        for algorithm, params, visible in BACKEND_CASES:
+            if registry.pinned_backend(algorithm, params):
+                continue
+            outputs = {}
+            for name in registry.backends(algorithm):
+                if name != PYTHON and not backends.is_usable(algorithm, name):
+                    continue
+                value = registry.get_backend(algorithm, name).run(algorithm, dict(params))
+                outputs[name] = visible(value) if visible else value
+            with self.subTest(algorithm=algorithm, operation=params.get('operation')):
+                self.assertIn(PYTHON, outputs)
+                expected = outputs[PYTHON]
+                for name, output in outputs.items():
+                    self.assertEqual(output, expected, f"{name} differs from {PYTHON}")
+
+    def test_pinned_operation_ignores_selector(self):
+        registry = dispatcher.Dispatcher(FixedSelector(PYTHON))
+        for name in (NATIVE, PYTHON):
+            registry.register('caesar', dispatcher.FunctionBackend(name, lambda operation, text, shift: text))
+        registry.pin_operation('caesar', 'brute-force', NATIVE)
+
+        order = registry._order('caesar', 0, registry.pinned_backend('caesar', {'operation': 'brute-force'}))
+        self.assertEqual([backend.name for backend in order], [NATIVE, PYTHON])
+        order = registry._order('caesar', 0, registry.pinned_backend('caesar', {'operation': 'encrypt'}))
+        self.assertEqual([backend.name for backend in order], [PYTHON, NATIVE])
+        with self.assertRaises(ValueError):
+            registry.pin_operation('caesar', 'frequency', 'java')
+
+    def test_frequency_reports_come_from_python(self):
+        """The "Text statistics" section only exists in the Python frequency reports."""
+        for algorithm, params in (('caesar', {'shift': 3}), ('vigenere', {'key': 'LEMON'})):
+            result = dispatcher.dispatch(algorithm, operation='frequency', text=BACKEND_TEXT, **params)
+            self.assertEqual(result.backend, PYTHON)
+            self.assertIn("Text statistics:", result.value)
+
+
+class FakeClock:
+    """Replaces the time module of a module under test with a monotonic clock the test advances."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(circuit_breaker, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test/native', failure_threshold=3, cooldown=30)
+
+    def open_breaker(self):
+        for attempt in range(3):
+            self.breaker.record_failure('boom')
+
+    def test_opens_after_threshold(self):
+        self.breaker.record_failure('boom')
+        self.breaker.record_failure('boom')
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure('boom')
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.snapshot()['retry_in_seconds'], 30)
+
+    def test_success_resets_the_failure_count(self):
+        self.breaker.record_failure('boom')
+        self.breaker.record_failure('boom')
+        self.breaker.record_success()
+        self.breaker.record_failure('boom')
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_half_open_allows_one_trial_then_closes(self):
+        self.open_breaker()
+        self.clock.now += 29.9
+        self.assertEqual(self.breaker.state, OPEN)
+
+        self.clock.now += 0.1
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.snapshot()['consecutive_failures'], 0)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failure_while_half_open_reopens(self):
+        self.open_breaker()
+        self.clock.now += 30
+        self.assertTrue(self.breaker.allow())
+
+        self.breaker.record_failure('still broken')
+        snapshot = self.breaker.snapshot()
+        self.assertEqual(snapshot['state'], OPEN)
+        self.assertEqual(snapshot['times_opened'], 2)
+        self.assertEqual(snapshot['last_error'], 'still broken')
+        # The cooldown starts again from the failed trial
+        self.assertEqual(snapshot['retry_in_seconds'], 30)
+        self.clock.now += 29
+        self.assertFalse(self.breaker.allow())
+        self.clock.now += 1
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+
+class RunProcessTests(SimpleTestCase):
+
+    def test_timeout_kills_the_process_group(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pid_file = os.path.join(directory, 'pid')
+            # The child starts a grandchild that holds its stdout open
+            script = ("import subprocess, sys; "
+                      "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+                      f"open({pid_file!r}, 'w').write(str(child.pid)); child.wait()")
+            started = time.monotonic()
+            with mock.patch('Cryptography.circuit_breaker.os.killpg', wraps=os.killpg) as killpg:
+                with self.assertRaises(subprocess.TimeoutExpired):
+                    circuit_breaker.run_process([sys.executable, '-c', script], timeout=1)
+            # Waiting for the grandchild's end of the pipe would take a minute
+            self.assertLess(time.monotonic() - started, 30)
+            self.assertEqual(killpg.call_count, 1)
+            group, sent = killpg.call_args.args
+            self.assertEqual(sent, signal.SIGKILL)
+
+            with open(pid_file) as f:
+                grandchild = int(f.read())
+            self.assertFalse(process_running(grandchild))
+            # The command ran in its own group, so the test process survived the kill
+            self.assertNotEqual(group, os.getpgrp())
+
+    def test_returns_the_finished_process(self):
+        process = circuit_breaker.run_process([sys.executable, '-c', 'import sys; print(sys.stdin.read()[::-1])'],
+                                              timeout=30, input=b'abc')
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, b'cba\n')
+
+
+def process_running(pid):
+    """Return True if a process exists and has not exited; an unreaped zombie has exited."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                state = f.read().rsplit(')', 1)[1].split()[0]
+        except FileNotFoundError:
+            return False
+        if state in ('Z', 'X'):
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def python_result(text):
+    return f"python:{text}"
+
+
+class DispatchFallthroughTests(SimpleTestCase):
+    """Dispatch to fake backends that fail, falling through to the Python one."""
+
+    algorithm = 'fallthrough-test'
+
+    def setUp(self):
+        # The fake algorithm has no probe; every backend counts as usable
+        patcher = mock.patch.object(backends.get_registry(), 'is_usable', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.forget_breakers)
+        self.registry = dispatcher.Dispatcher()
+
+    def forget_breakers(self):
+        for backend in (NATIVE, CPP_EXE):
+            circuit_breaker._breakers.pop((self.algorithm, backend), None)
+
+    def register(self, backend):
+        self.registry.register(self.algorithm, backend)
+        self.registry.register(self.algorithm, dispatcher.FunctionBackend(PYTHON, python_result))
+
+    def test_backend_error_falls_through(self):
+        for error in (dispatcher.NativeLibraryError('library missing'), RuntimeError('bug in the handler')):
+            with self.subTest(error=type(error).__name__):
+                self.registry = dispatcher.Dispatcher()
+                native = mock.Mock(side_effect=error)
+                self.register(dispatcher.FunctionBackend(NATIVE, native))
+
+                result = self.registry.dispatch(self.algorithm, text='abc')
+                self.assertEqual(result.value, 'python:abc')
+                self.assertEqual(result.backend, PYTHON)
+                self.assertEqual([attempt['backend'] for attempt in result.attempts], [NATIVE, PYTHON])
+                self.assertEqual(result.attempts[0]['error'], str(error))
+                native.assert_called_once_with(text='abc')
+
+    def test_python_error_is_raised(self):
+        self.registry.register(self.algorithm, dispatcher.FunctionBackend(NATIVE, mock.Mock(side_effect=ValueError)))
+        self.registry.register(self.algorithm, dispatcher.FunctionBackend(PYTHON, mock.Mock(
+            side_effect=ValueError('bad input'))))
+        with self.assertRaisesMessage(ValueError, 'bad input'):
+            self.registry.dispatch(self.algorithm, text='abc')
+
+    @override_settings(NATIVE_LATENCY_BUDGETS={algorithm: 0.5}, CIRCUIT_BREAKER_FAILURE_THRESHOLD=2)
+    def test_budget_overrun_falls_through_and_opens_the_breaker(self):
+        build_args = mock.Mock(return_value=['abc'])
+        self.register(dispatcher.ExecutableBackend(build_args, dispatcher._stdout))
+        sleeper = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+        with mock.patch.object(backends, 'framed_command', return_value=sleeper):
+            for attempt in range(2):
+                result = self.registry.dispatch(self.algorithm, text='abc')
+                self.assertEqual(result.backend, PYTHON)
+                self.assertEqual(result.attempts[0]['backend'], CPP_EXE)
+                self.assertIn('exceeding its 0.5s budget', result.attempts[0]['error'])
+                self.assertLess(result.elapsed, 30)
+
+            # The open breaker keeps the executable from being started at all
+            result = self.registry.dispatch(self.algorithm, text='abc')
+        self.assertEqual(circuit_breaker.get_breaker(self.algorithm, CPP_EXE).state, OPEN)
+        self.assertEqual([attempt['backend'] for attempt in result.attempts], [PYTHON])
+        self.assertEqual(build_args.call_count, 2)
+
+
+class LRUResultCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(result_cache, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = LRUResultCache(max_bytes=30, ttl=10, max_entry_bytes=10)
+
+    def test_evicts_least_recently_used_beyond_byte_cap(self):
+        for key in 'abc':
+            self.cache.set(key, key.encode() * 10)
+        # Reading 'a' makes 'b' the least recently used
+        self.assertEqual(self.cache.get('a'), b'a' * 10)
+
+        self.cache.set('d', b'd' * 10)
+        self.assertIsNone(self.cache.get('b'))
+        for key in 'acd':
+            self.assertEqual(self.cache.get(key), key.encode() * 10)
+
+        self.cache.set('e', b'e' * 5)
+        self.cache.set('f', b'f' * 5)
+        self.assertIsNone(self.cache.get('a'))
+        stats = self.cache.stats()
+        self.assertEqual((stats['evictions'], stats['entries'], stats['bytes']), (2, 4, 30))
+
+    def test_overwriting_a_key_does_not_count_its_bytes_twice(self):
+        for attempt in range(5):
+            self.cache.set('a', b'a' * 10)
+        self.assertEqual(self.cache.stats()['bytes'], 10)
+
+    def test_expires_after_ttl(self):
+        self.cache.set('a', b'value')
+        self.clock.now += 9.9
+        self.assertEqual(self.cache.get('a'), b'value')
+
+        self.clock.now += 0.1
+        self.assertIsNone(self.cache.get('a'))
+        stats = self.cache.stats()
+        self.assertEqual((stats['expirations'], stats['entries'], stats['bytes']), (1, 0, 0))
+
+    def test_rejects_oversized_entries(self):
+        self.cache.set('a', b'a' * 10)
+        self.cache.set('big', b'b' * 11)
+        self.assertIsNone(self.cache.get('big'))
+        self.assertEqual(self.cache.get('a'), b'a' * 10)
+        stats = self.cache.stats()
+        self.assertEqual((stats['rejected'], stats['evictions'], stats['bytes']), (1, 0, 10))
+
+
+class CachedDispatchTests(SimpleTestCase):
+
+    params = {'message': 'abc', 'key': 'key', 'hash_algorithm': 'sha256'}
+
+    def setUp(self):
+        self.store = LRUResultCache()
+        patcher = mock.patch.object(result_cache, 'get_result_cache', return_value=self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def served(self, algorithm='hmac'):
+        return dispatcher.DispatchResult(algorithm, {'hmac': '5031fe', 'steps': [{'step': 1}]}, NATIVE, 0.001, [])
+
+    def test_hit_returns_a_fresh_copy(self):
+        with mock.patch.object(result_cache, 'dispatch', return_value=self.served()) as dispatch:
+            first = cached_dispatch('hmac', **self.params)
+            second = cached_dispatch('hmac', **self.params)
+            second.value['steps'].append({'step': 2})
+            third = cached_dispatch('hmac', **self.params)
+        dispatch.assert_called_once_with('hmac', pin=None, **self.params)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.backend, NATIVE)
+        self.assertEqual(third.value, {'hmac': '5031fe', 'steps': [{'step': 1}]})
+        self.assertIsNot(third.value, second.value)
+
+    def test_pin_is_part_of_the_key(self):
+        self.assertNotEqual(cache_key('hmac', self.params), cache_key('hmac', self.params, NATIVE))
+        with mock.patch.object(result_cache, 'dispatch', return_value=self.served()) as dispatch:
+            cached_dispatch('hmac', **self.params)
+            cached_dispatch('hmac', pin=NATIVE, **self.params)
+            self.assertTrue(cached_dispatch('hmac', pin=NATIVE, **self.params).cached)
+        self.assertEqual(dispatch.call_count, 2)
+        self.assertEqual(self.store.stats()['entries'], 2)
+
+    def test_failed_dispatch_is_not_cached(self):
+        with mock.patch.object(result_cache, 'dispatch', side_effect=[ValueError('bad key'), self.served()]) as dispatch:
+            with self.assertRaises(ValueError):
+                cached_dispatch('hmac', **self.params)
+            self.assertEqual(self.store.stats()['entries'], 0)
+            self.assertFalse(cached_dispatch('hmac', **self.params).cached)
+        self.assertEqual(dispatch.call_count, 2)
+
+    def test_other_algorithms_are_not_cached(self):
+        with mock.patch.object(result_cache, 'dispatch', return_value=self.served('caesar')) as dispatch:
+            for attempt in range(2):
+                self.assertFalse(cached_dispatch('caesar', operation='encrypt', text='abc', shift=3).cached)
+        self.assertEqual(dispatch.call_count, 2)
+        self.assertEqual(self.store.stats()['entries'], 0)
+
+
+class TraceFormatTests(SimpleTestCase):
+
+    fields = {'result': 'ciphertext', 'backend': 'Python (Fallback)', 'totalBlocks': 4}
+
+    def assert_round_trip(self, blocks):
+        for delta in (False, True):
+            with self.subTest(delta=delta):
+                # The grids are rebuilt by the client, so they are not encoded
+                with_grids = copy.deepcopy(blocks)
+                add_state_grids(with_grids)
+                payload = trace_format.encode_trace(self.fields, with_grids, delta)
+                self.assertTrue(payload.startswith(trace_format.MAGIC))
+
+                header, decoded = trace_format.decode_trace(payload)
+                self.assertEqual({name: header[name] for name in self.fields}, self.fields)
+                self.assertEqual(header['delta'], delta)
+                self.assertEqual(len(decoded), len(blocks))
+                for block, decoded_block in zip(blocks, decoded):
+                    self.assertEqual(decoded_block, block)
+
+    def test_round_trip_of_ecb_trace(self):
+        for operation, message in (('encrypt', TRACE_MESSAGE * 3),
+                                   ('decrypt', aes_fallback('encrypt', TRACE_MESSAGE * 3, TRACE_KEY)['finalResult'])):
+            with self.subTest(operation=operation):
+                blocks = aes_fallback(operation, message, TRACE_KEY)['blocks']
+                self.assertEqual(len(blocks), 4)
+                self.assert_round_trip(blocks)
+
+    def test_round_trip_of_mode_trace_with_chaining(self):
+        blocks = aes_mode_fallback('encrypt', 'CBC', TRACE_MESSAGE * 3, TRACE_KEY)['blocks']
+        self.assertIn('chaining', blocks[0])
+        self.assert_round_trip(blocks)
+
+    def test_rejects_a_bad_magic(self):
+        payload = trace_format.encode_trace(self.fields, aes_fallback('encrypt', TRACE_MESSAGE, TRACE_KEY)['blocks'])
+        for bad in (b'AVT2' + payload[4:], b'{"result": "ciphertext"}', b'AVT1', b''):
+            with self.subTest(payload=bad[:8]):
+                with self.assertRaises(ValueError):
+                    trace_format.decode_trace(bad)
+
+
+class CaesarAutoCrackTests(SimpleTestCase):
+
+    def test_recovers_the_shift(self):
+        for shift in (1, 11, 25):
+            with self.subTest(shift=shift):
+                ciphertext = caesar_cipher_fallback(ENGLISH_PARAGRAPH, shift, 'encrypt')
+                crack = caesar_auto_crack(ciphertext)
+                self.assertEqual(crack['letters'], sum(c.isalpha() for c in ENGLISH_PARAGRAPH))
+                best = crack['candidates'][0]
+                self.assertEqual(best['shift'], shift)
+                self.assertGreater(best['confidence'], 0.99)
+                self.assertEqual(best['preview'], ENGLISH_PARAGRAPH[:200])
+                self.assertTrue(format_crack_report(crack, ciphertext).endswith(ENGLISH_PARAGRAPH))
+
+    def test_candidates_are_ranked(self):
+        crack = caesar_auto_crack(ENGLISH_PARAGRAPH, top_k=26)
+        self.assertEqual(sorted(candidate['shift'] for candidate in crack['candidates']), list(range(26)))
+        scores = [candidate['chi_squared'] for candidate in crack['candidates']]
+        self.assertEqual(scores, sorted(scores))
+        self.assertAlmostEqual(sum(candidate['confidence'] for candidate in crack['candidates']), 1, places=2)
+        self.assertEqual(len(caesar_auto_crack(ENGLISH_PARAGRAPH, top_k=0)['candidates']), 1)
+
+    def test_text_without_letters(self):
+        for text in ('', '1234 5678 !?', '\n\t  '):
+            with self.subTest(text=text):
+                crack = caesar_auto_crack(text)
+                self.assertEqual(crack, {'letters': 0, 'candidates': []})
+                self.assertIn("No letters found", format_crack_report(crack, text))
+
+    def test_one_letter(self):
+        crack = caesar_auto_crack('q')
+        self.assertEqual(crack['letters'], 1)
+        self.assertEqual(len(crack['candidates']), 3)
+        # The only letter is most likely an E
+        self.assertEqual(crack['candidates'][0]['preview'], 'e')
+        for candidate in crack['candidates']:
+            self.assertTrue(0 <= candidate['confidence'] <= 1)
+
+
+class VigenereAutoCrackTests(SimpleTestCase):
+
+    def test_recovers_the_key(self):
+        for key in ('KEY', 'LEMON', 'CRYPTO', 'SECRETKEY', 'QUICKBROWNFOX'):
+            with self.subTest(key=key):
+                ciphertext = vigenere_cipher_fallback(ENGLISH_PARAGRAPH, key, 'encrypt')
+                crack = vigenere_auto_crack(ciphertext)
+                best = crack['candidates'][0]
+                self.assertEqual((best['key'], best['period']), (key, len(key)))
+                self.assertEqual(best['preview'], ENGLISH_PARAGRAPH[:200])
+                self.assertTrue(format_vigenere_crack_report(crack, ciphertext).endswith(ENGLISH_PARAGRAPH))
+
+    def test_estimate_key_lengths_prefers_the_key_length_over_its_multiples(self):
+        letters = fold_letters(vigenere_cipher_fallback(ENGLISH_PARAGRAPH, 'LEMON', 'encrypt'))
+        periods = estimate_key_lengths(letters)
+        self.assertEqual(periods[0]['period'], 5)
+        self.assertEqual(sorted(entry['period'] for entry in periods), list(range(1, 21)))
+        self.assertEqual(sorted(entry['period'] for entry in estimate_key_lengths(letters, max_period=4)),
+                         [1, 2, 3, 4])
+
+    def test_same_ranking_without_numpy(self):
+        letters = fold_letters(vigenere_cipher_fallback(ENGLISH_PARAGRAPH, 'CRYPTO', 'encrypt'))
+        expected = estimate_key_lengths(letters)
+        with mock.patch.object(VigenereCipher, 'NUMPY_AVAILABLE', False):
+            periods = estimate_key_lengths(letters)
+        self.assertEqual([entry['period'] for entry in periods], [entry['period'] for entry in expected])
+        for entry, expected_entry in zip(periods, expected):
+            self.assertAlmostEqual(entry['ioc'], expected_entry['ioc'])
+            self.assertAlmostEqual(entry['kasiski'], expected_entry['kasiski'])
+
+    def test_text_without_letters(self):
+        for text in ('', '1234 5678 !?', '\n\t  '):
+            with self.subTest(text=text):
+                crack = vigenere_auto_crack(text)
+                self.assertEqual(crack, {'letters': 0, 'periods': [], 'candidates': []})
+                self.assertIn("No letters found", format_vigenere_crack_report(crack, text))
+        self.assertEqual(estimate_key_lengths(b''), [{'period': 1, 'ioc': 0.0, 'kasiski': 0.0}])
+
+    def test_one_letter(self):
+        crack = vigenere_auto_crack('q')
+        self.assertEqual(crack['letters'], 1)
+        self.assertEqual(crack['periods'], [{'period': 1, 'ioc': 0.0, 'kasiski': 0.0}])
+        # One letter is only enough for a one-letter key, which turns it into an E
+        self.assertEqual([candidate['key'] for candidate in crack['candidates']], ['M'])
+        self.assertEqual(crack['candidates'][0]['preview'], 'e')
+
+
+# Words of a test wordlist for the dictionary attack, none of them the key
+WORDLIST_WORDS = [
+    'apple', 'banana', 'KEY', 'melon', 'orange', 'Secret', 'x', 'cherry', 'grape', 'kiwi', 'plum', 'password',
+    'dragonfruit', 'fig', 'lime', 'peach', 'pear', 'quince', 'raspberry', 'strawberry',
+]
+
+
+class DictionaryAttackTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.ciphertext = vigenere_cipher_fallback(ENGLISH_PARAGRAPH, 'LEMON', 'encrypt')
+
+    @classmethod
+    def tearDownClass(cls):
+        if dictionary_attack._pool is not None:
+            dictionary_attack._discard_pool(dictionary_attack._pool)
+        super().tearDownClass()
+
+    def wordlist(self, words, trailing_newline=True):
+        path = os.path.join(self.directory, f'words-{len(os.listdir(self.directory))}.txt')
+        with open(path, 'w') as f:
+            f.write('\n'.join(words) + ('\n' if trailing_newline else ''))
+        return path
+
+    def shared_prefix(self, letters):
+        """Create the shared memory block attack_shard reads, as DictionaryAttack.start does."""
+        block = shared_memory.SharedMemory(create=True, size=dictionary_attack.PREFIX_OFFSET + len(letters))
+        block.buf[dictionary_attack.STOP_FLAG] = 0
+        block.buf[dictionary_attack.PREFIX_OFFSET:] = letters
+        self.addCleanup(block.unlink)
+        self.addCleanup(block.close)
+        self.addCleanup(self.detach)
+        return block
+
+    def detach(self):
+        for attached in dictionary_attack._attached.values():
+            attached.close()
+        dictionary_attack._attached.clear()
+
+    def wait(self, attack):
+        attack._thread.join(timeout=60)
+        self.assertFalse(attack._thread.is_alive())
+        return attack.status()
+
+    def test_every_word_is_read_by_exactly_one_shard(self):
+        letters = fold_letters(self.ciphertext)
+        block = self.shared_prefix(letters)
+        for trailing_newline in (True, False):
+            path = self.wordlist(WORDLIST_WORDS, trailing_newline)
+            size = os.path.getsize(path)
+            # Every shard size, so boundaries fall on line starts, inside words and on newlines
+            for shard_bytes in range(1, size + 2):
+                with self.subTest(shard_bytes=shard_bytes, trailing_newline=trailing_newline):
+                    keys = []
+                    tried = 0
+                    for start in range(0, size, shard_bytes):
+                        count, best, hit = dictionary_attack.attack_shard(
+                            block.name, len(letters), path, start, min(start + shard_bytes, size), 2,
+                            top_k=len(WORDLIST_WORDS))
+                        self.assertFalse(hit)
+                        tried += count
+                        keys += [key for _, key in best]
+                    self.assertEqual(tried, len(WORDLIST_WORDS))
+                    self.assertEqual(sorted(keys), sorted(word.upper() for word in WORDLIST_WORDS))
+
+    def test_shard_skips_words_that_cannot_be_keys(self):
+        letters = fold_letters(self.ciphertext)[:8]
+        block = self.shared_prefix(letters)
+        path = self.wordlist(['lemon', "o'clock", 'well-known', 'r2d2', 'strawberry', 'café', 'kiwi'])
+        tried, best, _ = dictionary_attack.attack_shard(block.name, len(letters), path, 0,
+                                                        os.path.getsize(path), 2, top_k=10)
+        # 'strawberry' is longer than the 8 prefix letters
+        self.assertEqual(tried, 2)
+        self.assertEqual(sorted(key for _, key in best), ['KIWI', 'LEMON'])
+
+    def test_shard_returns_at_once_when_stopped(self):
+        letters = fold_letters(self.ciphertext)
+        block = self.shared_prefix(letters)
+        block.buf[dictionary_attack.STOP_FLAG] = 1
+        path = self.wordlist(WORDLIST_WORDS + ['lemon'])
+        self.assertEqual(dictionary_attack.attack_shard(block.name, len(letters), path, 0, os.path.getsize(path), 0.65),
+                         (0, [], False))
+
+    def test_found(self):
+        path = self.wordlist(WORDLIST_WORDS * 20 + ['lemon'] + WORDLIST_WORDS)
+        with mock.patch.object(dictionary_attack, 'SHARD_BYTES', 64):
+            attack = dictionary_attack.DictionaryAttack(self.ciphertext, path, workers=2).start()
+            status = self.wait(attack)
+        self.assertEqual(status['state'], dictionary_attack.FOUND)
+        self.assertEqual(status['best'][0]['key'], 'LEMON')
+        self.assertGreaterEqual(status['best'][0]['fitness'], dictionary_attack.FITNESS_THRESHOLD)
+        self.assertEqual(status['best'][0]['preview'], ENGLISH_PARAGRAPH[:200])
+        # A word listed twice is one candidate
+        self.assertEqual(len({entry['key'] for entry in status['best']}), len(status['best']))
+
+    def test_exhausted(self):
+        path = self.wordlist(WORDLIST_WORDS * 10)
+        with mock.patch.object(dictionary_attack, 'SHARD_BYTES', 64):
+            attack = dictionary_attack.DictionaryAttack(self.ciphertext, path, workers=2).start()
+            status = self.wait(attack)
+        self.assertEqual(status['state'], dictionary_attack.EXHAUSTED)
+        self.assertEqual(status['progress'], 1.0)
+        self.assertEqual(status['words_tried'], len(WORDLIST_WORDS) * 10)
+        self.assertEqual(len(status['best']), dictionary_attack.TOP_KEYS)
+        self.assertLess(status['best'][0]['fitness'], dictionary_attack.FITNESS_THRESHOLD)
+
+    def test_cancel(self):
+        path = self.wordlist(WORDLIST_WORDS * 200)
+        with mock.patch.object(dictionary_attack, 'SHARD_BYTES', 64):
+            attack = dictionary_attack.DictionaryAttack(self.ciphertext, path, workers=2).start()
+            attack.cancel()
+            self.assertEqual(attack.status()['state'], dictionary_attack.CANCELLED)
+            status = self.wait(attack)
+        self.assertEqual(status['state'], dictionary_attack.CANCELLED)
+        self.assertLess(status['words_tried'], len(WORDLIST_WORDS) * 200)
+
+        # Cancelling a finished attack keeps its outcome
+        path = self.wordlist(['lemon'])
+        attack = dictionary_attack.DictionaryAttack(self.ciphertext, path, workers=2).start()
+        self.wait(attack)
+        attack.cancel()
+        self.assertEqual(attack.status()['state'], dictionary_attack.FOUND)
+
+    def test_too_many_attacks(self):
+        path = self.wordlist(['lemon'])
+        running = mock.Mock(state=dictionary_attack.RUNNING)
+        with mock.patch.dict(dictionary_attack._attacks, {'running': running}):
+            with self.assertRaises(dictionary_attack.TooManyAttacks):
+                dictionary_attack.start_attack(self.ciphertext, path, workers=2, max_running=1)
+            attack = dictionary_attack.start_attack(self.ciphertext, path, workers=2, max_running=2)
+            self.assertIs(dictionary_attack.get_attack(attack.id), attack)
+            self.assertEqual(self.wait(attack)['state'], dictionary_attack.FOUND)
+        self.assertIsNone(dictionary_attack.get_attack('unknown'))
+
+    def test_message_without_letters(self):
+        with self.assertRaises(ValueError):
+            dictionary_attack.DictionaryAttack('1234 !?', self.wordlist(['lemon'])).start()
+
+
+class FramingTests(SimpleTestCase):
+
+    fields = ['7', 'AES', b'\x00\xff binary', 'Grüße, 世界', '', 42, 'x' * 70000]
+
+    def test_round_trip(self):
+        expected = [b'7', b'AES', b'\x00\xff binary', 'Grüße, 世界'.encode('utf-8'), b'', b'42', b'x' * 70000]
+        self.assertEqual(decode_message(encode_message(self.fields)), expected)
+        self.assertEqual(decode_message(encode_message([])), [])
+        # A field count, then a length and the bytes of every field, all big-endian
+        self.assertEqual(encode_message(['ab', b'']), b'\x00\x00\x00\x02\x00\x00\x00\x02ab\x00\x00\x00\x00')
+
+    def test_short_read(self):
+        message = encode_message(['7', 'MD5', 'hello'])
+        for end in range(len(message)):
+            with self.subTest(end=end):
+                with self.assertRaisesMessage(FramingError, 'Truncated'):
+                    decode_message(message[:end])
+        with self.assertRaisesMessage(FramingError, 'unexpected bytes'):
+            decode_message(message + b'\x00')
+
+    def test_oversized_length(self):
+        with self.assertRaisesMessage(FramingError, 'Field claims'):
+            decode_message(b'\x00\x00\x00\x01\xff\xff\xff\xff')
+        with self.assertRaisesMessage(FramingError, 'Message claims'):
+            decode_message(b'\xff\xff\xff\xff')
+        with mock.patch.object(framing, 'MAX_FRAME_BYTES', 16):
+            with self.assertRaises(FramingError):
+                encode_message(['x' * 17])
+            with self.assertRaises(FramingError):
+                decode_message(b'\x00\x00\x00\x01\x00\x00\x00\x11' + b'x' * 17)
+            self.assertEqual(decode_message(encode_message(['x' * 16])), [b'x' * 16])
+
+    def test_reader_splits_a_stream(self):
+        stream = encode_message(['1', 'ok', 'first']) + encode_message(['2', 'error', ''])
+        reader = FrameReader()
+        messages = []
+        # One byte at a time, so every field boundary arrives on its own
+        for i in range(len(stream)):
+            reader.feed(stream[i:i + 1])
+            fields = reader.next_message()
+            if fields is not None:
+                messages.append(fields)
+        self.assertEqual(messages, [[b'1', b'ok', b'first'], [b'2', b'error', b'']])
+        self.assertIsNone(reader.next_message())
+
+
+# Stands in for "java -cp <dir> CryptoWorker": the same framed protocol, with
+# classes that echo, fail, crash, hang or report the worker's pid
+SCRIPTED_WORKER = """\
+import os, struct, sys, time
+
+def read_exactly(size):
+    data = b''
+    while len(data) < size:
+        chunk = sys.stdin.buffer.read(size - len(data))
+        if not chunk:
+            sys.exit(0)
+        data += chunk
+    return data
+
+def read_message():
+    count, = struct.unpack('>I', read_exactly(4))
+    return [read_exactly(struct.unpack('>I', read_exactly(4))[0]).decode() for _ in range(count)]
+
+def write_message(*fields):
+    data = [struct.pack('>I', len(fields))]
+    for field in fields:
+        field = field.encode()
+        data += [struct.pack('>I', len(field)), field]
+    sys.stdout.buffer.write(b''.join(data))
+    sys.stdout.buffer.flush()
+
+write_message('0', 'ok', 'ready')
+while True:
+    request_id, class_name, *args = read_message()
+    if class_name == 'Echo':
+        write_message(request_id, 'ok', '|'.join(args))
+    elif class_name == 'Pid':
+        write_message(request_id, 'ok', str(os.getpid()))
+    elif class_name == 'Crash':
+        os._exit(1)
+    elif class_name == 'Hang':
+        time.sleep(60)
+    else:
+        write_message(request_id, 'error', 'Unknown class: ' + class_name)
+"""
+
+
+class JVMWorkerPoolTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # A java_dir without sources has nothing to compile
+        self.java_dir = os.path.join(directory.name, 'classes')
+        os.mkdir(self.java_dir)
+        bin_dir = os.path.join(directory.name, 'bin')
+        os.mkdir(bin_dir)
+        java = os.path.join(bin_dir, 'java')
+        with open(java, 'w') as f:
+            f.write(f"#!{sys.executable}\n" + SCRIPTED_WORKER)
+        os.chmod(java, os.stat(java).st_mode | stat.S_IEXEC)
+        patcher = mock.patch.dict(os.environ, {'PATH': bin_dir + os.pathsep + os.environ.get('PATH', '')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.pool = JVMWorkerPool(size=1, java_dir=self.java_dir)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_request_and_response(self):
+        self.assertEqual(self.pool.call('Echo', ['message', 'with\nnewline', 'Grüße', '']),
+                         'message|with\nnewline|Grüße|')
+        with self.assertRaisesMessage(JVMRequestError, 'Unknown class: SHA1'):
+            self.pool.call('SHA1', [])
+        # A rejected request leaves the worker in service
+        pid = self.pool.call('Pid', [])
+        self.assertEqual(self.pool.call('Pid', []), pid)
+
+    def test_crashed_worker_is_restarted(self):
+        pid = int(self.pool.call('Pid', []))
+        with self.assertRaisesMessage(JVMPoolError, 'exited unexpectedly') as raised:
+            self.pool.call('Crash', [])
+        self.assertNotIsInstance(raised.exception, JVMRequestError)
+        self.assertNotEqual(int(self.pool.call('Pid', [])), pid)
+        self.assertFalse(process_running(pid))
+        self.assertEqual(self.pool.call('Echo', ['still', 'served']), 'still|served')
+
+    def test_hung_worker_is_replaced(self):
+        pid = int(self.pool.call('Pid', []))
+        with self.assertRaisesMessage(JVMPoolError, 'timed out'):
+            self.pool.call('Hang', [], timeout=0.5)
+        self.assertFalse(process_running(pid))
+        self.assertNotEqual(int(self.pool.call('Pid', [])), pid)
+
+    def test_warm_and_shutdown(self):
+        self.assertEqual(self.pool.warm(), 1)
+        pid = int(self.pool.call('Pid', []))
+        self.pool.shutdown()
+        self.assertFalse(process_running(pid))
+        with self.assertRaisesMessage(JVMPoolError, 'shut down'):
+            self.pool.call('Echo', [])
+
+
+class BackendRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.probes = {
+            'library-missing': mock.Mock(side_effect=backends.NativeLibraryError('libalgovault.so not found')),
+            'executable-ok': mock.Mock(),
+            'java-missing': mock.Mock(side_effect=BackendUnavailable('Java classes are not available')),
+        }
+        self.registry = BackendRegistry({
+            'registry-test': [(NATIVE, self.probes['library-missing']), (CPP_EXE, self.probes['executable-ok'])],
+            'registry-test-java': [(JAVA, self.probes['java-missing'])],
+        })
+        patcher = mock.patch.object(backends, '_registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(circuit_breaker._breakers.pop, ('registry-test', CPP_EXE), None)
+
+    def test_failed_probe_disables_the_backend(self):
+        self.assertFalse(self.registry.is_usable('registry-test', NATIVE))
+        self.assertTrue(self.registry.is_usable('registry-test', CPP_EXE))
+        # The outcome is kept, so the probe is not run again
+        self.assertFalse(self.registry.is_usable('registry-test', NATIVE))
+        self.probes['library-missing'].assert_called_once_with()
+        self.assertEqual(self.registry.status()['registry-test'][NATIVE]['reason'], 'libalgovault.so not found')
+        self.assertEqual(self.registry.available('registry-test'), [CPP_EXE, PYTHON])
+
+        self.registry.refresh()
+        self.assertIsNone(self.registry.known('registry-test', NATIVE))
+        self.assertFalse(self.registry.is_usable('registry-test', NATIVE))
+        self.assertEqual(self.probes['library-missing'].call_count, 2)
+
+    def test_python_and_unknown_backends(self):
+        self.assertTrue(self.registry.is_usable('registry-test', PYTHON))
+        self.assertFalse(self.registry.is_usable('registry-test', JAVA))
+        self.assertEqual(self.registry.available('unregistered'), [PYTHON])
+
+    def test_status_report(self):
+        report = backends.status_report()
+        # Nothing is probed by the report itself
+        self.assertEqual(report['algorithms']['registry-test']['backends'][NATIVE],
+                         {'usable': None, 'reason': None, 'breaker': {'state': CLOSED}})
+        for probe in self.probes.values():
+            probe.assert_not_called()
+
+        self.registry.probe_all()
+        report = backends.status_report()
+        test = report['algorithms']['registry-test']
+        self.assertEqual(test['serving'], CPP_EXE)
+        self.assertEqual(test['backends'][NATIVE],
+                         {'usable': False, 'reason': 'libalgovault.so not found', 'breaker': {'state': CLOSED}})
+        self.assertTrue(test['backends'][CPP_EXE]['usable'])
+        java = report['algorithms']['registry-test-java']
+        self.assertEqual(java['serving'], PYTHON)
+        self.assertEqual(java['backends'][JAVA]['reason'], 'Java classes are not available')
+        # An algorithm with a native backend served by Python degrades the report
+        self.assertTrue(report['degraded'])
+
+    def test_status_report_with_open_breaker(self):
+        self.registry.probe_all()
+        breaker = circuit_breaker.get_breaker('registry-test', CPP_EXE)
+        for attempt in range(breaker.failure_threshold):
+            breaker.record_failure('killed after exceeding its budget')
+        test = backends.status_report()['algorithms']['registry-test']
+        self.assertEqual(test['serving'], PYTHON)
+        self.assertEqual(test['backends'][CPP_EXE]['breaker']['state'], OPEN)
+        self.assertEqual(test['backends'][CPP_EXE]['breaker']['last_error'], 'killed after exceeding its budget')
+
+    def test_backend_status_api(self):
+        self.registry.probe_all()
+        response = self.client.get('/api/backends/status/')
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(set(payload), {'degraded', 'algorithms', 'timings', 'adaptive', 'result_cache', 'key_caches'})
+        self.assertEqual(set(payload['algorithms']), {'registry-test', 'registry-test-java'})
+        self.assertTrue(payload['degraded'])
+        self.assertEqual(payload['algorithms']['registry-test']['serving'], CPP_EXE)
+        self.assertEqual(payload['algorithms']['registry-test']['backends'][NATIVE]['usable'], False)
+        self.assertEqual(payload['algorithms']['registry-test']['backends'][NATIVE]['reason'],
+                         'libalgovault.so not found')
+        self.assertEqual(payload['algorithms']['registry-test-java']['serving'], PYTHON)
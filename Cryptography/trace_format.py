@@ -0,0 +1,159 @@
+"""
+Compact binary encoding of the AES step-by-step visualization.
+
+The JSON visualization repeats the step names for every round of every block
+and ships each 16-byte state twice, as hex and as a 4x4 ``*_grid``, so a
+64 KB message turns into tens of megabytes of JSON. Clients that send
+``Accept: application/x-algovault-trace`` (or ``?format=compact``) get the
+states as raw bytes instead and rebuild hex strings and grids themselves.
+Adding ``delta=1`` as a query flag or Accept parameter stores XOR deltas.
+
+A payload is a small JSON header followed by the states. The 32-bit length is
+unsigned big-endian, as in framing.py::
+
+    b'AVT1' [header length] [header JSON] [states]
+
+The header holds the non-trace fields of the response (result, backend, ...)
+plus the layout of the states:
+
+- ``steps``: state names in the order they are stored within a round
+- ``rounds``: round numbers of every block
+- ``blocks``: block numbers, in the order the blocks are stored
+- ``stateBytes``: bytes per state, 16
+- ``delta``: when true, every state after the first is stored XORed with the
+  one before it. Consecutive states differ in few bytes (the start of a round
+  equals the end of the previous one), so deltas compress well under gzip.
+- ``chaining``: only for the CBC, CTR and GCM modes, the 'chaining' values of
+  every block (previous block, counter, ...) as in the JSON format
+
+States are stored block by block, round by round, step by step.
+"""
+
+import json
+import struct
+
+MEDIA_TYPE = 'application/x-algovault-trace'
+MAGIC = b'AVT1'
+STATE_BYTES = 16
+
+_U32 = struct.Struct('>I')
+
+
+def wants_compact(request):
+    """Tell whether a request asked for the compact format, by query flag or Accept header."""
+    if request.GET.get('format', '').lower() == 'compact':
+        return True
+    return MEDIA_TYPE in request.headers.get('Accept', '')
+
+
+def wants_delta(request):
+    """Tell whether a compact request asked for XOR deltas between consecutive states."""
+    if request.GET.get('delta', '').lower() in ('1', 'true'):
+        return True
+    accept = request.headers.get('Accept', '').replace(' ', '')
+    return MEDIA_TYPE + ';delta=1' in accept
+
+
+def _xor_deltas(states):
+    if len(states) <= STATE_BYTES:
+        return states
+    # One big-int XOR of the buffer against itself shifted by one state
+    deltas = (int.from_bytes(states[STATE_BYTES:], 'big')
+              ^ int.from_bytes(states[:-STATE_BYTES], 'big')).to_bytes(len(states) - STATE_BYTES, 'big')
+    return states[:STATE_BYTES] + deltas
+
+
+def _undo_xor_deltas(states):
+    states = bytearray(states)
+    for i in range(STATE_BYTES, len(states)):
+        states[i] ^= states[i - STATE_BYTES]
+    return bytes(states)
+
+
+def pack_trace(blocks, delta=False):
+    """
+    Pack visualization blocks into a layout description and a flat state buffer.
+
+    Args:
+        blocks (list): Blocks as returned by the AES backends, with 'block' and 'rounds'
+        delta (bool): Store XOR deltas between consecutive states
+
+    Returns:
+        tuple: (layout dict for the header, states as bytes)
+    """
+    steps = []
+    rounds = []
+    if blocks and blocks[0]['rounds']:
+        first_rounds = blocks[0]['rounds']
+        steps = [step for step in first_rounds[0] if step != 'round' and not step.endswith('_grid')]
+        rounds = [round_info['round'] for round_info in first_rounds]
+    # The states are hex strings; decoding them all at once is much cheaper than one by one
+    hex_states = [round_info[step] for block in blocks for round_info in block['rounds'] for step in steps]
+    states = bytes.fromhex(''.join(hex_states))
+    if delta:
+        states = _xor_deltas(states)
+    layout = {
+        'steps': steps,
+        'rounds': rounds,
+        'blocks': [block['block'] for block in blocks],
+        'stateBytes': STATE_BYTES,
+        'delta': delta,
+    }
+    if any('chaining' in block for block in blocks):
+        layout['chaining'] = [block.get('chaining') for block in blocks]
+    return layout, states
+
+
+def encode_trace(fields, blocks, delta=False):
+    """
+    Encode a visualization response in the compact format.
+
+    Args:
+        fields (dict): Non-trace response fields copied into the header
+        blocks (list): Visualization blocks
+        delta (bool): Store XOR deltas between consecutive states
+
+    Returns:
+        bytes: The payload
+    """
+    layout, states = pack_trace(blocks, delta)
+    header = json.dumps(dict(fields, **layout), separators=(',', ':')).encode('utf-8')
+    return MAGIC + _U32.pack(len(header)) + header + states
+
+
+def decode_trace(payload):
+    """
+    Decode a compact payload back into its header and the visualization blocks.
+
+    Returns:
+        tuple: (header dict, blocks in the JSON format, without grids)
+
+    Raises:
+        ValueError: The payload is not in the compact format
+    """
+    if payload[:4] != MAGIC or len(payload) < 8:
+        raise ValueError("Not a compact trace payload")
+    (header_length,) = _U32.unpack_from(payload, 4)
+    header = json.loads(payload[8:8 + header_length])
+    states = payload[8 + header_length:]
+    if header['delta']:
+        states = _undo_xor_deltas(states)
+
+    hex_states = states.hex().upper()
+    width = header['stateBytes'] * 2
+    offset = 0
+    blocks = []
+    chaining = header.get('chaining')
+    for index, block_number in enumerate(header['blocks']):
+        rounds = []
+        for round_number in header['rounds']:
+            round_info = {'round': round_number}
+            for step in header['steps']:
+                round_info[step] = hex_states[offset:offset + width]
+                offset += width
+            rounds.append(round_info)
+        block = {'block': block_number, 'rounds': rounds}
+        if chaining is not None:
+            block['chaining'] = chaining[index]
+        blocks.append(block)
+    return header, blocks
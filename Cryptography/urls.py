@@ -1,6 +1,6 @@
 
 from django.urls import path, re_path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('', views.landing, name='landing'),
@@ -10,10 +10,14 @@ urlpatterns = [
     path('help/', views.help_page, name='help'),
     path('caesar', views.caesar_cipher, name='caesar_cipher'),
     path('caesar/process', views.caesar_cipher, name='process_caesar'),
+    path('api/caesar/crack/', views.caesar_crack_api, name='caesar_crack_api'),
     # path('hill/', views.hill_cipher_page, name='hill_cipher_page'),
     # path('hill/process/', views.process_hill_cipher, name='process_hill_cipher'),
     path('vigenere/', views.vigenere_view, name='vigenere'),
     path('api/vigenere/process/', views.vigenere_process_api, name='vigenere_api'),
+    path('api/vigenere/crack/', views.vigenere_crack_api, name='vigenere_crack_api'),
+    path('api/vigenere/dictionary/', views.vigenere_dictionary_attack_api, name='vigenere_dictionary_api'),
+    path('api/vigenere/dictionary/<str:attack_id>/', views.vigenere_dictionary_status_api, name='vigenere_dictionary_status_api'),
     path('des/', views.des_view, name='des'),
     path('api/des/process/', views.des_process_api, name='des_api'),
     path('sha512/', views.sha512_view, name='sha512'),
@@ -23,11 +27,26 @@ urlpatterns = [
     path('api/hill/process/', views.hill_process_api, name='hill_api'),
     path('aes/', views.aes_view, name='aes'),
     path('api/aes/process/', views.aes_process_api, name='aes_api'),
+    path('api/aes/trace/', views.aes_block_trace_api, name='aes_trace_api'),
+    # Server-sent event streams of the visualization steps
+    path('api/aes/stream/', views.aes_stream_api, name='aes_stream_api'),
+    path('api/hmac/stream/', views.hmac_stream_api, name='hmac_stream_api'),
     path('md5/', views.md5_view, name='md5'),
     path('md5/process/', views.md5_process, name='md5_process'),
     path('hmac/', views.hmac_view, name='hmac'),
     path('hmac/process/', views.hmac_process, name='hmac_process'),
     path('diffie_hellman/', views.diffie_hellman_view, name='diffie_hellman'),
+    # Async variants of the JSON APIs for ASGI deployments (algovault/asgi.py)
+    path('api/async/vigenere/process/', async_views.vigenere_process_api, name='vigenere_async_api'),
+    path('api/async/des/process/', async_views.des_process_api, name='des_async_api'),
+    path('api/async/sha512/process/', async_views.sha512_process_api, name='sha512_async_api'),
+    path('api/async/hill/process/', async_views.hill_process_api, name='hill_async_api'),
+    path('api/async/aes/process/', async_views.aes_process_api, name='aes_async_api'),
+    path('api/async/aes/trace/', async_views.aes_block_trace_api, name='aes_trace_async_api'),
+    path('api/async/aes/stream/', async_views.aes_stream_api, name='aes_stream_async_api'),
+    path('api/async/hmac/stream/', async_views.hmac_stream_api, name='hmac_stream_async_api'),
+    # Native backend health: probe results and circuit breaker states
+    path('api/backends/status/', views.backend_status_api, name='backend_status_api'),
 
     # Dedicated error routes for profile/account dropdowns
     path('profile/', views.error_page, {'message': 'Sorry, Page not found.....'}, name='profile_error'),
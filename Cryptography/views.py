@@ -1,13 +1,12 @@
-import subprocess
-import os
 import json
+import os
+import re
 import base64
-import hashlib
+import functools
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
-import sys
 
 def error_page(request, exception=None, message=None):
     """Renders the generic error page for unsupported or missing algorithm pages."""
@@ -22,21 +21,18 @@ def error_page(request, exception=None, message=None):
     return render(request, 'ErrorPage.html', context)
 
 
-# Add the Algorithm/Crypto_Fallback/Python directory to sys.path
-algorithm_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Fallback', 'Python')
-if algorithm_path not in sys.path:
-    sys.path.append(algorithm_path)
-
-# Now import the fallback functions
-from CaesarCipher.CaesarCipher import caesar_cipher_fallback
-from VigenereCipher.VigenereCipher import vigenere_cipher_fallback  
-from HillCipher.HillCipher import hill_cipher_fallback
-from DES.DES import des_fallback
-from SHA512.SHA512 import sha512_hash
-from AES.AES import aes_fallback
-from DiffieHellman.DiffieHellman import diffie_hellman_fallback
-from MD5.MD5 import MD5Hash
-from HMAC.HMAC import HMACHash, hmac_fallback
+# Each algorithm is dispatched to its native backends with the Python fallback last
+from . import backends
+from .backends import NATIVE
+from .dispatcher import (
+    dispatch, format_crack_report, format_vigenere_crack_report, get_dispatcher,
+    hill_key_word_to_matrix, key_cache_stats,
+)
+# Importable once the dispatcher has put the fallback directory on sys.path
+from VigenereCipher.DictionaryAttack import TooManyAttacks, get_attack, start_attack
+from .result_cache import cached_dispatch, get_result_cache
+from . import trace_format
+from .streaming import aes_events, error_events, hmac_events, sse_response
 
 def home(request):
     """Renders the home page."""
@@ -65,33 +61,48 @@ def caesar_cipher(request):
         shift = int(request.POST.get('shift', 0))
         text = request.POST.get('message', '')  # Changed from 'text' to 'message' to match frontend
         
-        result = ''
-        # Try C++ executable first
-        try:
-            exe_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'CPP', 'CaesarCipher.exe')
-            if os.path.exists(exe_path):
-                process = subprocess.run([exe_path, operation, str(shift), text], 
-                                        capture_output=True, text=True, check=True)
-                result = process.stdout.strip()
-            else:
-                # Use Python fallback
-                result = caesar_cipher_fallback(text, shift, operation)
-        except (subprocess.CalledProcessError, OSError, FileNotFoundError):
-            # Use Python fallback if C++ fails (including compatibility issues)
-            result = caesar_cipher_fallback(text, shift, operation)
+        if operation == 'auto-crack':
+            served = dispatch('caesar_crack', text=text)
+            result = format_crack_report(served.value, text)
+        else:
+            # C++ library, then the C++ executable, then the Python fallback
+            served = dispatch('caesar', operation=operation, text=text, shift=shift)
+            result = served.value
         
         context = {
             'active_page': 'caesar',
             'result_text': result,  # Changed from 'result' to 'result_text' to match template
             'operation': operation,
             'shift_value': shift,   # Changed from 'shift' to 'shift_value' to match template
-            'original_message': text  # Changed from 'text' to 'original_message' to match template
+            'original_message': text,  # Changed from 'text' to 'original_message' to match template
+            'implementation_used': served.label,
         }
     else:
         context = {'active_page': 'caesar'}
     
     return render(request, 'caesar.html', context)
 
+@csrf_exempt
+def caesar_crack_api(request):
+    """API endpoint ranking the likely shifts of a Caesar ciphertext, with a short decrypted preview of each."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        text = data.get('message', '')
+        top_k = int(data.get('top_k', 3))
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValueError):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    if not text:
+        return JsonResponse({'error': 'Message is required.'}, status=400)
+
+    try:
+        served = dispatch('caesar_crack', text=text, top_k=top_k)
+        return JsonResponse(dict(served.value, backend=served.backend))
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
 def vigenere_view(request):
     """Renders the main Vigenere Cipher tool page."""
     context = {'active_page': 'vigenere'}
@@ -99,7 +110,7 @@ def vigenere_view(request):
 
 @csrf_exempt
 def vigenere_process_api(request):
-    """API endpoint for Vigenere Cipher processing with C++/Java primary and Python fallback."""
+    """API endpoint for Vigenere Cipher processing with C++ primary and Python fallback."""
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
 
@@ -109,45 +120,99 @@ def vigenere_process_api(request):
         text = data.get('message')  # Changed from 'text' to 'message' to match frontend
         key = data.get('keyword')   # Changed from 'key' to 'keyword' to match frontend
 
+        if operation == 'auto-crack':
+            # The key is what is being looked for
+            if not text:
+                return JsonResponse({'error': 'Missing required fields.'}, status=400)
+            served = dispatch('vigenere_crack', text=text)
+            return JsonResponse({'result': format_vigenere_crack_report(served.value, text), 'backend': served.backend})
+
         if not all([operation, text, key]):
             return JsonResponse({'error': 'Missing required fields.'}, status=400)
 
-        result_text = None
-        
-        # Try C++ executable first
-        cpp_executable_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'CPP', 'VigenereCipher.exe')
-        if os.path.exists(cpp_executable_path):
-            try:
-                command = [cpp_executable_path, operation, text, key]
-                result = subprocess.run(command, capture_output=True, text=True, check=True)
-                result_text = result.stdout.strip()
-            except (subprocess.CalledProcessError, OSError, FileNotFoundError):
-                pass  # Will try Java or fallback
-
-        # Try Java executable if C++ failed
-        java_source_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-        java_executable_path = os.path.join(java_source_dir, 'VigenereProcessor.class')
-        if result_text is None and os.path.exists(java_executable_path):
-            try:
-                command = ['java', '-cp', java_source_dir, 'VigenereProcessor', operation, text, key]
-                result = subprocess.run(command, capture_output=True, text=True, check=True)
-                result_text = result.stdout.strip()
-            except subprocess.CalledProcessError:
-                pass  # Will use Python fallback
+        # C++ library, then the C++ executable, then the Python fallback
+        served = dispatch('vigenere', operation=operation, text=text, key=key)
+        return JsonResponse({'result': served.value, 'backend': served.backend})
+
+    except Exception as e:
+        # Every backend, including the Python fallback, failed
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
 
-        # Use Python fallback if both C++ and Java failed
-        if result_text is None:
-            result_text = vigenere_cipher_fallback(text, key, operation)
+@csrf_exempt
+def vigenere_crack_api(request):
+    """API endpoint estimating the key length of a Vigenere ciphertext and ranking the recovered keys."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
 
-        return JsonResponse({'result': result_text})
+    try:
+        data = json.loads(request.body)
+        text = data.get('message', '')
+        top_k = int(data.get('top_k', 3))
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValueError):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    if not text:
+        return JsonResponse({'error': 'Message is required.'}, status=400)
 
+    try:
+        served = dispatch('vigenere_crack', text=text, top_k=top_k)
+        return JsonResponse(dict(served.value, backend=served.backend))
     except Exception as e:
-        # Final fallback to Python
-        try:
-            result_text = vigenere_cipher_fallback(text, key, operation)
-            return JsonResponse({'result': result_text})
-        except Exception as fallback_error:
-            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}. Fallback error: {str(fallback_error)}'}, status=500)
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+def vigenere_wordlists():
+    """Return the names of the wordlist files in VIGENERE_WORDLIST_DIR."""
+    directory = settings.VIGENERE_WORDLIST_DIR
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if os.path.isfile(os.path.join(directory, name)))
+
+@csrf_exempt
+def vigenere_dictionary_attack_api(request):
+    """
+    Starts a dictionary attack on a Vigenere ciphertext (POST), or lists the wordlists (GET).
+
+    The attack runs in the background; poll vigenere_dictionary_status_api with the returned id.
+    """
+    if request.method == 'GET':
+        return JsonResponse({'wordlists': vigenere_wordlists()})
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only GET and POST requests are allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        text = data.get('message', '')
+        wordlist = str(data.get('wordlist', ''))
+        # Fitness (share of common English letters) at which to stop; the module default otherwise
+        options = {'threshold': float(data['threshold'])} if 'threshold' in data else {}
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError, ValueError):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    if not text:
+        return JsonResponse({'error': 'Message is required.'}, status=400)
+    # Only plain names of files in the wordlist directory are accepted
+    if wordlist not in vigenere_wordlists():
+        return JsonResponse({'error': 'Unknown wordlist.', 'wordlists': vigenere_wordlists()}, status=400)
+
+    try:
+        attack = start_attack(text, os.path.join(settings.VIGENERE_WORDLIST_DIR, wordlist),
+                              workers=settings.VIGENERE_ATTACK_PROCESSES,
+                              max_running=settings.VIGENERE_MAX_RUNNING_ATTACKS, **options)
+    except TooManyAttacks as e:
+        return JsonResponse({'error': str(e)}, status=429)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(attack.status(), status=202)
+
+@csrf_exempt
+def vigenere_dictionary_status_api(request, attack_id):
+    """Returns the progress and best keys of a dictionary attack (GET), or cancels it (DELETE)."""
+    attack = get_attack(attack_id)
+    if attack is None:
+        return JsonResponse({'error': 'Unknown attack.'}, status=404)
+    if request.method == 'DELETE':
+        attack.cancel()
+    elif request.method != 'GET':
+        return JsonResponse({'error': 'Only GET and DELETE requests are allowed.'}, status=405)
+    return JsonResponse(attack.status())
 
 def des_view(request):
     """Renders the main DES tool page."""
@@ -175,60 +240,19 @@ def des_process_api(request):
         if not all([operation, message_str, key_str]):
             return JsonResponse({'error': 'Missing required fields.'}, status=400)
 
-        result_text = None
-        
-        # Java is the primary and preferred implementation for DES
-        java_source_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-        java_class_file = os.path.join(java_source_dir, 'DES.class')
-        
-        # Compile Java if class file doesn't exist
-        if not os.path.exists(java_class_file):
-            try:
-                java_source_file = os.path.join(java_source_dir, 'DES.java')
-                if os.path.exists(java_source_file):
-                    compile_cmd = ['javac', java_source_file]
-                    subprocess.run(compile_cmd, check=True, capture_output=True)
-            except Exception as e:
-                print(f"Failed to compile Java: {str(e)}")
-        
-        # Try to use Java implementation
-        if os.path.exists(java_class_file) or os.path.exists(os.path.join(java_source_dir, 'DES.java')):
-            try:
-                # Prepare key (must be 8 bytes for DES)
-                if len(key_str) < 8:
-                    key_str = key_str + '\0' * (8 - len(key_str))  # Pad with nulls
-                elif len(key_str) > 8:
-                    key_str = key_str[:8]  # Truncate
-                
-                # Run Java with appropriate parameters - Java is the only proper implementation for DES
-                command = ['java', '-cp', java_source_dir, 'DES', operation, key_str, message_str]
-                result = subprocess.run(command, capture_output=True, text=True, check=False)
-                
-                if result.returncode == 0:
-                    result_text = result.stdout.strip()
-                else:
-                    print(f"Java error: {result.stderr}")
-            except Exception as e:
-                print(f"Java execution error: {str(e)}")
-                # Will use Python fallback only if Java fails
-
-        # Use Python fallback only if Java failed - Python implementation is not as robust as Java
-        if result_text is None:
-            result_text = des_fallback(operation, key_str, message_str)
+        # Prepare key (must be 8 bytes for DES)
+        if len(key_str) < 8:
+            key_str = key_str + '\0' * (8 - len(key_str))  # Pad with nulls
+        elif len(key_str) > 8:
+            key_str = key_str[:8]  # Truncate
 
-        return JsonResponse({'result': result_text})
+        # Pooled JVM worker first; Python only if Java fails
+        served = cached_dispatch('des', operation=operation, key=key_str, message=message_str)
+        return JsonResponse({'result': served.value, 'backend': served.backend, 'cached': served.cached})
 
     except Exception as e:
-        # Final fallback to Python if Java completely fails
-        try:
-            if not all([operation, message_str, key_str]):
-                return JsonResponse({'error': 'Missing required fields in fallback.'}, status=400)
-                
-            # Python fallback is a last resort when Java is unavailable
-            result_text = des_fallback(operation, key_str, message_str)
-            return JsonResponse({'result': result_text})
-        except Exception as fallback_error:
-            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}. Fallback error: {str(fallback_error)}'}, status=500)
+        # Every backend, including the Python fallback, failed
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
 
 def sha512_view(request):
     """Renders the main SHA-512 tool page."""
@@ -253,40 +277,12 @@ def sha512_process_api(request):
         if message is None:
             return JsonResponse({'error': 'Missing required message field.'}, status=400)
 
-        hash_result = None
-        
-        # C++ is the primary and preferred implementation for SHA-512
-        cpp_executable_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'CPP', 'SHA-512.exe')
-        if os.path.exists(cpp_executable_path):
-            try:
-                # Run C++ with appropriate parameters
-                command = [cpp_executable_path, message]
-                result = subprocess.run(command, capture_output=True, text=True, check=False)
-                
-                if result.returncode == 0:
-                    hash_result = result.stdout.strip()
-                else:
-                    print(f"C++ SHA-512 error: {result.stderr}")
-            except (Exception, OSError, FileNotFoundError) as e:
-                print(f"C++ SHA-512 execution error: {str(e)}")
-                # Will use Python fallback only if C++ fails
-
-        # Use Python fallback only if C++ failed - Python implementation is not preferred
-        if hash_result is None:
-            hash_result = sha512_hash(message)
-        
-        return JsonResponse({'result': hash_result})
+        # C++ library, then the C++ executable, then the Python fallback
+        served = cached_dispatch('sha512', message=message)
+        return JsonResponse({'result': served.value, 'backend': served.backend, 'cached': served.cached})
     except Exception as e:
-        # Final fallback to Python if C++ completely fails
-        try:
-            if message is None:
-                return JsonResponse({'error': 'Missing required message field in fallback.'}, status=400)
-                
-            # Python fallback is a last resort when C++ is unavailable
-            hash_result = sha512_hash(message)
-            return JsonResponse({'result': hash_result})
-        except Exception as fallback_error:
-            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}. Fallback error: {str(fallback_error)}'}, status=500)
+        # Every backend, including the Python fallback, failed
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
 
 def hill_view(request):
     """Renders the main Hill Cipher tool page."""
@@ -295,7 +291,7 @@ def hill_view(request):
 
 @csrf_exempt
 def hill_process_api(request):
-    """API endpoint for Hill Cipher processing with C++/Java primary and Python fallback."""
+    """API endpoint for Hill Cipher processing with C++ primary and Python fallback."""
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
 
@@ -322,147 +318,37 @@ def hill_process_api(request):
         if not input_vector_flat and not input_text:
             return JsonResponse({'error': 'Either input_vector_flat or input_text is required.'}, status=400)
 
-        result_vector = None
-        result_text = None
+        dimension = int(dimension)
+        if key_word:
+            # Same key word rules as HillCipher::keyWordToMatrix
+            key_matrix_flat = hill_key_word_to_matrix(key_word, dimension)
 
-        # Try C++ executable first
-        cpp_executable_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'CPP', 'HillCipher.exe')
-        if os.path.exists(cpp_executable_path):
-            try:
-                # Base command
-                command = [cpp_executable_path, operation, str(dimension)]
-                
-                # Add key (either matrix or word)
-                if key_word:
-                    command.extend(["--key-word", key_word])
-                else:
-                    # Add key matrix elements
-                    command.extend(map(str, key_matrix_flat))
-                
-                # Add input (either vector or text)
-                if input_text:
-                    command.extend(["--text", input_text])
-                    result_type = "text"
-                else:
-                    # Add input vector elements
-                    command.extend(map(str, input_vector_flat))
-                    result_type = "vector"
-                
-                # Run the command
-                result = subprocess.run(command, capture_output=True, text=True, check=False)
-                
-                # Check result based on expected type
-                if result.returncode == 0:
-                    if result_type == "vector":
-                        result_vector = list(map(int, result.stdout.strip().split()))
-                    else:
-                        result_text = result.stdout.strip()
-            except (Exception, OSError, FileNotFoundError) as e:
-                print(f"C++ execution error: {str(e)}")
-                pass  # Will try Java or fallback
-
-        # Try Java executable if C++ failed
-        java_source_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-        java_executable_path = os.path.join(java_source_dir, 'HillProcessor.class')
-        if (result_vector is None and result_text is None) and os.path.exists(java_executable_path):
-            try:
-                # Note: This would need to be updated if Java implementation supports word keys and text input
-                args = [operation, str(dimension)]
-                args.extend(map(str, key_matrix_flat or []))
-                args.extend(map(str, input_vector_flat or []))
-                command = ['java', '-cp', java_source_dir, 'HillProcessor'] + args
-                
-                result = subprocess.run(command, capture_output=True, text=True, check=False)
-                
-                if result.returncode == 0:
-                    result_vector = list(map(int, result.stdout.strip().split()))
-            except Exception:
-                pass  # Will use Python fallback
-
-        # Use Python fallback if both C++ and Java failed
-        if result_vector is None and result_text is None:
-            # Prepare inputs for Python fallback
-            if key_word and not key_matrix_flat:
-                # Convert key word to matrix for Python fallback
-                key_matrix_flat = []
-                for c in key_word.upper():
-                    if c.isalpha():
-                        key_matrix_flat.append(ord(c) - ord('A'))
-                # Pad if needed
-                needed = dimension * dimension
-                while len(key_matrix_flat) < needed:
-                    key_matrix_flat.append(ord('X') - ord('A'))
-                # Truncate if too long
-                key_matrix_flat = key_matrix_flat[:needed]
-            
-            if input_text and not input_vector_flat:
-                # Convert input text to vector for Python fallback
-                input_vector_flat = []
-                for c in input_text.upper():
-                    if c.isalpha():
-                        input_vector_flat.append(ord(c) - ord('A'))
-            
-            # Now we have key_matrix_flat and input_vector_flat, use Python fallback
-            result_vector = hill_cipher_fallback(operation, dimension, key_matrix_flat, input_vector_flat)
-            
-            # If original input was text, convert result back to text
-            if input_text:
-                result_text = ''.join([chr(n + ord('A')) for n in result_vector])
+        # C++ library, then the C++ executable, then the Python fallback
+        served = dispatch('hill', operation=operation, dimension=dimension, key_matrix_flat=key_matrix_flat,
+                          input_vector_flat=input_vector_flat, input_text=input_text)
+        result_vector, result_text = served.value
 
         # Return the appropriate result
         if result_text is not None:
-            return JsonResponse({'result_text': result_text})
-        elif result_vector is not None:
-            return JsonResponse({'result_vector': result_vector})
-        else:
-            return JsonResponse({'error': 'Processing failed with all implementations.'}, status=500)
+            return JsonResponse({'result_text': result_text, 'backend': served.backend})
+        return JsonResponse({'result_vector': result_vector, 'backend': served.backend})
 
     except Exception as e:
-        # Final fallback to Python
-        try:
-            if not key_matrix_flat and key_word:
-                # Convert key word to matrix for fallback
-                key_matrix_flat = []
-                for c in key_word.upper():
-                    if c.isalpha():
-                        key_matrix_flat.append(ord(c) - ord('A'))
-                # Pad if needed
-                needed = dimension * dimension
-                while len(key_matrix_flat) < needed:
-                    key_matrix_flat.append(ord('X') - ord('A'))
-                # Truncate if too long
-                key_matrix_flat = key_matrix_flat[:needed]
-            
-            if not input_vector_flat and input_text:
-                # Convert input text to vector for fallback
-                input_vector_flat = []
-                for c in input_text.upper():
-                    if c.isalpha():
-                        input_vector_flat.append(ord(c) - ord('A'))
-            
-            # Process with Python fallback
-            result_vector = hill_cipher_fallback(operation, dimension, key_matrix_flat, input_vector_flat)
-            
-            # If original input was text, convert result back to text
-            if input_text:
-                # Store original length for padding removal in decryption
-                original_length = len(''.join(c for c in input_text.upper() if c.isalpha()))
-                
-                # Convert result to text
-                result_text = ''.join([chr(n + ord('A')) for n in result_vector])
-                
-                # Remove padding for decryption
-                if operation == 'decrypt' and len(result_text) > original_length:
-                    # Remove trailing X padding
-                    while result_text and result_text[-1] == 'X' and len(result_text) > original_length:
-                        result_text = result_text[:-1]
-                
-                return JsonResponse({'result_text': result_text})
-            else:
-                return JsonResponse({'result_vector': result_vector})
-                
-        except Exception as fallback_error:
-            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}. Fallback error: {str(fallback_error)}'}, status=500)
+        # Every backend, including the Python fallback, failed
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+def backend_status_api(request):
+    """API endpoint reporting which implementation serves each algorithm, the circuit breaker states,
+    per-backend timings, the latency windows used for adaptive backend selection, and the result and
+    key material cache counters."""
+    report = backends.status_report()
+    dispatcher = get_dispatcher()
+    report['timings'] = dispatcher.timings()
+    report['adaptive'] = dispatcher.selector.snapshot() if dispatcher.selector is not None else None
+    result_cache = get_result_cache()
+    report['result_cache'] = result_cache.stats() if result_cache is not None else None
+    report['key_caches'] = key_cache_stats()
+    return JsonResponse(report)
 
 def format_state_to_grid(hex_string):
     """Converts a 32-char hex string into a 4x4 grid of 2-char hex bytes for column-major state."""
@@ -475,6 +361,86 @@ def format_state_to_grid(hex_string):
         grid.append(row)
     return grid
 
+def add_state_grids(blocks_data):
+    """Adds a '<step>_grid' 4x4 grid next to every 32-char hex state of the AES blocks, in place."""
+    for block in blocks_data:
+        for round_info in block.get('rounds', []):
+            # Create a list of items to avoid modifying dict during iteration
+            for step, hex_val in list(round_info.items()):
+                if step != 'round' and isinstance(hex_val, str) and len(hex_val) == 32:
+                    round_info[f'{step}_grid'] = format_state_to_grid(hex_val)
+
+def aes_trace_response(request, fields, blocks_data):
+    """
+    Builds the response of an AES visualization API in the format the client asked for.
+
+    The compact format (see trace_format.py) ships the states as raw bytes and
+    leaves the grids to the client; otherwise the blocks are added to the JSON
+    fields as 'blocks_data', with grids.
+    """
+    if trace_format.wants_compact(request):
+        payload = trace_format.encode_trace(fields, blocks_data, trace_format.wants_delta(request))
+        response = HttpResponse(payload, content_type=trace_format.MEDIA_TYPE)
+    else:
+        add_state_grids(blocks_data)
+        response = JsonResponse(dict(fields, blocks_data=blocks_data))
+    response['Vary'] = 'Accept'
+    return response
+
+def aes_response_fields(served, operation):
+    """Returns the non-trace fields of an AES API response, with the IV and tag of the chained modes."""
+    output_data = served.value
+    fields = {
+        'result': output_data.get('finalResult', 'Processing completed'),
+        'total_blocks': output_data.get('totalBlocks', len(output_data.get('blocks', []))),
+        'operation': operation,
+        'mode': output_data.get('mode', 'ECB'),
+        'backend': served.backend,
+        'cached': served.cached,
+    }
+    for name in ('iv', 'tag'):
+        if name in output_data:
+            fields[name] = output_data[name]
+    return fields
+
+# ECB runs on the JVM worker or the Python engine; the others on Python only (AES/AESModes.py)
+AES_MODES = ('ECB', 'CBC', 'CTR', 'GCM')
+
+def parse_aes_mode(value):
+    """Parses the 'mode' option of the AES APIs, defaulting to ECB. Raises ValueError for an unknown mode."""
+    mode = str(value or 'ECB').upper()
+    if mode not in AES_MODES:
+        raise ValueError(f"mode must be one of {', '.join(AES_MODES)}.")
+    return mode
+
+AES_TRACE_PATTERN = re.compile(r'(all|none)|first_(\d+)|blocks=(\d+)\.\.(\d+)')
+
+def parse_aes_trace(value):
+    """
+    Parses the 'trace' option of the AES API into a range of blocks to visualize.
+
+    Accepts 'all' (the default), 'none', 'first_N' for the first N blocks, or
+    'blocks=i..j' for blocks i to j, 1-based and inclusive. Large messages
+    produce megabytes of round states, so clients can ask for a few blocks and
+    fetch others later from the block trace API.
+
+    Returns None for every block, otherwise a (start, stop) range of 0-based
+    block indices. Raises ValueError for anything else.
+    """
+    match = AES_TRACE_PATTERN.fullmatch(str(value or 'all').strip().lower())
+    if match is None:
+        raise ValueError("trace must be 'all', 'none', 'first_N' or 'blocks=i..j'.")
+    keyword, first, start, stop = match.groups()
+    if keyword == 'all':
+        return None
+    if keyword == 'none':
+        return (0, 0)
+    if first is not None:
+        return (0, int(first))
+    if int(start) < 1 or int(stop) < int(start):
+        raise ValueError('blocks=i..j needs 1 <= i <= j.')
+    return (int(start) - 1, int(stop))
+
 def aes_view(request):
     context = {}
     if request.method == 'POST':
@@ -489,51 +455,16 @@ def aes_view(request):
         else:
             output_data = None
             try:
-                # Use Java implementation as primary
-                java_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-                java_file = os.path.join(java_dir, 'AES.java')
-                class_file = os.path.join(java_dir, 'AES.class')
-                
-                # Compile Java file if class doesn't exist or is older than source
-                if not os.path.exists(class_file) or os.path.getmtime(java_file) > os.path.getmtime(class_file):
-                    compile_result = subprocess.run(['javac', java_file], capture_output=True, text=True)
-                    if compile_result.returncode != 0:
-                        raise Exception(f"Java compilation failed: {compile_result.stderr}")
-                
-                # Run the Java program
-                command = ['java', '-cp', java_dir, 'AES', message, key, operation]
-                result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-                
-                if result.stdout.strip():
-                    output_data = json.loads(result.stdout.strip())
-                else:
-                    raise Exception("Java AES returned no output")
-                    
-            except:
-                # Python fallback if Java fails
-                try:
-                    output_data = aes_fallback(operation, message, key)
-                    
-                    # Check if Python fallback succeeded
-                    if not output_data or output_data.get('finalResult', '').startswith('Error'):
-                        raise Exception("Python fallback also failed")
-                        
-                except:
-                    # Both failed
-                    pass
+                # Pooled JVM worker first, then the Python fallback
+                served = cached_dispatch('aes', operation=operation, message=message, key=key)
+                output_data = served.value
+            except Exception as e:
+                print(f"AES processing failed on every backend: {str(e)}")
             
             # Process the output_data (whether from Java or Python fallback)
             if output_data:
-                # Process each block in the JSON output
                 blocks_data = output_data.get('blocks', [])
-                for block in blocks_data:
-                    rounds_data = block.get('rounds', [])
-                    for round_info in rounds_data:
-                        # Create a list of items to avoid modifying dict during iteration
-                        items_to_process = list(round_info.items())
-                        for step, hex_val in items_to_process:
-                            if step != 'round' and isinstance(hex_val, str) and len(hex_val) == 32:
-                                round_info[f'{step}_grid'] = format_state_to_grid(hex_val)
+                add_state_grids(blocks_data)
 
                 context = {
                     'message': message,
@@ -541,7 +472,8 @@ def aes_view(request):
                     'operation': operation,
                     'result': output_data.get('finalResult'),
                     'blocks_data': blocks_data, # Pass all block data to the template
-                    'is_post': True
+                    'is_post': True,
+                    'implementation_used': served.label,
                 }
             else:
                 context['error'] = "Failed to process AES operation."
@@ -565,68 +497,126 @@ def aes_process_api(request):
         elif len(key) != 16:
             return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
 
+        try:
+            trace_blocks = parse_aes_trace(data.get('trace'))
+            mode = parse_aes_mode(data.get('mode'))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        if mode != 'ECB':
+            # A fresh random IV every time, so the result is not cached
+            try:
+                served = dispatch('aes_mode', operation=operation, mode=mode, message=message, key=key,
+                                  iv=data.get('iv'), trace_blocks=trace_blocks)
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            return aes_trace_response(request, aes_response_fields(served, operation), served.value['blocks'])
+
         output_data = None
         try:
-            # Use Java implementation as primary
-            java_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-            java_file = os.path.join(java_dir, 'AES.java')
-            class_file = os.path.join(java_dir, 'AES.class')
-            
-            # Compile Java file if class doesn't exist or is older than source
-            if not os.path.exists(class_file) or os.path.getmtime(java_file) > os.path.getmtime(class_file):
-                compile_result = subprocess.run(['javac', java_file], capture_output=True, text=True)
-                if compile_result.returncode != 0:
-                    raise Exception(f"Java compilation failed: {compile_result.stderr}")
-            
-            # Run the Java program
-            command = ['java', '-cp', java_dir, 'AES', message, key, operation]
-            result = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-            
-            if result.stdout.strip():
-                output_data = json.loads(result.stdout.strip())
-            else:
-                raise Exception("Java AES returned no output")
-                
+            # Pooled JVM worker first, then the Python fallback
+            served = cached_dispatch('aes', operation=operation, message=message, key=key,
+                                     trace_blocks=trace_blocks)
+            output_data = served.value
         except Exception as e:
-            # Python fallback if Java fails
-            try:
-                output_data = aes_fallback(operation, message, key)
-                
-                # Check if Python fallback succeeded
-                if not output_data or output_data.get('finalResult', '').startswith('Error'):
-                    raise Exception("Python fallback also failed")
-                    
-            except Exception as python_e:
-                # Both failed
-                pass
+            print(f"AES processing failed on every backend: {str(e)}")
         
         # Process the output_data for visualization
         if output_data:
-            blocks_data = output_data.get('blocks', [])
-            for block in blocks_data:
-                rounds_data = block.get('rounds', [])
-                for round_info in rounds_data:
-                    # Create a list of items to avoid modifying dict during iteration
-                    items_to_process = list(round_info.items())
-                    for step, hex_val in items_to_process:
-                        if step != 'round' and isinstance(hex_val, str) and len(hex_val) == 32:
-                            round_info[f'{step}_grid'] = format_state_to_grid(hex_val)
-
-            return JsonResponse({
-                'result': output_data.get('finalResult', 'Processing completed'),
-                'blocks_data': blocks_data,
-                'operation': operation
-            })
+            return aes_trace_response(request, aes_response_fields(served, operation), output_data.get('blocks', []))
         else:
             return JsonResponse({'error': 'Failed to process AES operation.'}, status=500)
 
     except Exception as e:
-        # Final fallback to Python
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+@csrf_exempt
+def aes_block_trace_api(request):
+    """API endpoint returning the round visualization of a single AES block, computed on demand."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+        message = data.get('message', '')
+        key = data.get('key', '')
+        operation = data.get('operation', 'encrypt')
+
+        if not message or not key:
+            return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+        elif len(key) != 16:
+            return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
+        try:
+            block = int(data.get('block'))
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'block must be a block number starting at 1.'}, status=400)
+        try:
+            mode = parse_aes_mode(data.get('mode'))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        if mode != 'ECB':
+            # Chained blocks are not independent; the message is run again with only this block traced.
+            # Encryption needs the IV of the first response to give the same blocks.
+            try:
+                served = dispatch('aes_mode', operation=operation, mode=mode, message=message, key=key,
+                                  iv=data.get('iv'), trace_blocks=(block - 1, block))
+            except ValueError as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            if block < 1 or not served.value['blocks']:
+                return JsonResponse({'error': f"Block {block} is out of range, the message has "
+                                              f"{served.value['totalBlocks']} blocks"}, status=400)
+            fields = aes_response_fields(served, operation)
+            del fields['result']
+            return aes_trace_response(request, fields, served.value['blocks'])
+
         try:
-            result_text = aes_fallback(operation, message, key)
-            return JsonResponse({'result': result_text.get('finalResult', 'Processing completed')})
-        except Exception as fallback_error:
-            return JsonResponse({'error': f'All implementations failed. Error: {str(e)}. Fallback error: {str(fallback_error)}'}, status=500)
+            served = cached_dispatch('aes_block_trace', operation=operation, message=message, key=key, block=block)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        return aes_trace_response(request, {
+            'total_blocks': served.value['totalBlocks'],
+            'operation': operation,
+            'mode': 'ECB',
+            'backend': served.backend,
+            'cached': served.cached,
+        }, [served.value['block']])
+
+    except Exception as e:
+        return JsonResponse({'error': f'All implementations failed. Error: {str(e)}'}, status=500)
+
+
+@csrf_exempt
+def aes_stream_api(request):
+    """Streams the AES visualization as server-sent events, one per round, as the blocks are computed."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    operation = data.get('operation', 'encrypt')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+    elif len(key) != 16:
+        return JsonResponse({'error': 'AES key must be exactly 16 characters long.'}, status=400)
+    try:
+        trace_blocks = parse_aes_trace(data.get('trace'))
+        mode = parse_aes_mode(data.get('mode'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if mode != 'ECB':
+        return JsonResponse({'error': 'Streaming is only available in ECB mode.'}, status=400)
+
+    # Only the result, dispatched after the rounds are streamed from the Python engine
+    dispatch_result = functools.partial(cached_dispatch, 'aes', operation=operation, message=message, key=key,
+                                        trace_blocks=(0, 0))
+    return sse_response(aes_events(dispatch_result, operation, message, key, trace_blocks))
 
 
 def md5_view(request):
@@ -660,102 +650,23 @@ def md5_process(request):
             context['result'] = "Error: Input text is required."
             return render(request, 'md5.html', context)
 
+        if operation == 'verify' and not expected_hash:
+            context['result'] = "Error: Expected hash is required for verification."
+            return render(request, 'md5.html', context)
+
         try:
-            # Try Java implementation first
-            java_success = False
-            java_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-            java_class_path = os.path.join(java_dir, 'MD5.class')
-            
-            if os.path.exists(java_class_path):
-                try:
-                    if operation == 'verify':
-                        if not expected_hash:
-                            context['result'] = "Error: Expected hash is required for verification."
-                            return render(request, 'md5.html', context)
-                        
-                        # Use Java for verification
-                        command = ['java', '-cp', java_dir, 'MD5', input_text, output_format, expected_hash, 'verify']
-                        result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=10)
-                        
-                        # Parse JSON output from Java
-                        import json
-                        java_result = json.loads(result.stdout.strip())
-                        
-                        generated_hash = java_result.get('generated_hash', '')
-                        matches = java_result.get('matches', False)
-                        
-                        if matches:
-                            context['result'] = f"✅ Hash verification successful! The input matches the expected hash.\nGenerated: {generated_hash}"
-                        else:
-                            context['result'] = f"❌ Hash verification failed!\nGenerated: {generated_hash}\nExpected: {expected_hash}"
-                        
-                        context['implementation_used'] = 'Java'
-                        java_success = True
-                        
-                    else:
-                        # Use Java for hash generation
-                        command = ['java', '-cp', java_dir, 'MD5', input_text, output_format]
-                        result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=10)
-                        
-                        context['result'] = result.stdout.strip()
-                        context['implementation_used'] = 'Java'
-                        java_success = True
-                        
-                except (subprocess.CalledProcessError, subprocess.TimeoutExpired, json.JSONDecodeError, Exception):
-                    # Java failed, will use Python fallback
-                    java_success = False
-            
-            # Use Python fallback if Java failed or is not available
-            if not java_success:
-                try:
-                    # Import Python fallback
-                    from Algorithm.Crypto_Fallback.Python.MD5.MD5 import MD5Hash
-                    
-                    if operation == 'verify':
-                        if not expected_hash:
-                            context['result'] = "Error: Expected hash is required for verification."
-                            return render(request, 'md5.html', context)
-                        
-                        generated_hash, matches = MD5Hash.verify_hash(input_text, expected_hash, output_format)
-                        
-                        if matches:
-                            context['result'] = f"✅ Hash verification successful! The input matches the expected hash.\nGenerated: {generated_hash}"
-                        else:
-                            context['result'] = f"❌ Hash verification failed!\nGenerated: {generated_hash}\nExpected: {expected_hash}"
-                        
-                        context['implementation_used'] = 'Python (Fallback)'
-                        
-                    else:
-                        # Use Python for hash generation
-                        md5_hash = MD5Hash.generate_hash(input_text, output_format)
-                        context['result'] = md5_hash
-                        context['implementation_used'] = 'Python (Fallback)'
-                        
-                except ImportError:
-                    # Final fallback to basic hashlib if Python implementation fails
-                    md5_hash = hashlib.md5(input_text.encode('utf-8')).hexdigest()
-                    
-                    if operation == 'verify':
-                        if not expected_hash:
-                            context['result'] = "Error: Expected hash is required for verification."
-                            return render(request, 'md5.html', context)
-                        
-                        if md5_hash.lower() == expected_hash.lower():
-                            context['result'] = f"✅ Hash verification successful! The input matches the expected hash.\nGenerated: {md5_hash}"
-                        else:
-                            context['result'] = f"❌ Hash verification failed!\nGenerated: {md5_hash}\nExpected: {expected_hash}"
-                    else:
-                        # Format the output based on user preference
-                        if output_format == 'HEX':
-                            context['result'] = md5_hash.upper()
-                        elif output_format == 'base64':
-                            # Convert hex to bytes then to base64
-                            hash_bytes = bytes.fromhex(md5_hash)
-                            context['result'] = base64.b64encode(hash_bytes).decode('ascii')
-                        else:  # hex (lowercase)
-                            context['result'] = md5_hash.lower()
-                    
-                    context['implementation_used'] = 'Python (Basic Hashlib)'
+            # Pooled JVM worker first, then the Python fallback
+            served = cached_dispatch('md5', message=input_text, output_format=output_format)
+            generated_hash = served.value
+            context['implementation_used'] = served.label
+
+            if operation == 'verify':
+                if generated_hash.lower() == expected_hash.lower():
+                    context['result'] = f"✅ Hash verification successful! The input matches the expected hash.\nGenerated: {generated_hash}"
+                else:
+                    context['result'] = f"❌ Hash verification failed!\nGenerated: {generated_hash}\nExpected: {expected_hash}"
+            else:
+                context['result'] = generated_hash
 
         except Exception as e:
             context['result'] = f"Error generating MD5 hash: {str(e)}"
@@ -829,52 +740,20 @@ def diffie_hellman_process_api(request):
         alice_private = data.get('alice_private', '6')
         bob_private = data.get('bob_private', '15')
         
-        result_data = None
-        java_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Algorithm', 'Crypto_Native', 'JAVA')
-        java_class_path = os.path.join(java_dir, 'DiffieHellman.class')
-        
-        # Try Java implementation first
+        # Pooled JVM worker first, then the Python fallback
         try:
-            if os.path.exists(java_class_path):
-                command = ['java', '-cp', java_dir, 'DiffieHellman', str(p), str(g), str(alice_private), str(bob_private)]
-                result = subprocess.run(command, capture_output=True, text=True, check=True, timeout=10)
-                output = result.stdout.strip()
-                
-                # Parse JSON output from Java
-                import json
-                java_result = json.loads(output)
-                
-                if java_result.get('success'):
-                    result_data = {
-                        'success': True,
-                        'inputs': java_result['inputs'],
-                        'results': java_result['results'],
-                        'implementation': 'java'
-                    }
-                else:
-                    raise Exception(java_result.get('error', 'Java execution failed'))
-                    
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, json.JSONDecodeError, Exception) as e:
-            # Fall back to Python implementation
-            try:
-                from Algorithm.Crypto_Fallback.Python.DiffieHellman.DiffieHellman import diffie_hellman_fallback
-                result = diffie_hellman_fallback(int(p), int(g), int(alice_private), int(bob_private))
-                result_data = {
-                    'success': result['success'],
-                    'inputs': {
-                        'prime_p': str(p),
-                        'generator_g': str(g),
-                        'private_a': str(alice_private),
-                        'private_b': str(bob_private)
-                    },
-                    'results': result['result'] if result['success'] else {},
-                    'implementation': 'python',
-                    'fallback_reason': str(e)
-                }
-            except ImportError:
-                return JsonResponse({'error': 'Neither Java nor Python implementation available.'}, status=500)
-            except Exception as fallback_error:
-                return JsonResponse({'error': f'Both Java and Python implementations failed: {str(fallback_error)}'}, status=500)
+            served = dispatch('diffie_hellman', p=p, g=g, alice_private=alice_private, bob_private=bob_private)
+        except Exception as e:
+            return JsonResponse({'error': f'Both Java and Python implementations failed: {str(e)}'}, status=500)
+
+        result_data = {
+            'success': True,
+            'inputs': served.value['inputs'],
+            'results': served.value['results'],
+            'implementation': served.backend,
+        }
+        if len(served.attempts) > 1:
+            result_data['fallback_reason'] = served.attempts[-2]['error']
         
         return JsonResponse(result_data)
 
@@ -896,6 +775,50 @@ def hmac_view(request):
     return render(request, 'hmac.html', context)
 
 
+def hmac_step_details(steps, algorithm):
+    """Maps the step details of a C++ HMAC backend to the names used by the HMAC page, or None without steps."""
+    if not steps:
+        return None
+    return {
+        'original_key': steps.get('originalKey', ''),
+        'processed_key': steps.get('processedKey', ''),
+        'key_analysis': steps.get('keyAnalysis', ''),
+        'inner_pad': steps.get('innerPad', ''),
+        'outer_pad': steps.get('outerPad', ''),
+        'inner_key_material': steps.get('innerKeyMaterial', ''),
+        'outer_key_material': steps.get('outerKeyMaterial', ''),
+        'message_hex': steps.get('messageHex', ''),
+        'inner_hash': steps.get('innerHash', ''),
+        'outer_input': steps.get('outerInput', ''),
+        'final_hmac': steps.get('finalHmac', ''),
+        'block_size': steps.get('blockSize', 64),
+        'algorithm': steps.get('algorithm', algorithm.upper())
+    }
+
+@csrf_exempt
+def hmac_stream_api(request):
+    """Streams the HMAC steps as server-sent events (see streaming.py)."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST requests are allowed.'}, status=405)
+
+    try:
+        data = json.loads(request.body)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return JsonResponse({'error': 'Invalid JSON body.'}, status=400)
+    message = data.get('message', '')
+    key = data.get('key', '')
+    algorithm = data.get('algorithm', 'sha256')
+
+    if not message or not key:
+        return JsonResponse({'error': 'Message and Key are required.'}, status=400)
+
+    try:
+        # The C++ backends are the ones with step details
+        served = cached_dispatch('hmac', pin=NATIVE, message=message, key=key, hash_algorithm=algorithm)
+    except Exception as e:
+        return sse_response(error_events(f'All implementations failed. Error: {str(e)}'))
+    return sse_response(hmac_events(served, hmac_step_details(served.value['steps'], algorithm)))
+
 def hmac_process(request):
     """Process HMAC generation or verification with C++ primary implementation and detailed step visualization"""
     if request.method == 'POST':
@@ -926,195 +849,42 @@ def hmac_process(request):
             context['result'] = "Error: Secret key is required."
             return render(request, 'hmac.html', context)
 
+        if operation == 'verify' and not expected_hmac:
+            context['result'] = "Error: Expected HMAC is required for verification."
+            return render(request, 'hmac.html', context)
+
         try:
-            # Try C++ implementation first (supports all algorithms: MD5, SHA1, SHA224, SHA256, SHA384, SHA512)
-            try:
-                exe_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 
-                                      'Algorithm', 'Crypto_Native', 'CPP', 'HMAC')
-                
-                if os.path.exists(exe_path):
-                    # Convert algorithm name to uppercase for C++ compatibility
-                    cpp_algorithm = algorithm.upper()
-                    
-                    if operation == 'verify':
-                        if not expected_hmac:
-                            context['result'] = "Error: Expected HMAC is required for verification."
-                            return render(request, 'hmac.html', context)
-                        
-                        # Run verification with algorithm parameter
-                        process = subprocess.run([exe_path, input_text, secret_key, expected_hmac, cpp_algorithm], 
-                                               capture_output=True, text=True, check=True)
-                        result_json = json.loads(process.stdout.strip())
-                        
-                        if result_json.get('valid', False):
-                            context['result'] = "✅ HMAC verification successful! The message is authentic."
-                        else:
-                            context['result'] = "❌ HMAC verification failed! The message may have been tampered with."
-                        
-                        context['implementation_used'] = 'C++ Native Implementation'
-                        
-                    else:
-                        # Generate HMAC with detailed steps and algorithm parameter
-                        process = subprocess.run([exe_path, input_text, secret_key, cpp_algorithm], 
-                                               capture_output=True, text=True, check=True)
-                        result_json = json.loads(process.stdout.strip())
-                        
-                        if result_json.get('success', False):
-                            hmac_value = result_json['hmac']
-                            
-                            # Format the output based on user preference
-                            if output_format == 'HEX':
-                                formatted_result = hmac_value.upper()
-                            elif output_format == 'base64':
-                                # Convert hex to base64
-                                hex_bytes = bytes.fromhex(hmac_value)
-                                formatted_result = base64.b64encode(hex_bytes).decode('ascii')
-                            else:  # hex (lowercase)
-                                formatted_result = hmac_value.lower()
-                            
-                            context['result'] = formatted_result
-                            context['implementation_used'] = 'C++ Native Implementation'
-                            
-                            # Prepare step-by-step visualization data
-                            steps = result_json.get('steps', {})
-                            context['steps'] = {
-                                'original_key': steps.get('originalKey', ''),
-                                'processed_key': steps.get('processedKey', ''),
-                                'key_analysis': steps.get('keyAnalysis', ''),
-                                'inner_pad': steps.get('innerPad', ''),
-                                'outer_pad': steps.get('outerPad', ''),
-                                'inner_key_material': steps.get('innerKeyMaterial', ''),
-                                'outer_key_material': steps.get('outerKeyMaterial', ''),
-                                'message_hex': steps.get('messageHex', ''),
-                                'inner_hash': steps.get('innerHash', ''),
-                                'outer_input': steps.get('outerInput', ''),
-                                'final_hmac': steps.get('finalHmac', ''),
-                                'block_size': steps.get('blockSize', 64),
-                                'algorithm': steps.get('algorithm', algorithm.upper())
-                            }
-                        else:
-                            raise subprocess.CalledProcessError(1, exe_path, result_json.get('error', 'Unknown error'))
-                    
-                    return render(request, 'hmac.html', context)
-                
-            except (subprocess.CalledProcessError, OSError, FileNotFoundError, json.JSONDecodeError) as e:
-                # Fall back to Python implementation
-                print(f"C++ HMAC failed, falling back to Python: {e}")
-                pass
+            # Only the C++ backends (MD5, SHA1, SHA224, SHA256, SHA384, SHA512) return step
+            # details, so generation pins them ahead of whichever backend is fastest
+            pin = NATIVE if operation != 'verify' else None
+            served = cached_dispatch('hmac', pin=pin, message=input_text, key=secret_key, hash_algorithm=algorithm)
+            hmac_value = served.value['hmac']
+            context['implementation_used'] = served.label
+
+            # Format the output based on user preference
+            if output_format == 'HEX':
+                generated_hmac = hmac_value.upper()
+            elif output_format == 'base64':
+                generated_hmac = base64.b64encode(bytes.fromhex(hmac_value)).decode('ascii')
+            else:  # hex (lowercase)
+                generated_hmac = hmac_value
+
+            if operation == 'verify':
+                # Compare HMACs (case-insensitive for hex)
+                if output_format.lower() == 'hex':
+                    matches = generated_hmac.lower() == expected_hmac.lower()
+                else:
+                    matches = generated_hmac == expected_hmac
 
-            # Python fallback implementation
-            try:
-                from Algorithm.Crypto_Fallback.Python.HMAC.HMAC import HMACHash
-                
-                if operation == 'verify':
-                    if not expected_hmac:
-                        context['result'] = "Error: Expected HMAC is required for verification."
-                        return render(request, 'hmac.html', context)
-                    
-                    generated_hmac, matches = HMACHash.verify_hmac(
-                        input_text, secret_key, expected_hmac, algorithm, output_format
-                    )
-                    
-                    if matches:
-                        context['result'] = f"✅ HMAC verification successful! The message is authentic.\nGenerated: {generated_hmac}"
-                    else:
-                        context['result'] = f"❌ HMAC verification failed! The message may have been tampered with.\nGenerated: {generated_hmac}\nExpected: {expected_hmac}"
-                    
-                    context['implementation_used'] = 'Python HMAC Library'
-                    
+                if matches:
+                    context['result'] = f"✅ HMAC verification successful! The message is authentic.\nGenerated: {generated_hmac}"
                 else:
-                    # Generate HMAC with Python implementation
-                    if algorithm == 'sha256':
-                        # Use our detailed implementation for step visualization
-                        hmac_result, step_details = hmac_fallback(input_text, secret_key)
-                        
-                        # Format the output based on user preference
-                        if output_format == 'HEX':
-                            context['result'] = hmac_result.upper()
-                        elif output_format == 'base64':
-                            hex_bytes = bytes.fromhex(hmac_result)
-                            context['result'] = base64.b64encode(hex_bytes).decode('ascii')
-                        else:  # hex (lowercase)
-                            context['result'] = hmac_result.lower()
-                        
-                        context['implementation_used'] = 'Python Custom Implementation'
-                        context['steps'] = step_details
-                    else:
-                        # Use standard library for other algorithms
-                        hmac_result = HMACHash.generate_hmac(input_text, secret_key, algorithm, output_format)
-                        context['result'] = hmac_result
-                        context['implementation_used'] = 'Python HMAC Library'
-                        
-            except ImportError:
-                # Final fallback to basic Python hmac library
-                try:
-                    import hmac
-                    import hashlib
-                    
-                    # Map algorithm names to hashlib functions
-                    hash_algorithms = {
-                        'md5': hashlib.md5,
-                        'sha1': hashlib.sha1,
-                        'sha224': hashlib.sha224,
-                        'sha256': hashlib.sha256,
-                        'sha384': hashlib.sha384,
-                        'sha512': hashlib.sha512
-                    }
-                    
-                    if algorithm not in hash_algorithms:
-                        context['result'] = f"Error: Unsupported algorithm: {algorithm}"
-                        return render(request, 'hmac.html', context)
-                    
-                    hash_func = hash_algorithms[algorithm]
-                    hmac_obj = hmac.new(
-                        secret_key.encode('utf-8'),
-                        input_text.encode('utf-8'),
-                        hash_func
-                    )
-                    
-                    if operation == 'verify':
-                        if not expected_hmac:
-                            context['result'] = "Error: Expected HMAC is required for verification."
-                            return render(request, 'hmac.html', context)
-                        
-                        # Format the generated HMAC based on output format
-                        if output_format == 'HEX':
-                            generated_hmac = hmac_obj.hexdigest().upper()
-                        elif output_format == 'base64':
-                            import base64
-                            generated_hmac = base64.b64encode(hmac_obj.digest()).decode('ascii')
-                        else:  # hex (lowercase)
-                            generated_hmac = hmac_obj.hexdigest().lower()
-                        
-                        # Compare HMACs (case-insensitive for hex)
-                        if output_format.lower() in ['hex']:
-                            matches = generated_hmac.lower() == expected_hmac.lower()
-                        else:
-                            matches = generated_hmac == expected_hmac
-                        
-                        if matches:
-                            context['result'] = f"✅ HMAC verification successful! The message is authentic.\nGenerated: {generated_hmac}"
-                        else:
-                            context['result'] = f"❌ HMAC verification failed! The message may have been tampered with.\nGenerated: {generated_hmac}\nExpected: {expected_hmac}"
-                    else:
-                        # Format the output based on user preference
-                        if output_format == 'HEX':
-                            context['result'] = hmac_obj.hexdigest().upper()
-                        elif output_format == 'base64':
-                            import base64
-                            context['result'] = base64.b64encode(hmac_obj.digest()).decode('ascii')
-                        else:  # hex (lowercase)
-                            context['result'] = hmac_obj.hexdigest().lower()
-                    
-                    context['implementation_used'] = 'Python Standard Library'
-                    
-                except Exception as e:
-                    context['result'] = f"Error generating HMAC: {str(e)}"
-                    context['implementation_used'] = 'Error'
+                    context['result'] = f"❌ HMAC verification failed! The message may have been tampered with.\nGenerated: {generated_hmac}\nExpected: {expected_hmac}"
+            else:
+                context['result'] = generated_hmac
 
-            except Exception as e:
-                context['result'] = f"Error generating HMAC: {str(e)}"
-                context['implementation_used'] = 'Error'
+                # Prepare step-by-step visualization data (C++ backends only)
+                context['steps'] = hmac_step_details(served.value['steps'], algorithm)
 
         except Exception as e:
             context['result'] = f"Error generating HMAC: {str(e)}"
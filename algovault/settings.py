@@ -157,3 +157,62 @@ DEFAULT_FROM_EMAIL = f'AlgoVault <{os.getenv("EMAIL_HOST_USER", "")}>' # Should
 
 # AI API Configuration
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
+
+# Native Backend Configuration
+# Number of long-lived Java CryptoWorker processes per Django process
+JVM_POOL_SIZE = int(os.getenv('JVM_POOL_SIZE', '2'))
+# Start the JVM workers when Django starts instead of on the first request
+JVM_POOL_PREWARM = os.getenv('JVM_POOL_PREWARM', 'True').lower() in ('true', '1', 'yes')
+# Smoke-test every native backend when Django starts; untested backends are probed on first use
+BACKEND_PROBE_ON_STARTUP = os.getenv('BACKEND_PROBE_ON_STARTUP', 'True').lower() in ('true', '1', 'yes')
+# Consecutive failures or timeouts before a native backend is bypassed, and for how many seconds
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', '5'))
+CIRCUIT_BREAKER_COOLDOWN = float(os.getenv('CIRCUIT_BREAKER_COOLDOWN', '30'))
+# Seconds one native call may take before its process group is killed
+NATIVE_LATENCY_BUDGET = float(os.getenv('NATIVE_LATENCY_BUDGET', '5'))
+NATIVE_LATENCY_BUDGETS = {
+    'caesar': 2,
+    'vigenere': 2,
+    'hill': 2,
+    'sha512': 2,
+    'hmac': 2,
+    'aes': 5,
+    'des': 5,
+    'md5': 10,
+    'diffie_hellman': 10,
+}
+# Calls each backend may have in flight per event loop for the async views (Cryptography/dispatcher.py)
+ASYNC_BACKEND_CONCURRENCY = {
+    'native': int(os.getenv('ASYNC_NATIVE_CONCURRENCY', '32')),
+    'cpp_exe': int(os.getenv('ASYNC_EXE_CONCURRENCY', '256')),
+    'java': JVM_POOL_SIZE,
+    'python': int(os.getenv('ASYNC_FALLBACK_CONCURRENCY', '32')),
+}
+# Processes for CPU-heavy Python fallbacks in the async views (0 = one per CPU)
+ASYNC_FALLBACK_PROCESSES = int(os.getenv('ASYNC_FALLBACK_PROCESSES', '0'))
+# Try the backend with the lowest recent median latency for the input size first
+ADAPTIVE_BACKEND_SELECTION = os.getenv('ADAPTIVE_BACKEND_SELECTION', 'True').lower() in ('true', '1', 'yes')
+# Recent calls kept per (algorithm, backend, input-size bucket)
+ADAPTIVE_WINDOW = int(os.getenv('ADAPTIVE_WINDOW', '64'))
+# Calls a backend needs in a bucket before its median is trusted
+ADAPTIVE_MIN_SAMPLES = int(os.getenv('ADAPTIVE_MIN_SAMPLES', '3'))
+# Share of calls sent to a backend other than the fastest, to keep its measurements current
+ADAPTIVE_EXPLORATION_RATE = float(os.getenv('ADAPTIVE_EXPLORATION_RATE', '0.05'))
+# Cache SHA-512, MD5, HMAC and AES/DES (ECB) results keyed by a digest of their inputs (Cryptography/result_cache.py)
+RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'True').lower() in ('true', '1', 'yes')
+# Seconds a cached result stays valid
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', '3600'))
+# Size cap of the in-process LRU, and of a single entry (0 = an eighth of the cap)
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+RESULT_CACHE_MAX_ENTRY_BYTES = int(os.getenv('RESULT_CACHE_MAX_ENTRY_BYTES', '0'))
+# Name of a CACHES alias (e.g. a shared Redis cache) to use instead of the in-process LRU
+RESULT_CACHE_ALIAS = os.getenv('RESULT_CACHE_ALIAS', '')
+# Directory of the wordlists (one word per line) the Vigenere dictionary attack may read
+VIGENERE_WORDLIST_DIR = os.getenv('VIGENERE_WORDLIST_DIR', str(BASE_DIR / 'wordlists'))
+# Worker processes per Vigenere dictionary attack (0 = one per CPU)
+VIGENERE_ATTACK_PROCESSES = int(os.getenv('VIGENERE_ATTACK_PROCESSES', '0'))
+# Vigenere dictionary attacks that may run at once; further requests get 429 (0 = no limit)
+VIGENERE_MAX_RUNNING_ATTACKS = int(os.getenv('VIGENERE_MAX_RUNNING_ATTACKS', '2'))
+
+# Path to libalgovault.so built by Algorithm/Crypto_Native/CPP/compile.sh (empty = default location)
+ALGOVAULT_NATIVE_LIB = os.getenv('ALGOVAULT_NATIVE_LIB', '')